@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+import time
+
+from fetch_scheduler import scheduler
+from pipeline import single_flight
+
+CACHE_FILE = os.environ.get('SIMULATEUR_CACHE_FILE', os.path.join('.cache', 'api_cache.json'))
+# Mode hors ligne : aucune requête réseau, on sert la dernière valeur valide connue
+_offline = os.environ.get('SIMULATEUR_OFFLINE', '') not in ('', '0')
+
+# Durées de validité (s) par source : (fraîche, puis servie périmée pendant la revalidation)
+TTLS = {
+    'block_height': (300, 24 * 3600),
+    'btc_price_eur': (300, 24 * 3600),
+    'hash_rate_ths': (3600, 7 * 24 * 3600),
+}
+DEFAULT_TTL = (300, 24 * 3600)
+
+_lock = threading.Lock()
+_refreshing = set()
+
+def set_offline(enabled=True):
+    """Active ou désactive le mode hors ligne."""
+    global _offline
+    _offline = enabled
+
+def is_offline():
+    return _offline
+
+def _read_all():
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _store(key, value):
+    with _lock:
+        entries = _read_all()
+        entries[key] = {'value': value, 'time': time.time()}
+        os.makedirs(os.path.dirname(CACHE_FILE) or '.', exist_ok=True)
+        tmp_file = CACHE_FILE + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(tmp_file, CACHE_FILE)
+
+def _revalidate(key, fetch):
+    try:
+        _store(key, single_flight(('api', key), fetch))
+    except Exception as e:
+        print(f"Revalidation de {key} impossible : {e}")
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+def cached_fetch(key, fetch, source=None):
+    """Retourne la valeur en cache de key, sinon appelle fetch() et la mémorise sur disque.
+
+    Valeur fraîche : servie directement. Valeur périmée mais dans la fenêtre de revalidation :
+    servie immédiatement pendant qu'un thread la rafraîchit. En mode hors ligne ou si fetch()
+    échoue, la dernière valeur valide est servie quel que soit son âge. Les valeurs servies
+    depuis le cache sont comptées dans les métriques de source (ou de key).
+    """
+    ttl, stale_ttl = TTLS.get(key, DEFAULT_TTL)
+    with _lock:
+        entry = _read_all().get(key)
+    if entry is not None:
+        age = time.time() - entry['time']
+        if age < ttl or _offline:
+            scheduler.record_cache_hit(source or key)
+            return entry['value']
+        if age < ttl + stale_ttl:
+            scheduler.record_cache_hit(source or key)
+            with _lock:
+                start = key not in _refreshing
+                _refreshing.add(key)
+            if start:
+                threading.Thread(target=_revalidate, args=(key, fetch), name=f'revalidate-{key}').start()
+            return entry['value']
+    elif _offline:
+        raise LookupError(f"Mode hors ligne : aucune valeur en cache pour {key}")
+
+    try:
+        value = single_flight(('api', key), fetch)
+    except Exception as e:
+        if entry is None:
+            raise
+        print(f"Échec de la récupération de {key} ({e}), dernière valeur connue utilisée")
+        return entry['value']
+    _store(key, value)
+    return value
@@ -0,0 +1,263 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import engine
+import intraday
+import subsidy
+from fleet import run_fleet
+from matrix_store import load_directory_cached
+from series_store import csv_key, import_csv, load_csv_cached, series_from_frame
+from sweep import sweep
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(REPO_DIR, '.cache', 'bench')  # Un fichier JSON de résultats par commit
+SYNTHETIC_START = pd.Timestamp(2010, 1, 1)
+# Tailles par axe : années de série journalière / horaire, nombre de sites, côté de la grille du balayage
+SCALES = {
+    'quick': {'years': (1, 10, 50), 'hourly_years': (1, 10), 'sites': (1, 10, 100),
+              'sweep': (10, 46), 'blocks': (1_000, 1_000_000)},
+    'full': {'years': (1, 5, 10, 25, 50), 'hourly_years': (1, 5, 10, 50), 'sites': (1, 10, 100, 1000),
+             'sweep': (10, 46, 100), 'blocks': (1_000, 100_000, 10_000_000)},
+}
+
+def synthetic_dates(years, freq='D'):
+    """Calendrier régulier de years années à partir de SYNTHETIC_START."""
+    return pd.date_range(SYNTHETIC_START, SYNTHETIC_START + pd.DateOffset(years=years), freq=freq, inclusive='left')
+
+def synthetic_power(years, freq='D', seed=0):
+    """Profil de site (MW) : marche aléatoire bornée autour de 100 MW."""
+    dates = synthetic_dates(years, freq)
+    rng = np.random.default_rng(seed)
+    mw = np.clip(100 + np.cumsum(rng.normal(0, 2, len(dates))), 20, 180)
+    return pd.Series(mw, index=dates)
+
+def synthetic_network(years, seed=0):
+    """Hashrate (EH/s) en croissance exponentielle bruitée et prix (€) autour de la loi de puissance."""
+    dates = synthetic_dates(years)
+    rng = np.random.default_rng(seed)
+    t = np.arange(len(dates)) / 365.25
+    hashrate = pd.Series(0.01 * np.exp(0.6 * t) * np.exp(rng.normal(0, 0.05, len(dates))), index=dates)
+    law = engine.power_law_price(engine.days_since_genesis(dates))
+    price = pd.Series(law * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))) * 0.1), index=dates)
+    return hashrate, price
+
+def write_csv(filename, series, column):
+    frame = pd.DataFrame({'date': series.index.strftime('%Y-%m-%d'), column: series.to_numpy()})
+    frame.to_csv(filename, index=False)
+
+def write_network_csv(years):
+    """Écrit les CSV historiques synthétiques sous leurs noms habituels (répertoire courant)."""
+    hashrate, price = synthetic_network(years)
+    write_csv('historical_data_hashrate.csv', hashrate, 'EH/s')
+    write_csv('historical_btcprice.csv', price, 'price')
+
+def bench_simulate(years):
+    """engine.simulate sur years années journalières."""
+    power = synthetic_power(years)
+    hashrate, price = synthetic_network(years)
+    return lambda: engine.simulate(power, hashrate, price), len(power), 'jours'
+
+def bench_simulate_hourly(years):
+    """Profil horaire : import sur la grille horaire puis intraday.simulate_intraday."""
+    power = synthetic_power(years, 'h')
+    frame = pd.DataFrame({'date': power.index, 'mw': power.to_numpy()})
+    hashrate, price = synthetic_network(years)
+
+    def run():
+        hourly = series_from_frame('power', frame, 'MW', stride=3600)
+        return intraday.simulate_intraday(hourly, hashrate, price, capacity_mw=120)
+    return run, len(power), 'heures'
+
+def bench_load_sample_csv(years):
+    """Lecture d'un CSV date,MW par load_sample_csv (génération de la page)."""
+    try:
+        from simulateur import load_sample_csv
+    except ImportError as e:
+        raise RuntimeError(f"dépendance absente ({e.name})")
+    write_csv('power.csv', synthetic_power(years), 'MW')
+    return lambda: load_sample_csv('power.csv'), len(synthetic_dates(years)), 'lignes'
+
+def bench_import_csv(years):
+    """Import à froid d'un CSV date,MW dans le store binaire (parsing et écriture du .npy)."""
+    write_csv('power.csv', synthetic_power(years), 'MW')
+    key = csv_key('power.csv')
+    return lambda: import_csv('power.csv', key=key), len(synthetic_dates(years)), 'lignes'
+
+def bench_load_csv_cached(years):
+    """Chargement à chaud par load_csv_cached : série déjà importée (hors mesure), mappée en mémoire."""
+    write_csv('power.csv', synthetic_power(years), 'MW')
+    load_csv_cached('power.csv')
+    return lambda: load_csv_cached('power.csv').values.sum(), len(synthetic_dates(years)), 'lignes'
+
+def bench_mined_btc(count):
+    """subsidy.mined_btc (calculate_mined_btc) sur count plages de blocs."""
+    rng = np.random.default_rng(0)
+    start = rng.integers(0, 6_000_000, count)
+    end = start + rng.integers(0, 1_000_000, count)
+    return lambda: subsidy.mined_btc(start, end), count, 'plages'
+
+def bench_sweep(side):
+    """Balayage projeté d'une grille side x side x side (efficacité, coût électricité, exposant)."""
+    power = synthetic_power(10)
+    hashrate, price = synthetic_network(10)
+    grid = {'efficiency': np.linspace(10, 40, side), 'electricity_cost': np.linspace(0, 0.3, side),
+            'exponent': np.linspace(4, 7, side)}
+    return lambda: sweep(power, hashrate, price, projection=True, **grid), side ** 3, 'combinaisons'
+
+def bench_fleet(sites):
+    """Backtest de sites profils de 2 ans sur le pool de processus de fleet.py."""
+    write_network_csv(2)
+    os.makedirs('sites', exist_ok=True)
+    for i in range(sites):
+        write_csv(os.path.join('sites', f'site_{i:04d}.csv'), synthetic_power(2, seed=i), 'MW')
+    return lambda: run_fleet('sites'), sites, 'sites'
+
+def bench_matrix(sites):
+    """Puissance totale de sites profils de 10 ans depuis la matrice mappée (construite hors mesure)."""
+    os.makedirs('sites', exist_ok=True)
+    for i in range(sites):
+        write_csv(os.path.join('sites', f'site_{i:04d}.csv'), synthetic_power(10, seed=i), 'MW')
+    load_directory_cached('sites')
+    return lambda: load_directory_cached('sites').total().values.sum(), sites, 'sites'
+
+def bench_generate_html(years):
+    """Génération complète de index.html hors ligne, avec years années d'historique."""
+    try:
+        import api_cache
+        import simulateur
+    except ImportError as e:
+        raise RuntimeError(f"dépendance absente ({e.name})")
+    write_network_csv(years)
+
+    def run():
+        # Hors ligne le temps de la génération seulement : le mode précédent est rétabli ensuite
+        offline = api_cache.is_offline()
+        api_cache.set_offline()
+        try:
+            return simulateur.generate_html()
+        finally:
+            api_cache.set_offline(offline)
+    return run, len(synthetic_dates(years)), 'jours'
+
+BENCHMARKS = (
+    ('simulate', bench_simulate, 'years'),
+    ('simulate_hourly', bench_simulate_hourly, 'hourly_years'),
+    ('load_sample_csv', bench_load_sample_csv, 'years'),
+    ('import_csv', bench_import_csv, 'years'),
+    ('load_csv_cached', bench_load_csv_cached, 'years'),
+    ('mined_btc', bench_mined_btc, 'blocks'),
+    ('sweep', bench_sweep, 'sweep'),
+    ('fleet', bench_fleet, 'sites'),
+    ('matrix', bench_matrix, 'sites'),
+    ('generate_html', bench_generate_html, 'years'),
+)
+
+def measure(run, repeat):
+    """Meilleur temps sur repeat exécutions, puis pic mémoire (tracemalloc, processus courant) d'une exécution."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak
+
+def run_benchmarks(scale='quick', only=None, repeat=3):
+    """Exécute chaque benchmark sur chaque taille dans un répertoire temporaire ; retourne les résultats."""
+    results = []
+    sizes = SCALES[scale]
+    for name, setup, axis in BENCHMARKS:
+        if only and name not in only:
+            continue
+        for size in sizes[axis]:
+            with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(sys.stderr):
+                cwd = os.getcwd()
+                os.chdir(directory)
+                try:
+                    run, count, unit = setup(size)
+                    seconds, peak = measure(run, repeat)
+                    row = {'benchmark': name, 'size': size, 'count': count, 'unit': unit,
+                           'seconds': seconds, 'throughput': count / seconds, 'peak_mb': peak / 2 ** 20}
+                except Exception as e:
+                    row = {'benchmark': name, 'size': size, 'error': str(e)}
+                finally:
+                    os.chdir(cwd)
+            results.append(row)
+            print(format_row(row), flush=True)
+    return results
+
+def format_row(row, reference=None):
+    if 'error' in row:
+        return f"{row['benchmark']:<16}{row['size']:>10}  ignoré : {row['error']}"
+    line = (f"{row['benchmark']:<16}{row['size']:>10}{row['seconds']:>12.4f} s"
+            f"{row['throughput']:>14.0f} {row['unit'] + '/s':<16}{row['peak_mb']:>8.1f} Mo")
+    if reference and 'seconds' in reference:
+        line += f"{row['seconds'] / reference['seconds']:>8.2f}x"
+    return line
+
+def git_revision():
+    """Commit courant (abrégé) et présence de modifications non commitées."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, dirty
+
+def save_results(results, scale):
+    """Écrit les résultats dans BENCH_DIR/<commit>.json (suffixe -dirty si l'arbre est modifié)."""
+    commit, dirty = git_revision()
+    report = {'commit': commit, 'dirty': dirty, 'timestamp': datetime.now().isoformat(timespec='seconds'),
+              'scale': scale, 'python': platform.python_version(), 'numpy': np.__version__,
+              'pandas': pd.__version__, 'machine': platform.machine(), 'results': results}
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    filename = os.path.join(BENCH_DIR, commit + ('-dirty' if dirty else '') + '.json')
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    return filename
+
+def load_results(name):
+    """Résultats enregistrés d'un commit, indexés par (benchmark, taille)."""
+    with open(os.path.join(BENCH_DIR, name + '.json'), 'r', encoding='utf-8') as f:
+        return {(r['benchmark'], r['size']): r for r in json.load(f)['results']}
+
+def compare(results, reference, reference_name):
+    """Affiche les résultats avec le rapport de temps par rapport à un commit enregistré (>1 : plus lent)."""
+    print(f"Comparaison avec {reference_name}")
+    for row in results:
+        print(format_row(row, reference.get((row['benchmark'], row['size']))))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks sur des données synthétiques de taille croissante")
+    parser.add_argument('--scale', choices=tuple(SCALES), default='quick')
+    parser.add_argument('--only', nargs='+', choices=[name for name, _, _ in BENCHMARKS])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compare', metavar='COMMIT', help="Résultats enregistrés à comparer (ex. a1b2c3d)")
+    args = parser.parse_args()
+
+    # Référence lue avant l'écriture : le fichier du commit courant peut être remplacé
+    reference = load_results(args.compare) if args.compare else None
+    print(f"{'benchmark':<16}{'taille':>10}{'temps':>14}{'débit':>15}{'pic mém.':>27}")
+    results = run_benchmarks(args.scale, args.only, args.repeat)
+    print(f"Résultats écrits dans {save_results(results, args.scale)}")
+    if args.compare:
+        compare(results, reference, args.compare)
@@ -0,0 +1,263 @@
+import argparse
+import contextlib
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import api_cache
+import engine
+import intraday
+from ingest import load_ingested
+import montecarlo
+from matrix_store import load_directory_cached
+from series_store import STORE_DIR, load_csv_cached
+from sweep import SWEEP_AXES, sweep
+
+FORMATS = ('json', 'csv', 'parquet')
+HASH_FILE = 'historical_data_hashrate.csv'
+PRICE_FILE = 'historical_btcprice.csv'
+
+def load_network(args):
+    """Hashrate et prix depuis le store binaire (aucun appel réseau ; `fetch` les met à jour)."""
+    for filename in (args.hash_file, args.price_file):
+        if not os.path.exists(filename):
+            sys.exit(f"{filename} introuvable : lancez d'abord `python cli.py fetch`")
+    return engine.to_series(load_csv_cached(args.hash_file)), engine.to_series(load_csv_cached(args.price_file))
+
+def load_power(filename, units=None):
+    """Profil de puissance d'un site ; sans fichier, la puissance par défaut du moteur est utilisée.
+
+    Un répertoire de CSV est lu via sa matrice temps × unité : le profil est la somme de ses unités
+    (ou des seules units), sans relire les fichiers une fois la matrice construite.
+    """
+    if filename is None:
+        return 'default', []
+    if os.path.isdir(filename):
+        power = load_directory_cached(filename).total(units)
+    else:
+        power = load_csv_cached(filename)
+    return os.path.splitext(os.path.basename(os.path.normpath(filename)))[0], as_profile(power)
+
+def as_profile(power):
+    """Profil horaire ou au quart d'heure conservé à sa résolution pour intraday.simulate_intraday, sinon pd.Series."""
+    return power if intraday.is_subdaily(power) else engine.to_series(power)
+
+def load_stored(name, store):
+    """Série du store par son nom, réingérée en flux si son export a changé (jamais relu en entier)."""
+    try:
+        return as_profile(load_ingested(name, store))
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+
+def load_profiles(args):
+    """(site, profil) des CSV ou répertoires donnés, puis des séries du store nommées par --series (ingest.py)."""
+    profiles = [load_power(filename, args.units) for filename in args.power]
+    profiles += [(name, load_stored(name, args.store_dir)) for name in args.series or []]
+    return profiles or [load_power(None)]
+
+def daily_power(power):
+    """MW moyens par jour : entrée du balayage et du Monte Carlo, qui travaillent au pas journalier."""
+    return intraday.daily_usage(power)['mw'].dropna() if intraday.is_subdaily(power) else power
+
+def run_engine(power, hashrate, price, options=None, **params):
+    """engine.simulate, ou simulate_intraday pour un profil infra-journalier ou avec options intra-journalières."""
+    if options or intraday.is_subdaily(power):
+        return intraday.simulate_intraday(power, hashrate, price, **params, **(options or {}))
+    return engine.simulate(power, hashrate, price, **params)
+
+def intraday_options(args):
+    """Plafond de puissance, prix de l'électricité (CSV date,€/MWh) et prix d'arrêt des mineurs, s'ils sont donnés."""
+    options = {'capacity_mw': args.capacity_mw, 'max_price': args.max_price,
+               'electricity_price': load_csv_cached(args.electricity_price) if args.electricity_price else None}
+    return {name: value for name, value in options.items() if value is not None}
+
+def simulation_params(args):
+    return {'efficiency': args.efficiency, 'fees': args.fees, 'electricity_cost': args.electricity_cost,
+            'initial_investment': args.investment}
+
+def by_site(tables):
+    """Concatène les tableaux de chaque site ; l'index gagne un niveau 'site' s'il y a plusieurs profils."""
+    if len(tables) == 1:
+        return next(iter(tables.values()))
+    return pd.concat(tables, names=['site'])
+
+def run_simulate(args, hashrate, price):
+    """Backtest historique de chaque profil."""
+    tables = {}
+    for site, power in load_profiles(args):
+        daily, yearly = run_engine(power, hashrate, price, intraday_options(args), start=args.start, end=args.end,
+                                   **simulation_params(args))
+        tables[site] = daily if args.table == 'daily' else yearly
+    return by_site(tables)
+
+def run_project(args, hashrate, price):
+    """Projection sur la loi de puissance, ou bandes de percentiles Monte Carlo si --paths > 0."""
+    tables = {}
+    for site, power in load_profiles(args):
+        if args.paths > 0:
+            result = montecarlo.simulate_paths(daily_power(power), hashrate, price, n_paths=args.paths, exponent=args.exponent,
+                                               growth=args.growth, percentiles=args.percentiles, seed=args.seed,
+                                               **simulation_params(args))
+            if args.table == 'daily':
+                table = pd.concat({'price_eur': result['price'], 'revenue_eur': result['daily_revenue']}, axis=1)
+                table.columns = [f'{name}_{band}' for name, band in table.columns]
+                table.index.name = 'date'
+            else:
+                table = result['cumulative'].add_prefix('cumulative_eur_')
+        else:
+            daily, yearly = run_engine(power, hashrate, price, exponent=args.exponent, growth=args.growth,
+                                       projection=True, **simulation_params(args))
+            table = daily if args.table == 'daily' else yearly
+        tables[site] = table
+    return by_site(tables)
+
+def run_sweep(args, hashrate, price):
+    """Grille cartésienne des paramètres, à plat : une ligne par combinaison."""
+    if args.series and args.power:
+        sys.exit("sweep : un seul profil, CSV ou --series")
+    if args.series:
+        power = load_stored(args.series, args.store_dir)
+    else:
+        _, power = load_power(args.power, args.units)
+    result = sweep(daily_power(power), hashrate, price, efficiency=args.efficiency, electricity_cost=args.electricity_cost,
+                   exponent=args.exponent, growth=args.growth, fees=args.fees,
+                   initial_investment=args.investment, projection=args.projection,
+                   start=args.start, end=args.end)
+    cumulative = result['cumulative_eur']
+    # Le coût d'équilibre ne dépend pas du coût de l'électricité : répété sur cet axe
+    break_even = np.broadcast_to(result['break_even_electricity_cost'][:, None], cumulative.shape)
+    index = pd.MultiIndex.from_product([result['axes'][name] for name in SWEEP_AXES], names=SWEEP_AXES)
+    return pd.DataFrame({'cumulative_eur': cumulative.ravel(),
+                         'break_even_electricity_cost': break_even.ravel()}, index=index)
+
+def run_fetch(args):
+    """Met à jour les CSV historiques (TradingView) de --hash-file et --price-file puis leur version binaire dans le store."""
+    import simulateur  # dépendances réseau (tvDatafeed) chargées uniquement pour cette commande
+    from fetch_scheduler import scheduler
+    # Messages de progression sur stderr : la sortie standard ne contient que le résultat
+    with contextlib.redirect_stdout(sys.stderr):
+        simulateur.get_historical_prices(args.price_file)
+        simulateur.get_hash_historical_data_csv(args.hash_file)
+        scheduler.dump_metrics()
+    rows = []
+    for filename in (args.hash_file, args.price_file):
+        if not os.path.exists(filename):
+            print(f"{filename} indisponible", file=sys.stderr)
+            continue
+        series = load_csv_cached(filename)
+        values = np.asarray(series.values)
+        last = int(np.flatnonzero(~np.isnan(values))[-1]) if len(values) and not np.isnan(values).all() else None
+        rows.append({'file': filename, 'name': series.name, 'unit': series.unit, 'start': series.start,
+                     'days': len(series),
+                     'last_date': series.start + pd.Timedelta(seconds=series.stride * last) if last is not None else None,
+                     'last_value': float(values[last]) if last is not None else None})
+    return pd.DataFrame(rows, columns=['file', 'name', 'unit', 'start', 'days', 'last_date', 'last_value'])
+
+def output_format(args):
+    """Format explicite, sinon déduit de l'extension du fichier de sortie (JSON par défaut)."""
+    if args.format:
+        return args.format
+    extension = os.path.splitext(args.output or '')[1].lstrip('.').lower()
+    return extension if extension in FORMATS else 'json'
+
+def write_table(table, fmt, output=None):
+    """Écrit le tableau en JSON (liste d'enregistrements), CSV ou Parquet ; sur la sortie standard sans fichier."""
+    if fmt == 'parquet':
+        table.to_parquet(output)
+    elif fmt == 'csv':
+        table.to_csv(output if output else sys.stdout)
+    else:
+        records = table.reset_index() if any(name is not None for name in table.index.names) else table
+        text = records.to_json(orient='records', date_format='iso')
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+        else:
+            sys.stdout.write(text + '\n')
+    if output:
+        print(f"Fichier {output} généré", file=sys.stderr)
+
+def float_list(text):
+    """Valeurs séparées par des virgules, ou plage début:fin:pas (fin incluse)."""
+    if text.count(':') == 2:
+        start, stop, step = (float(x) for x in text.split(':'))
+        return np.arange(start, stop + step / 2, step)
+    return np.array([float(x) for x in text.split(',')])
+
+def build_parser():
+    # Options communes, acceptées après le nom de la commande
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--offline', action='store_true', help="Aucune requête réseau (commande fetch)")
+    common.add_argument('--hash-file', default=HASH_FILE)
+    common.add_argument('--price-file', default=PRICE_FILE)
+    common.add_argument('--format', choices=FORMATS, help="Par défaut : extension de --output, sinon json")
+    common.add_argument('--output', '-o', help="Fichier de sortie (sortie standard par défaut, sauf parquet)")
+    parser = argparse.ArgumentParser(description="Simulateur de minage sans génération de la page HTML")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_costs(command, many=False):
+        kind = float_list if many else float
+        command.add_argument('--efficiency', type=kind, default=kind('18'), help='J/TH')
+        command.add_argument('--fees', type=kind, default=kind('0.022'), help='BTC par bloc')
+        command.add_argument('--electricity-cost', type=kind, default=kind('0'), help='€/kWh')
+        command.add_argument('--investment', type=float, default=0.0, help='Investissement initial (€)')
+
+    simulate = commands.add_parser('simulate', parents=[common], help="Backtest historique d'un ou plusieurs profils")
+    simulate.add_argument('power', nargs='*', help="CSV date,MW ou répertoire de CSV (puissance par défaut si absent)")
+    add_costs(simulate)
+    simulate.add_argument('--start')
+    simulate.add_argument('--end')
+    simulate.add_argument('--table', choices=('daily', 'yearly'), default='yearly')
+    simulate.add_argument('--capacity-mw', type=float, help="MW de mineurs installés (plafond à chaque pas)")
+    simulate.add_argument('--electricity-price', help="CSV date,€/MWh (prix spot horaire par exemple)")
+    simulate.add_argument('--max-price', type=float, help="€/MWh au-delà duquel les mineurs sont arrêtés")
+
+    project = commands.add_parser('project', parents=[common], help="Projection 2026-2032 sur la puissance moyenne des profils")
+    project.add_argument('power', nargs='*', help="CSV date,MW ou répertoire de CSV (puissance par défaut si absent)")
+    add_costs(project)
+    project.add_argument('--exponent', type=float, default=5.6, help='Exposant de la loi de puissance')
+    project.add_argument('--growth', type=float, default=30, help='Croissance annuelle du hashrate (%%)')
+    project.add_argument('--paths', type=int, default=0, help='Trajectoires Monte Carlo (0 : loi de puissance seule)')
+    project.add_argument('--percentiles', type=float, nargs='+', default=[5, 50, 95])
+    project.add_argument('--seed', type=int)
+    project.add_argument('--table', choices=('daily', 'yearly'), default='yearly')
+
+    grid = commands.add_parser('sweep', parents=[common], help="Grille de paramètres (valeurs a,b,c ou plage début:fin:pas)")
+    grid.add_argument('power', nargs='?', help="CSV date,MW ou répertoire de CSV (puissance par défaut si absent)")
+    add_costs(grid, many=True)
+    grid.add_argument('--exponent', type=float_list, default=float_list('5.6'))
+    grid.add_argument('--growth', type=float_list, default=float_list('30'))
+    grid.add_argument('--projection', action='store_true')
+    grid.add_argument('--start')
+    grid.add_argument('--end')
+
+    for command in (simulate, project, grid):
+        command.add_argument('--units', nargs='+', help="Unités sommées quand le profil est un répertoire de CSV")
+        command.add_argument('--series', nargs='+' if command is not grid else None,
+                             help="Série(s) du store par nom, par exemple importée(s) par ingest.py")
+        command.add_argument('--store-dir', default=STORE_DIR, help="Répertoire du store des séries")
+
+    commands.add_parser('fetch', parents=[common], help="Met à jour les séries historiques et le store binaire")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    fmt = output_format(args)
+    if fmt == 'parquet' and not args.output:
+        parser.error("le format parquet nécessite --output")
+    if args.offline:
+        api_cache.set_offline()
+
+    if args.command == 'fetch':
+        table = run_fetch(args)
+    else:
+        hashrate, price = load_network(args)
+        run = {'simulate': run_simulate, 'project': run_project, 'sweep': run_sweep}[args.command]
+        table = run(args, hashrate, price)
+    write_table(table, fmt, args.output)
+
+if __name__ == "__main__":
+    main()
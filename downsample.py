@@ -0,0 +1,35 @@
+import numpy as np
+
+# Nombre de points de chaque niveau de détail, du plus grossier au plus fin
+LOD_POINTS = (250, 1000)
+
+def lttb(x, y, threshold):
+    """Indices des points retenus par Largest-Triangle-Three-Buckets ; conserve la forme (pics, creux) de la courbe."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    # Seaux de même taille entre le premier et le dernier point, toujours conservés
+    every = (n - 2) / (threshold - 2)
+    bounds = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    bounds[-1] = n - 1
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        # Sommet fixe du triangle suivant : moyenne du seau suivant (ou dernier point)
+        if i + 2 < len(bounds):
+            cx, cy = x[hi:bounds[i + 2]].mean(), y[hi:bounds[i + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+def lod_levels(x, y, points=LOD_POINTS):
+    """Indices des niveaux de détail nettement plus grossiers que la série complète (du plus grossier au plus fin)."""
+    # Un niveau gardant plus de la moitié des points ne vaut pas son poids dans la page
+    return [lttb(x, y, size) for size in sorted(points) if 2 * size <= len(x)]
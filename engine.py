@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+import subsidy
+
+# Paramètres de simulation (identiques à ceux de la page générée par simulateur.py)
+GENESIS_DATE = pd.Timestamp(2009, 1, 3)  # 3 janv 2009
+CURRENT_HASH_EH_S = 1020  # Hash global actuel (EH/s) updated for 2025
+REFERENCE_DATE = pd.Timestamp(2025, 7, 1)  # Date de calibration de la loi de puissance
+REFERENCE_PRICE_EUR = 95335
+PROJECTION_START = pd.Timestamp(2026, 1, 1)
+PROJECTION_END = pd.Timestamp(2032, 12, 31)
+DEFAULT_POWER_MW = 1000  # MW exploitable du site si aucun profil n'est fourni
+
+def to_series(data):
+    """Convertit une liste de dicts (format load_sample_csv), une série du store ou une pd.Series en série triée par date."""
+    if hasattr(data, 'to_pandas'):  # series_store.Series : vue sans copie des valeurs
+        data = data.to_pandas()
+    if isinstance(data, pd.Series):
+        series = data.astype(float)
+        series.index = pd.to_datetime(series.index)
+    else:
+        df = pd.DataFrame.from_records(list(data))
+        if df.empty:
+            return pd.Series(dtype=float, index=pd.DatetimeIndex([]))
+        value_key = [c for c in df.columns if c != 'date'][0]  # 'mw', 'ehs' ou 'pr'
+        series = pd.Series(df[value_key].to_numpy(dtype=float),
+                           index=pd.to_datetime(df['date'], errors='coerce'))
+        series = series[series.index.notna()]
+    # Comme Array.find côté JS : la première occurrence d'une date l'emporte
+    series = series[~series.index.duplicated(keep='first')]
+    return series.sort_index()
+
+def days_since_genesis(dates):
+    """Jours depuis la genèse pour un tableau de dates."""
+    return np.asarray((pd.DatetimeIndex(dates) - GENESIS_DATE).days, dtype=float)
+
+def power_law_price(days, exponent=5.6):
+    """Prix BTC (€) selon la loi de puissance A * jours^exposant, calibrée sur le prix de référence."""
+    reference_days = (REFERENCE_DATE - GENESIS_DATE).days
+    return REFERENCE_PRICE_EUR * (np.asarray(days, dtype=float) / reference_days) ** exponent
+
+def daily_rewards(dates, fees=0.022):
+    """BTC distribués aux mineurs chaque jour : subvention exacte des blocs attendus ce jour-là, plus les frais."""
+    blocks, issued = subsidy.daily_issuance(days_since_genesis(dates))
+    return issued + fees * blocks
+
+def simulation_dates(power, hashrate, projection=False, start=None, end=None):
+    """Calendrier journalier simulé : fenêtre du profil de puissance, ou horizon de projection."""
+    if projection:
+        return pd.date_range(PROJECTION_START, PROJECTION_END, freq='D')
+    reference = power if len(power) > 0 else hashrate
+    if len(reference) == 0:
+        return pd.DatetimeIndex([])
+    start = pd.Timestamp(start) if start is not None else reference.index[0]
+    end = pd.Timestamp(end) if end is not None else reference.index[-1]
+    return pd.date_range(start, end, freq='D')
+
+def daily_inputs(power, hashrate, price, dates, exponent=5.6, growth=30, projection=False):
+    """Aligne MW du site, hashrate global (EH/s) et prix (€) sur le calendrier simulé."""
+    power_average = power.mean() if len(power) > 0 else DEFAULT_POWER_MW
+    years = dates.year.to_numpy()
+    law_price = power_law_price(days_since_genesis(dates), exponent)
+
+    if projection:
+        mw = np.full(len(dates), power_average, dtype=float)
+        global_hash = CURRENT_HASH_EH_S * (1 + growth / 100) ** (years - 2025)
+        return mw, global_hash, law_price
+
+    # Jours manquants : moyenne du site, moyenne annuelle du hashrate, loi de puissance pour le prix
+    mw = power.reindex(dates).fillna(power_average).to_numpy()
+    yearly_hash = hashrate.groupby(hashrate.index.year).mean()
+    hash_fallback = yearly_hash.reindex(years).fillna(CURRENT_HASH_EH_S).to_numpy()
+    global_hash = hashrate.reindex(dates).to_numpy()
+    global_hash = np.where(np.isnan(global_hash), hash_fallback, global_hash)
+    price_eur = price.reindex(dates).to_numpy()
+    price_eur = np.where(np.isnan(price_eur), law_price, price_eur)
+    return mw, global_hash, price_eur
+
+def simulate(power, hashrate, price, efficiency=18, fees=0.022, electricity_cost=0.0,
+             initial_investment=0.0, exponent=5.6, growth=30, projection=False, start=None, end=None):
+    """Simule le minage jour par jour en opérations vectorisées ; retourne les tableaux quotidien et annuel.
+
+    Paramètres identiques aux sliders de la page : efficacité (J/TH), frais par bloc (BTC),
+    coût de l'électricité (€/kWh), investissement initial (€), exposant de la loi de puissance
+    et croissance annuelle du hashrate (%) pour le mode projection.
+    """
+    power = to_series(power)
+    hashrate = to_series(hashrate)
+    price = to_series(price)
+    dates = simulation_dates(power, hashrate, projection, start, end)
+    mw, global_hash, price_eur = daily_inputs(power, hashrate, price, dates, exponent, growth, projection)
+
+    site_hash = mw / efficiency  # (1000 / J/TH) * GW = EH/s
+    hash_share = site_hash / global_hash
+    btc_mined = hash_share * daily_rewards(dates, fees)
+    daily_cost = mw * 1000 * 24 * electricity_cost
+    net_revenue = btc_mined * price_eur - daily_cost
+
+    daily = pd.DataFrame({
+        'mw': mw,
+        'price_eur': price_eur,
+        'hash_pct': hash_share * 100,
+        'site_hash_ehs': site_hash,
+        'global_hash_ehs': global_hash,
+        'btc_mined': btc_mined,
+        'revenue_eur': net_revenue,
+        'cumulative_eur': np.cumsum(net_revenue) - initial_investment,
+    }, index=pd.DatetimeIndex(dates, name='date'))
+    return daily, yearly_summary(daily, initial_investment)
+
+def yearly_summary(daily, initial_investment=0.0):
+    """Synthèse annualisée du tableau quotidien (tableau "Synthèse Performance" de la page)."""
+    yearly = daily.groupby(daily.index.year).agg(
+        price_eur=('price_eur', 'mean'),
+        hash_pct=('hash_pct', 'mean'),
+        btc_mined=('btc_mined', 'sum'),
+        revenue_eur=('revenue_eur', 'sum'),
+    )
+    yearly.index.name = 'year'
+    yearly['cumulative_eur'] = yearly['revenue_eur'].cumsum() - initial_investment
+    return yearly
@@ -0,0 +1,132 @@
+import json
+import os
+import random
+import threading
+import time
+
+# Bornes (s) de l'histogramme des latences
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float('inf'))
+METRICS_FILE = os.path.join('.cache', 'fetch_metrics.json')
+
+class CircuitOpenError(Exception):
+    """Levée sans appel réseau quand le disjoncteur d'une source est ouvert."""
+
+class CircuitBreaker:
+    """Disjoncteur : s'ouvre après failure_threshold échecs consécutifs, réessaie après reset_timeout."""
+
+    def __init__(self, failure_threshold=3, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self):
+        if self.opened_at is None:
+            return True
+        # Demi-ouvert : un essai est autorisé une fois le délai écoulé
+        return time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+def _new_metrics():
+    return {'attempts': 0, 'successes': 0, 'failures': 0, 'rejected': 0, 'cache_hits': 0, 'bytes': 0,
+            'latency_total': 0.0, 'latency_histogram': [0] * len(LATENCY_BUCKETS)}
+
+class FetchScheduler:
+    """Exécute les récupérations réseau avec échéance, backoff exponentiel aléatoire, disjoncteur par source et métriques."""
+
+    def __init__(self, attempts=4, base_delay=0.5, max_delay=8.0, deadline=30.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.breakers = {}
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def configure(self, source, failure_threshold=3, reset_timeout=60):
+        """Règle le disjoncteur d'une source (nombre d'échecs consécutifs avant ouverture, délai de réessai)."""
+        with self.lock:
+            self._source(source)
+            self.breakers[source] = CircuitBreaker(failure_threshold, reset_timeout)
+
+    def _source(self, source):
+        if source not in self.metrics:
+            self.metrics[source] = _new_metrics()
+            self.breakers[source] = CircuitBreaker()
+        return self.metrics[source], self.breakers[source]
+
+    def call(self, source, fn, attempts=None, deadline=None):
+        """Appelle fn() pour source en réessayant jusqu'à attempts fois sans dépasser deadline secondes."""
+        attempts = attempts or self.attempts
+        end = time.monotonic() + (deadline or self.deadline)
+        last_error = None
+        for attempt in range(attempts):
+            with self.lock:
+                metrics, breaker = self._source(source)
+                if not breaker.allow():
+                    metrics['rejected'] += 1
+                    raise CircuitOpenError(f"Disjoncteur ouvert pour {source}") from last_error
+                metrics['attempts'] += 1
+            start = time.monotonic()
+            try:
+                value = fn()
+            except Exception as e:
+                last_error = e
+                with self.lock:
+                    self._record_latency(metrics, time.monotonic() - start)
+                    metrics['failures'] += 1
+                    breaker.failure()
+                print(f"{source} : tentative #{attempt + 1} échouée ({e})")
+            else:
+                with self.lock:
+                    self._record_latency(metrics, time.monotonic() - start)
+                    metrics['successes'] += 1
+                    breaker.success()
+                return value
+            # Backoff exponentiel avec jitter complet, sans dépasser l'échéance
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            if attempt + 1 == attempts or time.monotonic() + delay >= end:
+                break
+            time.sleep(delay)
+        raise last_error
+
+    def _record_latency(self, metrics, latency):
+        metrics['latency_total'] += latency
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                metrics['latency_histogram'][i] += 1
+                break
+
+    def record_bytes(self, source, count):
+        with self.lock:
+            self._source(source)[0]['bytes'] += count
+
+    def record_cache_hit(self, source):
+        with self.lock:
+            self._source(source)[0]['cache_hits'] += 1
+
+    def dump_metrics(self, filename=METRICS_FILE):
+        """Affiche la synthèse des métriques par source et l'écrit en JSON."""
+        with self.lock:
+            snapshot = json.loads(json.dumps(self.metrics))
+        print(f"{'Source':<18}{'Essais':>8}{'Succès':>8}{'Échecs':>8}{'Rejets':>8}{'Cache':>8}{'Octets':>10}{'Latence moy. (s)':>18}")
+        for source, m in sorted(snapshot.items()):
+            measured = m['successes'] + m['failures']
+            average = m['latency_total'] / measured if measured else 0.0
+            print(f"{source:<18}{m['attempts']:>8}{m['successes']:>8}{m['failures']:>8}{m['rejected']:>8}"
+                  f"{m['cache_hits']:>8}{m['bytes']:>10}{average:>18.3f}")
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'latency_buckets': [str(b) for b in LATENCY_BUCKETS], 'sources': snapshot}, f, indent=2)
+        return snapshot
+
+# Planificateur partagé par toutes les récupérations d'une exécution
+scheduler = FetchScheduler()
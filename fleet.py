@@ -0,0 +1,111 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import engine
+import intraday
+from ingest import load_ingested
+from matrix_store import MATRIX_DIR, TOTAL_COLUMN, directory_key, load_directory_cached, load_matrix
+from series_store import STORE_DIR, load_csv_cached, load_series
+
+# Séries réseau et matrice des profils partagées par chaque processus du pool (chargées une seule fois)
+_shared = {}
+
+def _init_worker(hashrate, price, params, matrix_name=None, store=MATRIX_DIR, series_dir=None):
+    _shared['hashrate'] = hashrate
+    _shared['price'] = price
+    _shared['params'] = params
+    if matrix_name is not None:
+        # Mappée en mémoire : les processus partagent les pages du fichier, sans relire ni copier les CSV
+        _shared['matrix'] = load_matrix(matrix_name, store)
+    if series_dir is not None:
+        _shared['series_dir'] = series_dir
+
+def payback_days(daily):
+    """Nombre de jours avant que le cumul net redevienne positif, None si jamais atteint."""
+    reached = (daily['cumulative_eur'] >= 0).to_numpy()
+    if not reached.any():
+        return None
+    return int(reached.argmax()) + 1
+
+def simulate_site(site):
+    """Simule un profil de puissance (unité de la matrice partagée, série du store ou CSV date,MW) avec les séries partagées du processus."""
+    name = site
+    if 'matrix' in _shared:
+        power = _shared['matrix'].series(site)
+    elif 'series_dir' in _shared:
+        power = load_series(site, _shared['series_dir'])
+    else:
+        power = load_csv_cached(site)
+        name = os.path.splitext(os.path.basename(site))[0]
+    if intraday.is_subdaily(power):
+        daily, yearly = intraday.simulate_intraday(power, _shared['hashrate'], _shared['price'], **_shared['params'])
+    else:
+        power = engine.to_series(power)
+        daily, yearly = engine.simulate(power, _shared['hashrate'], _shared['price'], **_shared['params'])
+    return {
+        'site': name,
+        'days': len(daily),
+        'average_mw': float(np.nanmean(power.values)) if len(power) > 0 else 0.0,
+        'btc_mined': daily['btc_mined'].sum(),
+        'net_eur': daily['cumulative_eur'].iloc[-1] if len(daily) > 0 else 0.0,
+        'payback_days': payback_days(daily),
+    }
+
+def run_fleet(directory='test_data', hash_file='historical_data_hashrate.csv',
+              price_file='historical_btcprice.csv', workers=None, units=None, store=MATRIX_DIR,
+              series=None, series_dir=STORE_DIR, **params):
+    """Backtest de chaque unité des CSV d'un répertoire (ou des seules units) sur un pool de processus ; retourne le classement.
+
+    Les CSV sont assemblés une fois en matrice temps × unité (matrix_store) : les semestres d'une même
+    unité sont simulés ensemble et les exécutions suivantes ne relisent aucun fichier. Avec series, les
+    sites sont des séries du store nommées (ingest.py) et le répertoire n'est pas lu.
+    """
+    if series:
+        for name in series:  # réingestion en flux des exports modifiés, avant le démarrage du pool
+            load_ingested(name, series_dir)
+        sites, matrix_name, series_source = list(series), None, series_dir
+    else:
+        matrix_name = directory_key(directory)
+        matrix = load_directory_cached(directory, matrix_name, store)
+        # Par défaut, la colonne agrégée du parc n'est pas classée comme un site (comme dans Matrix.total)
+        sites = units or [c for c in matrix.columns if c != TOTAL_COLUMN]
+        matrix.positions(sites)  # unité inconnue : erreur avant le démarrage du pool
+        series_source = None
+    hashrate = engine.to_series(load_csv_cached(hash_file))
+    price = engine.to_series(load_csv_cached(price_file))
+    chunksize = max(1, len(sites) // (4 * (workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(hashrate, price, params, matrix_name, store, series_source)) as pool:
+        rows = list(pool.map(simulate_site, sites, chunksize=chunksize))
+
+    summary = pd.DataFrame(rows, columns=['site', 'days', 'average_mw', 'btc_mined', 'net_eur', 'payback_days'])
+    summary['payback_days'] = summary['payback_days'].astype('Int64')
+    summary = summary.sort_values('net_eur', ascending=False).reset_index(drop=True)
+    summary.index = summary.index + 1
+    summary.index.name = 'rank'
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest de tous les profils de puissance d'un répertoire")
+    parser.add_argument('directory', nargs='?', default='test_data')
+    parser.add_argument('--units', nargs='+', help="Unités à simuler (toutes par défaut), ex. 'PALUEL 1'")
+    parser.add_argument('--series', nargs='+', help="Séries du store à simuler à la place du répertoire (ingest.py --name)")
+    parser.add_argument('--store-dir', default=STORE_DIR, help="Répertoire du store des séries")
+    parser.add_argument('--efficiency', type=float, default=18, help='J/TH')
+    parser.add_argument('--fees', type=float, default=0.022, help='BTC par bloc')
+    parser.add_argument('--electricity-cost', type=float, default=0.0, help='€/kWh')
+    parser.add_argument('--investment', type=float, default=0.0, help='Investissement initial (€)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default='fleet_summary.csv')
+    args = parser.parse_args()
+
+    summary = run_fleet(args.directory, workers=args.workers, units=args.units, series=args.series,
+                        series_dir=args.store_dir, efficiency=args.efficiency, fees=args.fees,
+                        electricity_cost=args.electricity_cost, initial_investment=args.investment)
+    print(summary.to_string())
+    summary.to_csv(args.output)
+    print(f"Fichier {args.output} généré")
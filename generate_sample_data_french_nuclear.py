@@ -1,19 +1,164 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-xls = pd.ExcelFile('Kd-Kp_2023-semestre1.xlsx')
-df1 = pd.read_excel(xls, 'Kd-Kp').dropna()
-df1['Date'] = df1['Date'].replace('-.*',':00',regex=True)
-df1['Date'] = pd.to_datetime(df1['Date'],format='%d/%m/%Y %H:%M:%S') # 30/06/2023 23:00:00
-df1.rename(columns={'Unnamed: 57':'Parc Nucléaire Complet'}, inplace=True)
-df1.set_index('Date',inplace=True)
-print(df1.info())
-# Resample for complete daily df1 
-df1 = df1.resample(rule='24H', closed='left', label='left').mean()
-df1.index = pd.to_datetime(df1.index).date
-df1['date'] = df1.index
-print(df1)
-df1.to_excel('Kd-Kp_2023-semestre1_daily.xlsx')
-for column_name in [x for x in df1.columns if x!='date']:
-    df_to_export = df1[['date',column_name]]
-    print('Generate file '+'test_data/'+column_name+' 2023 H1.csv ...')
-    df_to_export.to_csv('test_data/'+column_name+' 2023 H1.csv',sep=',',index=False)
-    
\ No newline at end of file
+
+from matrix_store import TOTAL_COLUMN, import_directory
+
+try:
+    import python_calamine  # noqa: F401  lecteur Excel natif, bien plus rapide qu'openpyxl
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = None  # moteur par défaut de pandas (openpyxl)
+
+WORKBOOK_PATTERN = 'Kd-Kp_*.xlsx'  # Classeurs semestriels RTE Kd-Kp (production horaire par réacteur)
+SHEET = 'Kd-Kp'
+CACHE_DIR = os.path.join('.cache', 'kdkp')  # Forme colonnaire (.npz) de chaque classeur, nommée par empreinte
+MANIFEST_FILE = os.path.join(CACHE_DIR, 'manifest.json')
+OUTPUT_DIR = 'test_data'
+
+def file_checksum(path):
+    """Empreinte SHA-256 du contenu d'un fichier, lu par blocs."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def period_label(path):
+    """Libellé de la période d'un classeur : Kd-Kp_2023-semestre1.xlsx → '2023 H1'."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = re.search(r'(\d{4})-semestre(\d)', stem)
+    return f"{match.group(1)} H{match.group(2)}" if match else stem.replace('Kd-Kp_', '')
+
+def workbook_paths(pattern=WORKBOOK_PATTERN):
+    """Classeurs sources, hors synthèses journalières générées par ce script."""
+    return sorted(p for p in glob.glob(pattern) if not p.endswith('_daily.xlsx'))
+
+def parse_workbook(path, checksum):
+    """Lit la feuille Kd-Kp d'un classeur et l'écrit sous forme colonnaire dans le cache ; retourne son chemin."""
+    df = pd.read_excel(path, SHEET, engine=EXCEL_ENGINE).dropna()
+    df = df.rename(columns={c: TOTAL_COLUMN for c in df.columns if str(c).startswith('Unnamed')})
+    dates = df.pop('Date')
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        # "30/06/2023 23:00-00:00" : début de l'intervalle horaire, converti en une seule passe
+        dates = pd.to_datetime(dates.astype(str).str.split('-', n=1).str[0].str.strip(),
+                               format='%d/%m/%Y %H:%M', errors='coerce')
+    valid = dates.notna().to_numpy()
+    cache_file = os.path.join(CACHE_DIR, checksum + '.npz')
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    np.savez(cache_file, times=dates[valid].to_numpy(dtype='datetime64[ns]'),
+             values=df.to_numpy(dtype=np.float64)[valid], columns=np.array([str(c) for c in df.columns]))
+    return cache_file
+
+def load_cached(cache_file):
+    """Classeur en cache : DataFrame horaire indexé par date, une colonne par réacteur."""
+    with np.load(cache_file) as data:
+        return pd.DataFrame(data['values'], index=pd.DatetimeIndex(data['times'], name='Date'),
+                            columns=data['columns'].tolist())
+
+def read_manifest():
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_workbooks(paths, workers=None):
+    """Charge chaque classeur depuis le cache ; seuls les classeurs nouveaux ou modifiés sont lus, en parallèle.
+
+    L'empreinte du contenu identifie la forme colonnaire ; elle n'est recalculée que si la taille ou la
+    date de modification du fichier a changé. Retourne {chemin: DataFrame} et la liste des chemins dont le
+    contenu a changé depuis la dernière exécution (ou jamais converti).
+    """
+    manifest = read_manifest()
+    checksums, stale, changed = {}, [], []
+    for path in paths:
+        stat = os.stat(path)
+        entry = manifest.get(os.path.abspath(path), {})
+        if entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime:
+            checksum = entry['checksum']
+        else:
+            checksum = file_checksum(path)
+        manifest[os.path.abspath(path)] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'checksum': checksum}
+        checksums[path] = checksum
+        missing = not os.path.exists(os.path.join(CACHE_DIR, checksum + '.npz'))
+        if missing:
+            stale.append(path)
+        if missing or entry.get('checksum') != checksum:
+            changed.append(path)
+
+    if stale:
+        # Une feuille par processus : pd.read_excel est limité par le CPU
+        with ProcessPoolExecutor(max_workers=min(len(stale), workers or os.cpu_count() or 1)) as pool:
+            for path, cache_file in zip(stale, pool.map(parse_workbook, stale, [checksums[p] for p in stale])):
+                print(f"{path} converti ({cache_file})")
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    frames = {path: load_cached(os.path.join(CACHE_DIR, checksums[path] + '.npz')) for path in paths}
+    return frames, changed
+
+def resample(frame, stride=86400):
+    """Moyenne sur des pas de stride secondes (journalière par défaut), jours calés sur minuit."""
+    return frame.resample(pd.Timedelta(seconds=stride), closed='left', label='left').mean()
+
+def write_reactor_csvs(frame, label, output_dir=OUTPUT_DIR, stride=86400):
+    """Écrit un CSV date,MW par colonne : dates et valeurs formatées une seule fois pour toutes les colonnes."""
+    os.makedirs(output_dir, exist_ok=True)
+    dates = frame.index.strftime('%Y-%m-%d' if stride % 86400 == 0 else '%Y-%m-%d %H:%M').to_numpy(dtype=str)
+    values = frame.to_numpy(dtype=np.float64)
+    text = np.where(np.isnan(values), '', values.astype(str))
+    prefix = np.char.add(dates, ',')
+
+    def write(i):
+        column = frame.columns[i]
+        filename = os.path.join(output_dir, f"{column} {label}.csv")
+        with open(filename, 'w', encoding='utf-8', newline='') as f:
+            f.write(f"date,{column}\n" + '\n'.join(np.char.add(prefix, text[:, i])) + '\n')
+        return filename
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        return list(pool.map(write, range(len(frame.columns))))
+
+def run(paths=None, stride=86400, output_dir=OUTPUT_DIR, workers=None, force=False):
+    """Met à jour les CSV par réacteur des seuls semestres nouveaux ou modifiés (tous avec force)."""
+    paths = paths or workbook_paths()
+    frames, changed = load_workbooks(paths, workers)
+    written = False
+    for path in paths:
+        if not force and path not in changed:
+            print(f"{path} inchangé")
+            continue
+        label = period_label(path)
+        frame = resample(frames[path], stride)
+        if stride == 86400:
+            # Synthèse journalière du semestre, comme les versions précédentes du script
+            daily = frame.copy()
+            daily.index = daily.index.date
+            daily['date'] = daily.index
+            daily.to_excel(os.path.splitext(path)[0] + '_daily.xlsx')
+        files = write_reactor_csvs(frame, label, output_dir, stride)
+        written = True
+        print(f"{path} : {len(files)} fichiers {output_dir}/<réacteur> {label}.csv générés")
+    if written:
+        # Matrice temps × réacteur des CSV, prête pour fleet.py et cli.py
+        matrix = import_directory(output_dir)
+        print(f"Matrice {matrix.name} : {len(matrix)} pas × {len(matrix.columns)} réacteurs")
+    return frames
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSV par réacteur à partir des classeurs semestriels Kd-Kp")
+    parser.add_argument('workbooks', nargs='*', help=f"Classeurs (par défaut : {WORKBOOK_PATTERN})")
+    parser.add_argument('--stride', type=int, default=86400, help="Pas des CSV (s) : 86400 journalier, 3600 horaire")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help="Régénère aussi les semestres inchangés")
+    args = parser.parse_args()
+    run(args.workbooks, args.stride, args.output_dir, args.workers, args.force)
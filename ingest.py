@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from series_store import STORE_DIR, Series, load_series, read_header, save_series, source_state
+
+CHUNK_ROWS = 1_000_000  # Lignes lues par bloc : la mémoire ne dépend pas de la taille de l'export
+DEFAULT_STRIDE = 900  # s, résolution du simulateur infra-journalier (intraday.py)
+MAX_REPORTED_GAPS = 20
+
+class _Accumulator:
+    """Sommes et effectifs par pas de la grille cible, agrandis à la demande (taille de la série agrégée)."""
+
+    def __init__(self, stride):
+        self.stride_ns = stride * 10 ** 9
+        self.origin = None  # ns, minuit du premier horodatage rencontré
+        self.sums = np.zeros(0)
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, times_ns, values):
+        if len(times_ns) == 0:
+            return
+        if self.origin is None:
+            self.origin = pd.Timestamp(int(times_ns.min())).normalize().value
+        lowest = int(times_ns.min())
+        if lowest < self.origin:  # export non trié : la grille est étendue vers le passé
+            origin = pd.Timestamp(lowest).normalize().value
+            shift = (self.origin - origin) // self.stride_ns
+            self.sums = np.concatenate((np.zeros(shift), self.sums))
+            self.counts = np.concatenate((np.zeros(shift, dtype=np.int64), self.counts))
+            self.origin = origin
+        buckets = (times_ns - self.origin) // self.stride_ns
+        size = int(buckets.max()) + 1
+        if size > len(self.sums):
+            grow = max(size, 2 * len(self.sums)) - len(self.sums)
+            self.sums = np.concatenate((self.sums, np.zeros(grow)))
+            self.counts = np.concatenate((self.counts, np.zeros(grow, dtype=np.int64)))
+        self.sums[:size] += np.bincount(buckets, weights=values, minlength=size)
+        self.counts[:size] += np.bincount(buckets, minlength=size)
+
+    def series(self, name, unit):
+        """Moyenne par pas, du premier au dernier pas renseigné ; NaN pour les pas sans mesure."""
+        filled = np.flatnonzero(self.counts)
+        if len(filled) == 0:
+            return Series(name, pd.Timestamp(0), self.stride_ns // 10 ** 9, np.empty(0), unit)
+        first, last = filled[0], filled[-1] + 1
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = self.sums[first:last] / self.counts[first:last]
+        values[self.counts[first:last] == 0] = np.nan
+        start = pd.Timestamp(self.origin + first * self.stride_ns)
+        return Series(name, start, self.stride_ns // 10 ** 9, values, unit)
+
+def _gaps(series):
+    """Plages de pas consécutifs sans mesure : (début, fin exclue, durée en heures), les plus longues d'abord."""
+    missing = np.isnan(series.values).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], missing, [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    order = np.argsort(starts - ends, kind='stable')
+    step = pd.Timedelta(seconds=series.stride)
+    return len(starts), int(missing.sum()), [
+        {'start': (series.start + int(starts[i]) * step).isoformat(),
+         'end': (series.start + int(ends[i]) * step).isoformat(),
+         'hours': float((ends[i] - starts[i]) * series.stride / 3600)}
+        for i in order[:MAX_REPORTED_GAPS]]
+
+def ingest_csv(filename, name=None, stride=DEFAULT_STRIDE, date_column=0, value_column=1, date_format=None,
+               utc=False, scale=1.0, min_value=0.0, max_value=None, sep=',', chunk_rows=CHUNK_ROWS,
+               directory=STORE_DIR, unit='MW'):
+    """Ingère un export de compteur (potentiellement plusieurs Go) en série du store, par blocs de chunk_rows lignes.
+
+    Chaque bloc est converti en une passe (horodatages et valeurs vectorisés), les valeurs multipliées par
+    scale (ex. 0.001 pour des kW) puis moyennées sur la grille de stride secondes. Les valeurs hors de
+    [min_value, max_value] sont écartées comme aberrantes. La série est écrite au format du store (.npy et
+    en-tête JSON) avec un rapport d'ingestion (<nom>.ingest.json) : lignes lues, rejetées, aberrantes et trous.
+    """
+    name = name or os.path.splitext(os.path.basename(filename))[0]
+    # Paramètres enregistrés dans l'en-tête : load_ingested réingère l'export à l'identique s'il change
+    params = {'stride': stride, 'date_column': date_column, 'value_column': value_column,
+              'date_format': date_format, 'utc': utc, 'scale': scale, 'min_value': min_value,
+              'max_value': max_value, 'sep': sep, 'chunk_rows': chunk_rows, 'unit': unit}
+    source = source_state(filename)
+    accumulator = _Accumulator(stride)
+    report = {'source': os.path.abspath(filename), 'stride': stride, 'rows': 0, 'invalid_rows': 0,
+              'outliers': 0, 'outliers_low': 0, 'outliers_high': 0, 'unordered_rows': 0}
+    last_time = None
+    # Colonnes désignées par nom ou par position
+    header = pd.read_csv(filename, sep=sep, nrows=0).columns
+    date_key = header[date_column] if isinstance(date_column, int) else date_column
+    value_key = header[value_column] if isinstance(value_column, int) else value_column
+    # Valeurs lues en float par le parseur C ; un bloc contenant du texte reste en objets puis est converti
+    reader = pd.read_csv(filename, sep=sep, usecols=[date_key, value_key], chunksize=chunk_rows,
+                         dtype={date_key: object}, skipinitialspace=True, low_memory=False)
+    for chunk in reader:
+        report['rows'] += len(chunk)
+        if date_format is None:
+            # Format déduit une seule fois du premier horodatage, puis imposé à tous les blocs :
+            # sinon pandas le redevine par bloc (01/02 lu %m/%d, 13/02 lu %d/%m)
+            for text in chunk[date_key].dropna().astype(str).str.strip():
+                date_format = guess_datetime_format(text) if text else None
+                if date_format is not None:
+                    report['date_format'] = date_format
+                    break
+        # Conversion en bloc, au format explicite ou déduit
+        times = pd.to_datetime(chunk[date_key], format=date_format, errors='coerce', utc=utc)
+        if times.dt.tz is not None:
+            times = times.dt.tz_convert(None)
+        raw = chunk[value_key]
+        if not pd.api.types.is_numeric_dtype(raw) and sep != ',':  # exports européens : virgule décimale
+            raw = raw.str.replace(',', '.', regex=False)
+        values = pd.to_numeric(raw, errors='coerce') * scale
+        valid = times.notna().to_numpy() & values.notna().to_numpy()
+        report['invalid_rows'] += int((~valid).sum())
+        times_ns = times.to_numpy(dtype='datetime64[ns]')[valid].astype(np.int64)
+        values = values.to_numpy(dtype=float)[valid]
+
+        low = values < min_value if min_value is not None else np.zeros(len(values), dtype=bool)
+        high = values > max_value if max_value is not None else np.zeros(len(values), dtype=bool)
+        report['outliers_low'] += int(low.sum())
+        report['outliers_high'] += int(high.sum())
+        keep = ~(low | high)
+        if len(times_ns):
+            report['unordered_rows'] += int((np.diff(times_ns) < 0).sum())
+            if last_time is not None and times_ns[0] < last_time:
+                report['unordered_rows'] += 1
+            last_time = times_ns[-1]
+        accumulator.add(times_ns[keep], values[keep])
+
+    report['outliers'] = report['outliers_low'] + report['outliers_high']
+    series = accumulator.series(name, unit)
+    report['kept_rows'] = int(accumulator.counts.sum())
+    report['start'] = series.start.isoformat() if len(series) else None
+    report['end'] = (series.start + pd.Timedelta(seconds=stride) * len(series)).isoformat() if len(series) else None
+    report['steps'] = len(series)
+    report['gaps'], report['missing_steps'], report['largest_gaps'] = _gaps(series) if len(series) else (0, 0, [])
+
+    save_series(series, directory, metadata={'source': source, 'ingest': params})
+    with open(os.path.join(directory, name + '.ingest.json'), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    return series, report
+
+def load_ingested(name, directory=STORE_DIR):
+    """Série du store par son nom (--name d'ingest.py), mappée en mémoire ; jamais de lecture complète de l'export.
+
+    Si l'export source a changé (chemin, taille ou date de modification), il est réingéré en flux avec les
+    paramètres enregistrés lors de l'ingestion. Un export disparu laisse la série stockée inchangée.
+    """
+    header = read_header(name, directory)
+    if header is None:
+        raise FileNotFoundError(f"Série {name} absente de {directory} : importez l'export avec ingest.py")
+    source = header.get('source')
+    if 'ingest' in header and source and os.path.exists(source['path']) and source_state(source['path']) != source:
+        print(f"{source['path']} modifié : réingestion de {name}", file=sys.stderr)
+        ingest_csv(source['path'], name, directory=directory, **header['ingest'])
+    return load_series(name, directory)
+
+def print_report(series, report):
+    print(f"{report['rows']} lignes lues, {report['kept_rows']} retenues, {report['invalid_rows']} illisibles, "
+          f"{report['outliers']} aberrantes ({report['outliers_low']} basses, {report['outliers_high']} hautes)")
+    if report['unordered_rows']:
+        print(f"{report['unordered_rows']} horodatages hors ordre chronologique")
+    print(f"Série {series.name} : {report['steps']} pas de {report['stride']} s du {report['start']} au {report['end']}")
+    print(f"{report['gaps']} trou(s), {report['missing_steps']} pas sans mesure")
+    for gap in report['largest_gaps']:
+        print(f"  {gap['start']} → {gap['end']} ({gap['hours']:.2f} h)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingestion d'un export SCADA (date,valeur) dans le store des séries")
+    parser.add_argument('filename')
+    parser.add_argument('--name', help="Nom de la série (par défaut : nom du fichier)")
+    parser.add_argument('--stride', type=int, default=DEFAULT_STRIDE, help="Résolution cible (s), 86400 pour journalier")
+    parser.add_argument('--date-column', default='0', help="Nom ou position de la colonne date")
+    parser.add_argument('--value-column', default='1', help="Nom ou position de la colonne valeur")
+    parser.add_argument('--date-format', help="Format strptime, ex. %%d/%%m/%%Y %%H:%%M:%%S")
+    parser.add_argument('--utc', action='store_true', help="Horodatages avec fuseau : convertis en UTC")
+    parser.add_argument('--scale', type=float, default=1.0, help="Facteur vers les MW (0.001 pour des kW)")
+    parser.add_argument('--min-value', type=float, default=0.0)
+    parser.add_argument('--max-value', type=float, help="MW maximum plausible (puissance nominale)")
+    parser.add_argument('--sep', default=',')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--directory', default=STORE_DIR)
+    args = parser.parse_args()
+
+    def column(value):
+        return int(value) if value.isdigit() else value
+    series, report = ingest_csv(args.filename, args.name, args.stride, column(args.date_column),
+                                column(args.value_column), args.date_format, args.utc, args.scale,
+                                args.min_value, args.max_value, args.sep, args.chunk_rows, args.directory)
+    print_report(series, report)
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+import engine
+from series_store import series_from_frame
+
+SECONDS_PER_DAY = 86400
+CHUNK_DAYS = 366  # Jours traités par bloc : la mémoire ne dépend pas de la longueur du profil
+
+def power_grid(data, name='power'):
+    """Série régulière (series_store.Series) à la résolution du profil : horaire, 15 min ou journalière."""
+    if hasattr(data, 'stride'):  # series_store.Series : valeurs éventuellement mappées en mémoire
+        return data
+    if isinstance(data, pd.Series):
+        frame = pd.DataFrame({'date': data.index, 'value': data.to_numpy()})
+    else:
+        frame = pd.DataFrame.from_records(list(data))
+        frame = frame[['date'] + [c for c in frame.columns if c != 'date'][:1]]
+    return series_from_frame(name, frame, stride=None)
+
+def is_subdaily(data):
+    """Vrai si le profil a un pas inférieur à la journée."""
+    return getattr(data, 'stride', SECONDS_PER_DAY) < SECONDS_PER_DAY
+
+def _grid_lookup(grid, times_ns):
+    """Valeurs d'une série régulière aux instants donnés (valeur du pas en cours, NaN hors de la série)."""
+    position = (times_ns - grid.start.value) // (grid.stride * 10 ** 9)
+    inside = (position >= 0) & (position < len(grid.values))
+    result = np.full(len(times_ns), np.nan)
+    result[inside] = grid.values[position[inside]]
+    return result
+
+def daily_usage(power, capacity_mw=None, electricity_price=None, max_price=None, electricity_cost=0.0,
+                chunk_days=CHUNK_DAYS):
+    """Agrège un profil infra-journalier en grandeurs journalières, pas par pas et par blocs de chunk_days jours.
+
+    À chaque pas, les mineurs consomment la puissance disponible plafonnée à capacity_mw (MW installés)
+    et s'arrêtent si le prix de l'électricité (€/MWh, série à n'importe quelle résolution) dépasse max_price.
+    Les pas manquants d'un jour observé valent la puissance moyenne du profil. Retourne un DataFrame
+    journalier : MW moyens consommés, énergie (MWh), énergie écrêtée (MWh) et coût de l'électricité (€).
+    """
+    grid = power_grid(power)
+    stride = grid.stride
+    if stride <= 0 or SECONDS_PER_DAY % stride:
+        raise ValueError(f"Le pas du profil ({stride} s) doit diviser la journée")
+    steps = SECONDS_PER_DAY // stride
+    hours = stride / 3600
+    values = grid.values
+    columns = ['mw', 'energy_mwh', 'curtailed_mwh', 'electricity_cost_eur']
+    if len(values) == 0:
+        return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name='date'), dtype=float)
+    prices = power_grid(electricity_price, 'electricity_price') if electricity_price is not None else None
+
+    # Moyenne du profil calculée par blocs (les valeurs peuvent être mappées en mémoire)
+    total, count = 0.0, 0
+    for i in range(0, len(values), chunk_days * steps):
+        block = np.asarray(values[i:i + chunk_days * steps], dtype=float)
+        total += np.nansum(block)
+        count += int(np.count_nonzero(~np.isnan(block)))
+    fill = total / count if count else 0.0
+
+    first_day = grid.start.normalize()
+    offset = int((grid.start - first_day).total_seconds()) // stride
+    n_days = -(-(offset + len(values)) // steps)
+    result = np.full((n_days, len(columns)), np.nan)
+    for d0 in range(0, n_days, chunk_days):
+        d1 = min(d0 + chunk_days, n_days)
+        i0, i1 = d0 * steps - offset, d1 * steps - offset
+        block = np.full((d1 - d0) * steps, np.nan)
+        lo, hi = max(i0, 0), min(i1, len(values))
+        block[lo - i0:hi - i0] = values[lo:hi]
+        block = block.reshape(d1 - d0, steps)
+        observed = ~np.isnan(block).all(axis=1)
+        available = np.where(np.isnan(block), fill, block)
+        used = np.minimum(available, capacity_mw) if capacity_mw is not None else available
+
+        if prices is not None:
+            times = first_day.value + (d0 * steps + np.arange(block.size, dtype=np.int64)) * stride * 10 ** 9
+            step_price = _grid_lookup(prices, times).reshape(block.shape)
+            step_price = np.where(np.isnan(step_price), electricity_cost * 1000, step_price)
+        else:
+            step_price = np.full(block.shape, electricity_cost * 1000)
+        if max_price is not None:
+            used = np.where(step_price > max_price, 0.0, used)
+
+        chunk = result[d0:d1]
+        chunk[:, 0] = used.mean(axis=1)
+        chunk[:, 1] = used.sum(axis=1) * hours
+        chunk[:, 2] = (available - used).sum(axis=1) * hours
+        chunk[:, 3] = (used * step_price).sum(axis=1) * hours
+        chunk[~observed] = np.nan  # jour sans mesure : complété par le moteur journalier
+
+    dates = pd.date_range(first_day, periods=n_days, freq='D', name='date')
+    return pd.DataFrame(result, index=dates, columns=columns)
+
+def simulate_intraday(power, hashrate, price, efficiency=18, fees=0.022, electricity_cost=0.0,
+                      initial_investment=0.0, exponent=5.6, growth=30, projection=False, start=None, end=None,
+                      capacity_mw=None, electricity_price=None, max_price=None, chunk_days=CHUNK_DAYS):
+    """Simule un profil horaire ou au quart d'heure ; retourne les tableaux quotidien et annuel d'engine.simulate.
+
+    La production est calculée à la résolution du profil (plafond capacity_mw, arrêt au-dessus de
+    max_price €/MWh, coût selon electricity_price €/MWh ou electricity_cost €/kWh), puis agrégée par
+    jour : la part de hash d'un jour est proportionnelle à la puissance moyenne consommée ce jour-là.
+    Le tableau quotidien gagne les colonnes energy_mwh et curtailed_mwh. En projection, la puissance
+    moyenne consommée et le coût moyen par MWh du profil sont prolongés sur l'horizon.
+    """
+    usage = daily_usage(power, capacity_mw, electricity_price, max_price, electricity_cost, chunk_days)
+    observed = usage.dropna()
+    daily, _ = engine.simulate(observed['mw'], hashrate, price, efficiency, fees, 0.0,
+                               initial_investment, exponent, growth, projection, start, end)
+    # Jours hors profil (ou projection) : puissance moyenne du moteur, écrêtage moyen et coût moyen par MWh
+    energy = daily['mw'].to_numpy() * 24
+    cost_per_mwh = observed['electricity_cost_eur'].sum() / observed['energy_mwh'].sum() \
+        if observed['energy_mwh'].sum() > 0 else electricity_cost * 1000
+    curtailed_mean = observed['curtailed_mwh'].mean() if len(observed) else 0.0
+    if projection:
+        cost = energy * cost_per_mwh
+        curtailed = np.full(len(daily), curtailed_mean)
+    else:
+        cost = observed['electricity_cost_eur'].reindex(daily.index).to_numpy()
+        cost = np.where(np.isnan(cost), energy * cost_per_mwh, cost)
+        curtailed = observed['curtailed_mwh'].reindex(daily.index).fillna(curtailed_mean).to_numpy()
+
+    daily['revenue_eur'] = daily['revenue_eur'] - cost
+    daily['cumulative_eur'] = daily['revenue_eur'].cumsum() - initial_investment
+    daily['energy_mwh'] = energy
+    daily['curtailed_mwh'] = curtailed
+    return daily, engine.yearly_summary(daily, initial_investment)
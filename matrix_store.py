@@ -0,0 +1,262 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from series_store import Series, series_from_frame, source_state
+
+MATRIX_DIR = os.path.join('.cache', 'matrix')
+# "PALUEL 1 2023 H1.csv" → "PALUEL 1" : les semestres d'une même unité forment une seule colonne
+PERIOD_SUFFIX = re.compile(r'\s+\d{4}\s+H\d$')
+TOTAL_COLUMN = 'Parc Nucléaire Complet'  # Colonne agrégée des classeurs Kd-Kp, exclue des sommes par défaut
+
+class Matrix:
+    """Matrice régulière temps × unité : valeurs float64, date de début, pas (s) et index des noms d'unités.
+
+    Les valeurs sont rangées colonne par colonne (ordre Fortran) : la série d'une unité, et toute plage
+    de dates de cette série, est un bloc contigu du fichier mappé en mémoire.
+    """
+
+    def __init__(self, name, start, stride, values, columns, unit='', extents=None):
+        self.name = name
+        self.start = pd.Timestamp(start)
+        self.stride = int(stride)
+        self.values = values
+        self.columns = list(columns)
+        self.unit = unit
+        self.index = {column: i for i, column in enumerate(self.columns)}
+        # Premier et dernier pas (exclu) renseignés de chaque unité
+        self.extents = extents if extents is not None else _extents(values)
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    @property
+    def dates(self):
+        return pd.date_range(self.start, periods=len(self), freq=pd.Timedelta(seconds=self.stride))
+
+    def rows(self, start=None, end=None):
+        """Tranche des pas de [start, end[ (dates), calculée depuis le début et le pas sans parcourir d'index."""
+        step = pd.Timedelta(seconds=self.stride)
+        first = 0 if start is None else -(-(pd.Timestamp(start) - self.start) // step)
+        last = len(self) if end is None else -(-(pd.Timestamp(end) - self.start) // step)
+        first, last = min(max(first, 0), len(self)), min(max(last, 0), len(self))
+        return slice(first, max(first, last))
+
+    def positions(self, units):
+        """Positions des unités demandées ; KeyError pour une unité inconnue."""
+        missing = [u for u in units if u not in self.index]
+        if missing:
+            raise KeyError(f"Unité(s) absente(s) de {self.name} : {', '.join(missing)}")
+        return [self.index[u] for u in units]
+
+    def select(self, units=None, start=None, end=None):
+        """Sous-matrice par ensemble d'unités et plage de dates.
+
+        Sans copie pour toutes les unités ou un groupe d'unités consécutives ; un ensemble quelconque
+        ne copie que les colonnes demandées.
+        """
+        rows = self.rows(start, end)
+        start = self.start + rows.start * pd.Timedelta(seconds=self.stride)
+        positions = list(range(len(self.columns))) if units is None else self.positions(units)
+        first = positions[0] if positions else 0
+        if positions == list(range(first, first + len(positions))):  # colonnes consécutives : vue
+            values = self.values[rows, first:first + len(positions)]
+        else:
+            values = self.values[rows][:, positions]
+        # Pas renseignés décalés sur la tranche, sans relire les valeurs
+        extents = [(min(max(self.extents[j][0] - rows.start, 0), len(values)),
+                    min(max(self.extents[j][1] - rows.start, 0), len(values))) for j in positions]
+        return Matrix(self.name, start, self.stride, values, [self.columns[j] for j in positions], self.unit, extents)
+
+    def series(self, unit, start=None, end=None):
+        """Série d'une unité (vue sans copie), restreinte à ses pas renseignés et à [start, end[."""
+        column = self.positions([unit])[0]
+        rows = self.rows(start, end)
+        first, last = self.extents[column]
+        first, last = max(first, rows.start), min(last, rows.stop)
+        last = max(first, last)
+        return Series(unit, self.start + first * pd.Timedelta(seconds=self.stride), self.stride,
+                      self.values[first:last, column], self.unit)
+
+    def total(self, units=None, start=None, end=None, name=None):
+        """Somme des unités à chaque pas (puissance du parc) ; NaN si aucune unité n'est renseignée."""
+        if units is None:
+            units = [c for c in self.columns if c != TOTAL_COLUMN]
+        selected = self.select(units, start, end)
+        values = selected.values
+        sums = np.zeros(len(selected))
+        counts = np.zeros(len(selected), dtype=np.int64)
+        for j in range(values.shape[1]):  # colonne par colonne : lectures contiguës du fichier mappé
+            column = np.asarray(values[:, j])
+            observed = ~np.isnan(column)
+            sums[observed] += column[observed]
+            counts += observed
+        sums[counts == 0] = np.nan
+        filled = np.flatnonzero(counts)
+        first, last = (int(filled[0]), int(filled[-1]) + 1) if len(filled) else (0, 0)
+        return Series(name or self.name, selected.start + first * pd.Timedelta(seconds=self.stride), self.stride,
+                      sums[first:last], self.unit)
+
+    def to_pandas(self):
+        """DataFrame dates × unités sans copie des valeurs."""
+        return pd.DataFrame(self.values, index=self.dates, columns=self.columns, copy=False)
+
+def _extents(values):
+    """(premier, dernier exclu) pas renseigné de chaque colonne, (0, 0) pour une colonne vide."""
+    extents = []
+    for j in range(values.shape[1]):
+        filled = np.flatnonzero(~np.isnan(values[:, j]))
+        extents.append((int(filled[0]), int(filled[-1]) + 1) if len(filled) else (0, 0))
+    return extents
+
+def _paths(name, directory):
+    base = os.path.join(directory, name)
+    return base + '.npy', base + '.json'
+
+def _write_header(matrix, directory, sources, key=None):
+    _, header_file = _paths(key or matrix.name, directory)
+    header = {'name': matrix.name, 'start': matrix.start.isoformat(), 'stride': matrix.stride,
+              'shape': list(matrix.values.shape), 'unit': matrix.unit, 'columns': matrix.columns,
+              'extents': [list(e) for e in matrix.extents], 'sources': sources or {}}
+    with open(header_file, 'w', encoding='utf-8') as f:
+        json.dump(header, f, ensure_ascii=False)
+
+def save_matrix(matrix, directory=MATRIX_DIR, sources=None, key=None):
+    """Écrit les valeurs en .npy (ordre Fortran) et l'en-tête (début, pas, unités, sources) en JSON.
+
+    key : nom de l'entrée dans le store (par défaut le nom de la matrice).
+    """
+    os.makedirs(directory, exist_ok=True)
+    values_file, _ = _paths(key or matrix.name, directory)
+    np.save(values_file, np.asfortranarray(matrix.values, dtype=np.float64))
+    _write_header(matrix, directory, sources, key)
+
+def load_matrix(name, directory=MATRIX_DIR, mmap=True):
+    """Charge une matrice du store par son nom d'entrée ; les valeurs sont mappées en mémoire (aucune copie ni parsing)."""
+    values_file, header_file = _paths(name, directory)
+    with open(header_file, 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    values = np.load(values_file, mmap_mode='r' if mmap else None)
+    return Matrix(header['name'], header['start'], header['stride'], values, header['columns'],
+                  header.get('unit', ''), [tuple(e) for e in header['extents']])
+
+def matrix_from_frame(name, frame, unit='MW', stride=None):
+    """Matrice régulière à partir d'un DataFrame indexé par date, une colonne par unité (stride=None : pas déduit)."""
+    frame = frame[frame.index.notna()]
+    series = [series_from_frame(str(column), pd.DataFrame({'date': frame.index, 'value': frame[column].to_numpy()}),
+                                unit, stride) for column in frame.columns]
+    return _assemble(name, series, unit)
+
+def _assemble(name, series, unit, values_file=None):
+    """Place des séries (une par unité, éventuellement plusieurs périodes) sur une grille commune.
+
+    Le pas commun est le plus fin ; une série plus grossière est répétée sur ses sous-pas (MW moyens).
+    La première série qui renseigne un pas l'emporte. Avec values_file, la matrice est écrite directement
+    dans le fichier mappé, sans tableau intermédiaire en mémoire.
+    """
+    series = [s for s in series if len(s)]
+    columns = list(dict.fromkeys(s.name for s in series))
+    if not series:
+        return Matrix(name, pd.Timestamp(0), 86400, np.empty((0, len(columns))), columns, unit)
+    stride = min(s.stride for s in series)
+    for s in series:
+        if s.stride % stride:
+            raise ValueError(f"Le pas de {s.name} ({s.stride} s) n'est pas un multiple de {stride} s")
+    start = min(s.start for s in series)
+    step = pd.Timedelta(seconds=stride)
+    length = max((s.start - start) // step + len(s) * (s.stride // stride) for s in series)
+    shape = (length, len(columns))
+    if values_file is None:
+        values = np.full(shape, np.nan, order='F')
+    else:
+        values = np.lib.format.open_memmap(values_file, mode='w+', dtype=np.float64, shape=shape, fortran_order=True)
+        values[:] = np.nan
+    index = {column: j for j, column in enumerate(columns)}
+    for s in series:
+        first = (s.start - start) // step
+        block = np.repeat(np.asarray(s.values, dtype=np.float64), s.stride // stride)
+        target = values[first:first + len(block), index[s.name]]
+        empty = np.isnan(target)
+        target[empty] = block[empty]
+    return Matrix(name, start, stride, values, columns, unit)
+
+def unit_name(filename):
+    """Nom de l'unité d'un CSV : nom du fichier sans extension ni semestre."""
+    return PERIOD_SUFFIX.sub('', os.path.splitext(os.path.basename(filename))[0])
+
+def directory_key(directory):
+    """Entrée du store d'un répertoire : son nom suivi d'une empreinte de son chemin absolu.
+
+    Deux répertoires de même nom (a/sites, b/sites) ont des matrices distinctes.
+    """
+    name = os.path.basename(os.path.normpath(directory))
+    return f"{name}-{hashlib.sha1(os.path.abspath(directory).encode('utf-8')).hexdigest()[:12]}"
+
+def csv_sources(directory):
+    """Identité (chemin, taille, date de modification) de chaque CSV d'un répertoire : empreinte de sa matrice."""
+    return {os.path.basename(f): source_state(f) for f in sorted(glob.glob(os.path.join(directory, '*.csv')))}
+
+def import_directory(directory, key=None, store=MATRIX_DIR, unit='MW'):
+    """Assemble tous les CSV date,valeur d'un répertoire en une matrice du store ; retourne la matrice mappée.
+
+    La matrice porte le nom du répertoire ; son entrée (key) est par défaut directory_key(directory).
+    """
+    name = os.path.basename(os.path.normpath(directory))
+    key = key or directory_key(directory)
+    sources = csv_sources(directory)
+    series = []
+    for filename in sources:
+        frame = pd.read_csv(os.path.join(directory, filename))
+        series.append(series_from_frame(unit_name(filename), frame, unit, stride=None))
+    os.makedirs(store, exist_ok=True)
+    values_file, _ = _paths(key, store)
+    # Écriture dans un fichier temporaire : une matrice mappée par un autre processus reste lisible
+    partial = values_file + '.partial'
+    matrix = _assemble(name, series, unit, partial)
+    if isinstance(matrix.values, np.memmap):
+        matrix.values.flush()
+        os.replace(partial, values_file)
+    else:  # aucune série : matrice vide
+        np.save(values_file, np.asfortranarray(matrix.values, dtype=np.float64))
+    _write_header(matrix, store, sources, key)
+    return load_matrix(key, store)
+
+def load_directory_cached(directory, key=None, store=MATRIX_DIR):
+    """Matrice des CSV d'un répertoire, reconstruite si un CSV a été ajouté, supprimé ou modifié (taille ou date)."""
+    key = key or directory_key(directory)
+    _, header_file = _paths(key, store)
+    try:
+        with open(header_file, 'r', encoding='utf-8') as f:
+            fresh = json.load(f).get('sources') == csv_sources(directory)
+    except (OSError, ValueError):
+        fresh = False
+    if not fresh:
+        return import_directory(directory, key, store)
+    return load_matrix(key, store)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Matrice temps × unité des profils d'un répertoire de CSV")
+    parser.add_argument('directory', nargs='?', default='test_data')
+    parser.add_argument('--units', nargs='+', help="Unités à extraire (toutes par défaut)")
+    parser.add_argument('--start')
+    parser.add_argument('--end', help="Date de fin exclue")
+    parser.add_argument('--total', action='store_true', help="Somme des unités (puissance du parc)")
+    parser.add_argument('--output', help="CSV de l'extraction")
+    args = parser.parse_args()
+
+    matrix = load_directory_cached(args.directory)
+    print(f"Matrice {matrix.name} : {len(matrix)} pas de {matrix.stride} s × {len(matrix.columns)} unités, "
+          f"du {matrix.start.date()} au {(matrix.start + pd.Timedelta(seconds=matrix.stride) * len(matrix)).date()}")
+    if args.output:
+        if args.total:
+            table = matrix.total(args.units, args.start, args.end).to_pandas().rename('MW').rename_axis('date')
+        else:
+            table = matrix.select(args.units, args.start, args.end).to_pandas().rename_axis('date')
+        table.to_csv(args.output)
+        print(f"Fichier {args.output} généré")
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+import engine
+
+def fit_residuals(price, exponent=5.6):
+    """Ajuste un AR(1) sur les résidus log(prix) - log(loi de puissance) de l'historique."""
+    price = engine.to_series(price)
+    price = price[price > 0]
+    law = engine.power_law_price(engine.days_since_genesis(price.index), exponent)
+    residuals = np.log(price.to_numpy()) - np.log(law)
+    mu = residuals.mean()
+    x, y = residuals[:-1] - mu, residuals[1:] - mu
+    phi = float(np.dot(x, y) / np.dot(x, x))
+    sigma = float(np.std(y - phi * x))
+    return {'mu': float(mu), 'phi': phi, 'sigma': sigma, 'last': float(residuals[-1]),
+            'last_date': price.index[-1], 'exponent': exponent}
+
+def _residual_range(fit, horizon, width=6.0):
+    """Bornes des résidus couvrant +/- width écarts-types de la loi stationnaire (ou de la marche aléatoire)."""
+    phi, sigma = fit['phi'], fit['sigma']
+    if abs(phi) < 1:
+        spread = sigma / np.sqrt(1 - phi ** 2)
+    else:
+        spread = sigma * np.sqrt(horizon)
+    center = fit['mu'] if abs(phi) < 1 else fit['last']
+    return min(center, fit['last']) - width * spread, max(center, fit['last']) + width * spread
+
+def _histogram_quantiles(counts, edges, quantiles):
+    """Quantiles (interpolés dans le bin) de chaque ligne d'une matrice d'histogrammes."""
+    cumulative = np.cumsum(counts, axis=1)
+    total = cumulative[:, -1:]
+    result = np.empty((counts.shape[0], len(quantiles)))
+    rows = np.arange(counts.shape[0])
+    for i, q in enumerate(quantiles):
+        target = q * total[:, 0]
+        b = np.minimum((cumulative < target[:, None]).sum(axis=1), counts.shape[1] - 1)
+        below = np.where(b > 0, cumulative[rows, np.maximum(b - 1, 0)], 0)
+        inside = np.maximum(counts[rows, b], 1)
+        frac = np.clip((target - below) / inside, 0, 1)
+        result[:, i] = edges[b] + frac * (edges[b + 1] - edges[b])
+    return result
+
+def simulate_paths(power, hashrate, price, n_paths=10000, efficiency=18, fees=0.022, electricity_cost=0.0,
+                   initial_investment=0.0, exponent=5.6, growth=30, percentiles=(5, 50, 95),
+                   chunk_size=2000, bins=512, seed=None):
+    """Projection Monte Carlo : trajectoires de prix autour de la loi de puissance, bandes de percentiles.
+
+    Les résidus log-prix suivent un AR(1) ajusté sur l'historique. Les trajectoires sont simulées
+    par paquets de chunk_size et agrégées dans des histogrammes de taille fixe : la mémoire ne
+    dépend pas de n_paths. Retourne les bandes journalières de prix et de revenu, les bandes
+    annuelles du revenu net cumulé et les paramètres ajustés.
+    """
+    fit = fit_residuals(price, exponent)
+    daily, _ = engine.simulate(power, hashrate, price, efficiency, fees, electricity_cost,
+                               initial_investment, exponent, growth, projection=True)
+    dates = daily.index
+    gross_law = (daily['btc_mined'] * daily['price_eur']).to_numpy()  # revenu brut sur la loi de puissance
+    daily_cost = gross_law - daily['revenue_eur'].to_numpy()
+    years, year_starts = np.unique(dates.year.to_numpy(), return_index=True)
+    year_cost = np.cumsum(np.add.reduceat(daily_cost, year_starts)) + initial_investment
+
+    # Jours entre la dernière observation et le début de la projection (préchauffage de l'AR(1))
+    warmup = max(0, (dates[0] - fit['last_date']).days - 1)
+    horizon = warmup + len(dates)
+    quantiles = np.asarray(percentiles, dtype=float) / 100
+
+    # Histogramme (jour, résidu) : prix et revenu journalier sont monotones en le résidu
+    r_low, r_high = _residual_range(fit, horizon)
+    r_edges = np.linspace(r_low, r_high, bins + 1)
+    r_counts = np.zeros((len(dates), bins), dtype=np.int64)
+    # Histogramme (année, log revenu brut cumulé), bornes tirées des bornes des résidus
+    cum_low = np.log(np.cumsum(np.add.reduceat(gross_law, year_starts)) * np.exp(r_low))
+    cum_high = np.log(np.cumsum(np.add.reduceat(gross_law, year_starts)) * np.exp(r_high))
+    cum_edges = np.linspace(0, 1, bins + 1)
+    cum_counts = np.zeros((len(years), bins), dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    mu, phi, sigma = fit['mu'], fit['phi'], fit['sigma']
+    done = 0
+    while done < n_paths:
+        size = min(chunk_size, n_paths - done)
+        residuals = rng.standard_normal((horizon, size)) * sigma
+        previous = np.full(size, fit['last'])
+        for t in range(horizon):  # boucle sur le temps, vectorisée sur les trajectoires
+            previous = mu + phi * (previous - mu) + residuals[t]
+            residuals[t] = previous
+        residuals = residuals[warmup:]
+
+        r_bins = np.clip(((residuals - r_low) / (r_high - r_low) * bins).astype(np.int64), 0, bins - 1)
+        r_bins += (np.arange(len(dates)) * bins)[:, None]
+        r_counts += np.bincount(r_bins.ravel(), minlength=len(dates) * bins).reshape(len(dates), bins)
+
+        gross = gross_law[:, None] * np.exp(residuals)
+        cum_gross = np.cumsum(np.add.reduceat(gross, year_starts, axis=0), axis=0)
+        position = (np.log(cum_gross) - cum_low[:, None]) / (cum_high - cum_low)[:, None]
+        cum_bins = np.clip((position * bins).astype(np.int64), 0, bins - 1)
+        cum_bins += (np.arange(len(years)) * bins)[:, None]
+        cum_counts += np.bincount(cum_bins.ravel(), minlength=len(years) * bins).reshape(len(years), bins)
+        done += size
+
+    columns = [f'p{p:g}' for p in percentiles]
+    r_quantiles = _histogram_quantiles(r_counts, r_edges, quantiles)
+    law_price = daily['price_eur'].to_numpy()[:, None]
+    price_bands = pd.DataFrame(law_price * np.exp(r_quantiles), index=dates, columns=columns)
+    revenue_bands = pd.DataFrame(gross_law[:, None] * np.exp(r_quantiles) - daily_cost[:, None],
+                                 index=dates, columns=columns)
+    cum_position = _histogram_quantiles(cum_counts, cum_edges, quantiles)
+    cum_quantiles = np.exp(cum_low[:, None] + cum_position * (cum_high - cum_low)[:, None])
+    cumulative_bands = pd.DataFrame(cum_quantiles - year_cost[:, None], index=pd.Index(years, name='year'),
+                                    columns=columns)
+    return {
+        'fit': fit,
+        'n_paths': n_paths,
+        'price': price_bands,
+        'daily_revenue': revenue_bands,
+        'cumulative': cumulative_bands,
+    }
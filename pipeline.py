@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import profiling
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def single_flight(key, fn):
+    """Exécute fn() une seule fois pour des appels concurrents de même clé ; tous reçoivent le résultat."""
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = {'done': threading.Event()}
+    if not leader:
+        call['done'].wait()
+        if 'error' in call:
+            raise call['error']
+        return call['value']
+    try:
+        call['value'] = fn()
+        return call['value']
+    except Exception as e:
+        call['error'] = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call['done'].set()
+
+class Pipeline:
+    """Graphe de tâches exécutées en parallèle dès que leurs dépendances sont disponibles."""
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self.tasks = {}
+
+    def add(self, name, fn, deps=()):
+        """Déclare la tâche name : fn reçoit les résultats de deps, dans l'ordre, en arguments."""
+        if name in self.tasks:
+            raise ValueError(f"Tâche {name} déjà déclarée")
+        for dep in deps:
+            if dep not in self.tasks:
+                raise ValueError(f"Dépendance inconnue {dep} pour la tâche {name}")
+        self.tasks[name] = (fn, tuple(deps))
+        return self
+
+    def run(self):
+        """Exécute toutes les tâches ; le temps total est borné par la plus longue chaîne de dépendances."""
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline') as pool:
+            # Les tâches sont soumises dans l'ordre de déclaration (donc topologique) : une tâche
+            # n'attend que des tâches soumises avant elle, ce qui exclut tout interblocage.
+            for name, (fn, deps) in self.tasks.items():
+                dep_futures = [futures[dep] for dep in deps]
+                futures[name] = pool.submit(_run_task, name, fn, dep_futures)
+            return {name: future.result() for name, future in futures.items()}
+
+def _run_task(name, fn, dep_futures):
+    args = [future.result() for future in dep_futures]
+    # Le span ne couvre que la tâche elle-même, pas l'attente de ses dépendances
+    with profiling.span(f'task:{name}'):
+        return fn(*args)
@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+TRACE_FILE = os.path.join('.cache', 'trace.json')
+# Profilage activé par --profile ou par la variable d'environnement
+_enabled = os.environ.get('SIMULATEUR_PROFILE', '') not in ('', '0')
+
+_lock = threading.Lock()
+_spans = []  # Spans terminés
+_open = []  # Spans en cours (tous threads) : pic mémoire observé depuis leur début
+_origin = time.perf_counter()
+
+def enable(enabled=True):
+    """Active (ou désactive) l'enregistrement des spans ; le suivi mémoire démarre avec lui."""
+    global _enabled
+    _enabled = enabled
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def is_enabled():
+    return _enabled
+
+def _observe_peak():
+    """Reporte le pic tracemalloc sur tous les spans ouverts puis le réinitialise (appelé sous _lock)."""
+    current, peak = tracemalloc.get_traced_memory()
+    for record in _open:
+        record['peak'] = max(record['peak'], peak)
+    tracemalloc.reset_peak()
+    return current
+
+@contextmanager
+def span(name, **args):
+    """Mesure un bloc : temps réel, temps CPU du thread et pic mémoire du processus pendant le bloc."""
+    if not _enabled:
+        yield
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    with _lock:
+        record = {'name': name, 'args': args, 'tid': threading.get_ident(), 'peak': 0}
+        record['memory'] = _observe_peak()
+        _open.append(record)
+    start, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        record['cpu'] = time.thread_time() - cpu
+        record['wall'] = time.perf_counter() - start
+        record['start'] = start - _origin
+        with _lock:
+            _observe_peak()
+            _open.remove(record)
+            _spans.append(record)
+
+def trace_events():
+    """Spans au format Chrome trace-event (événements complets « X », microsecondes)."""
+    pid = os.getpid()
+    with _lock:
+        spans = list(_spans)
+    return [{
+        'name': s['name'], 'ph': 'X', 'pid': pid, 'tid': s['tid'],
+        'ts': round(s['start'] * 1e6), 'dur': round(s['wall'] * 1e6),
+        'args': {**{k: str(v) for k, v in s['args'].items()},
+                 'cpu_ms': round(s['cpu'] * 1e3, 3),
+                 'peak_kb': round(max(0, s['peak'] - s['memory']) / 1024, 1)},
+    } for s in spans]
+
+def write_trace(filename=TRACE_FILE):
+    """Écrit la trace JSON, à ouvrir dans chrome://tracing ou https://ui.perfetto.dev."""
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events(), 'displayTimeUnit': 'ms'}, f)
+
+def summary():
+    """Agrégat par nom de span : nombre, temps réel et CPU cumulés, pic mémoire maximal ; trié par temps réel."""
+    totals = {}
+    with _lock:
+        spans = list(_spans)
+    for s in spans:
+        total = totals.setdefault(s['name'], {'name': s['name'], 'count': 0, 'wall': 0.0, 'cpu': 0.0, 'peak': 0})
+        total['count'] += 1
+        total['wall'] += s['wall']
+        total['cpu'] += s['cpu']
+        total['peak'] = max(total['peak'], s['peak'] - s['memory'])
+    return sorted(totals.values(), key=lambda t: t['wall'], reverse=True)
+
+def print_summary():
+    print(f"{'Phase':<44}{'Appels':>7}{'Réel (s)':>10}{'CPU (s)':>10}{'Pic mém. (Ko)':>15}")
+    for t in summary():
+        print(f"{t['name']:<44}{t['count']:>7}{t['wall']:>10.3f}{t['cpu']:>10.3f}{max(0, t['peak']) / 1024:>15.1f}")
+
+def report(filename=TRACE_FILE):
+    """Fin d'exécution : tableau de synthèse et trace Chrome, si le profilage est actif."""
+    if not _enabled:
+        return
+    print_summary()
+    write_trace(filename)
+    print(f"Trace écrite dans {filename}")
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+STORE_DIR = os.path.join('.cache', 'series')
+# Nom du fichier CSV → (nom de la série, unité), selon la même convention que load_sample_csv
+CSV_UNITS = (('hashrate.csv', 'EH/s'), ('btcprice.csv', 'EUR'))
+
+class Series:
+    """Série régulière : valeurs float64 contiguës, date de début et pas (en secondes)."""
+
+    def __init__(self, name, start, stride, values, unit=''):
+        self.name = name
+        self.start = pd.Timestamp(start)
+        self.stride = int(stride)
+        self.values = values
+        self.unit = unit
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def dates(self):
+        return pd.date_range(self.start, periods=len(self.values), freq=pd.Timedelta(seconds=self.stride))
+
+    def to_pandas(self):
+        """pd.Series sans copie des valeurs (NaN pour les jours absents du fichier source)."""
+        return pd.Series(self.values, index=self.dates, name=self.name, copy=False)
+
+    def to_records(self):
+        """Liste de dicts au format historique de load_sample_csv (jours absents ignorés)."""
+        key = {'EH/s': 'ehs', 'EUR': 'pr'}.get(self.unit, 'mw')
+        return [{'date': d.strftime('%Y-%m-%d'), key: float(v)}
+                for d, v in zip(self.dates, self.values) if not np.isnan(v)]
+
+def _paths(name, directory):
+    base = os.path.join(directory, name)
+    return base + '.npy', base + '.json'
+
+def save_series(series, directory=STORE_DIR, key=None, metadata=None):
+    """Écrit les valeurs en .npy et l'en-tête (début, pas, unité et metadata éventuelles) en JSON.
+
+    key : nom de l'entrée dans le store (par défaut le nom de la série).
+    """
+    os.makedirs(directory, exist_ok=True)
+    values_file, header_file = _paths(key or series.name, directory)
+    np.save(values_file, np.ascontiguousarray(series.values, dtype=np.float64))
+    header = {'name': series.name, 'start': series.start.isoformat(), 'stride': series.stride,
+              'length': len(series), 'unit': series.unit, **(metadata or {})}
+    with open(header_file, 'w', encoding='utf-8') as f:
+        json.dump(header, f)
+
+def read_header(key, directory=STORE_DIR):
+    """En-tête JSON d'une entrée du store, None si elle n'existe pas ou est illisible."""
+    try:
+        with open(_paths(key, directory)[1], 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def load_series(name, directory=STORE_DIR, mmap=True):
+    """Charge une série du store par son nom d'entrée ; les valeurs sont mappées en mémoire (aucune copie ni parsing)."""
+    values_file, header_file = _paths(name, directory)
+    if not os.path.exists(header_file):
+        raise FileNotFoundError(f"Série {name} absente du store {directory}")
+    with open(header_file, 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    values = np.load(values_file, mmap_mode='r' if mmap else None)
+    return Series(header['name'], header['start'], header['stride'], values, header.get('unit', ''))
+
+def infer_stride(dates):
+    """Pas (s) d'une série : plus petit écart entre deux dates distinctes, un jour par défaut."""
+    seconds = np.unique((pd.DatetimeIndex(dates) - pd.Timestamp(0)).total_seconds().to_numpy(dtype=np.int64))
+    steps = np.diff(seconds)
+    return int(steps.min()) if len(steps) else 86400
+
+def series_from_frame(name, frame, unit='', stride=86400):
+    """Construit une série régulière à partir d'une colonne date et d'une colonne valeur (stride=None : pas déduit des dates)."""
+    dates = pd.to_datetime(frame.iloc[:, 0], errors='coerce')
+    values = pd.to_numeric(frame.iloc[:, 1], errors='coerce')
+    valid = dates.notna() & values.notna()
+    dates, values = dates[valid], values[valid].to_numpy(dtype=np.float64)
+    if stride is None:
+        stride = infer_stride(dates)
+    if len(dates) == 0:
+        return Series(name, pd.Timestamp(0), stride, np.empty(0), unit)
+    start = dates.min()
+    # Position de chaque ligne sur la grille ; la première occurrence d'une date l'emporte
+    offsets = ((dates - start).dt.total_seconds() // stride).to_numpy(dtype=np.int64)
+    grid = np.full(offsets.max() + 1, np.nan)
+    grid[offsets[::-1]] = values[::-1]
+    return Series(name, start, stride, grid, unit)
+
+def source_state(filename):
+    """Identité d'un fichier source : chemin absolu, taille et date de modification (ns)."""
+    stat = os.stat(filename)
+    return {'path': os.path.abspath(filename), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def csv_key(filename):
+    """Entrée du store d'un CSV : nom du fichier suivi d'une empreinte de son chemin absolu.
+
+    Deux CSV de même nom dans des répertoires différents (a/site.csv, b/site.csv) ont des entrées distinctes.
+    """
+    name = os.path.splitext(os.path.basename(filename))[0]
+    return f"{name}-{hashlib.sha1(os.path.abspath(filename).encode('utf-8')).hexdigest()[:12]}"
+
+def import_csv(filename, name=None, directory=STORE_DIR, key=None):
+    """Importe un CSV date,valeur existant dans le store et retourne la série."""
+    unit = next((u for suffix, u in CSV_UNITS if filename.endswith(suffix)), 'MW')
+    name = name or os.path.splitext(os.path.basename(filename))[0]
+    # Pas déduit des dates : un profil horaire ou au quart d'heure garde sa résolution
+    series = series_from_frame(name, pd.read_csv(filename), unit, stride=None)
+    save_series(series, directory, key, {'source': source_state(filename)})
+    return series
+
+def load_csv_cached(filename, directory=STORE_DIR):
+    """Charge un CSV via le store : réimporté si le chemin, la taille ou la date de modification du CSV diffère.
+
+    Toute différence de date compte, y compris une date plus ancienne (git checkout, cp -p, rsync -t).
+    """
+    key = csv_key(filename)
+    header = read_header(key, directory)
+    if header is None or header.get('source') != source_state(filename):
+        import_csv(filename, None, directory, key)
+    return load_series(key, directory)
@@ -0,0 +1,281 @@
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+import pandas as pd
+
+import engine
+from series_store import load_csv_cached
+
+HASH_FILE = 'historical_data_hashrate.csv'
+PRICE_FILE = 'historical_btcprice.csv'
+CACHE_SIZE = 256  # Résultats conservés (requêtes distinctes)
+MAX_BODY = 16 * 1024 * 1024  # octets
+# Paramètres acceptés et valeurs par défaut (identiques à engine.simulate)
+DEFAULT_PARAMS = {
+    'efficiency': 18, 'fees': 0.022, 'electricity_cost': 0.0, 'initial_investment': 0.0,
+    'exponent': 5.6, 'growth': 30, 'projection': False, 'start': None, 'end': None,
+}
+# Paramètres numériques qui ne peuvent pas être négatifs (l'efficacité doit être strictement positive)
+NON_NEGATIVE_PARAMS = ('fees', 'electricity_cost', 'initial_investment')
+
+# Séries réseau partagées par chaque processus du pool (chargées une seule fois par instantané)
+_shared = {}
+
+def _init_worker(hashrate, price):
+    _shared['hashrate'] = hashrate
+    _shared['price'] = price
+
+def run_simulation(power, params):
+    """Simule dans un processus du pool ; retourne les tableaux quotidien et annuel déjà sérialisés en JSON."""
+    daily, yearly = engine.simulate(power, _shared['hashrate'], _shared['price'], **params)
+    return (daily.reset_index().to_json(orient='records', date_format='iso'),
+            yearly.reset_index().to_json(orient='records'))
+
+class RequestError(Exception):
+    """Requête invalide : renvoyée au client avec le statut 400."""
+
+def parse_power(payload):
+    """Profil de puissance du corps JSON : liste de {date, mw}, ou texte CSV date,MW dans power_csv.
+
+    Exécuté dans le pool de processus : le parsing d'un corps de plusieurs Mo ne bloque pas la boucle.
+    """
+    if 'power_csv' in payload:
+        try:
+            frame = pd.read_csv(io.StringIO(payload['power_csv']))
+        except (ValueError, pd.errors.ParserError) as e:
+            raise RequestError(f"power_csv illisible : {e}")
+        if frame.shape[1] < 2:
+            raise RequestError("power_csv doit contenir les colonnes date,MW")
+        frame = frame.iloc[:, :2].set_axis(['date', 'mw'], axis=1)
+        records = frame.to_dict('records')
+    else:
+        records = payload.get('power', [])
+    if not isinstance(records, list):
+        raise RequestError("power doit être une liste de {date, mw}")
+    try:
+        power = engine.to_series([{'date': r['date'], 'mw': r['mw']} for r in records])
+    except (KeyError, TypeError, ValueError) as e:
+        raise RequestError(f"profil de puissance invalide : {e}")
+    if len(power) == 0:
+        raise RequestError("profil de puissance vide : power ou power_csv doit contenir au moins un jour")
+    return power
+
+def load_snapshot(files):
+    """Hashrate, prix et empreinte de l'instantané des données réseau (lecture des CSV, hors boucle d'événements)."""
+    hashrate, price = (engine.to_series(load_csv_cached(f)) for f in files)
+    digest = hashlib.sha256()
+    for series in (hashrate, price):
+        digest.update(series.index.asi8.tobytes())
+        digest.update(series.to_numpy(dtype=np.float64).tobytes())
+    return hashrate, price, digest.hexdigest()
+
+def parse_params(payload):
+    """Paramètres de simulation complétés par les valeurs par défaut (forme canonique pour la clé de cache)."""
+    given = payload.get('params', {})
+    if not isinstance(given, dict):
+        raise RequestError("params doit être un objet")
+    unknown = set(given) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise RequestError(f"paramètres inconnus : {', '.join(sorted(unknown))}")
+    params = dict(DEFAULT_PARAMS)
+    try:
+        for name, value in given.items():
+            if name == 'projection':
+                params[name] = bool(value)
+            elif name in ('start', 'end'):
+                params[name] = None if value is None else pd.Timestamp(value).strftime('%Y-%m-%d')
+            else:
+                params[name] = float(value)
+    except (TypeError, ValueError) as e:
+        raise RequestError(f"paramètre invalide : {e}")
+    # Un paramètre non fini ou hors domaine donnerait des lignes inf/NaN, mises en cache comme un résultat
+    for name, value in params.items():
+        if isinstance(value, float) and not math.isfinite(value):
+            raise RequestError(f"paramètre invalide : {name} doit être fini")
+    if params['efficiency'] <= 0:
+        raise RequestError("paramètre invalide : efficiency doit être strictement positif")
+    for name in NON_NEGATIVE_PARAMS:
+        if params[name] < 0:
+            raise RequestError(f"paramètre invalide : {name} ne peut pas être négatif")
+    return params
+
+def request_key(power, params, snapshot):
+    """Empreinte du contenu : profil normalisé, paramètres canoniques et instantané des données réseau."""
+    digest = hashlib.sha256(snapshot.encode())
+    digest.update(power.index.asi8.tobytes())
+    digest.update(np.ascontiguousarray(power.to_numpy(dtype=np.float64)).tobytes())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.hexdigest()
+
+class SimulationService:
+    """Service HTTP asyncio : simulations dans un pool de processus, résultats en cache LRU."""
+
+    def __init__(self, hash_file=HASH_FILE, price_file=PRICE_FILE, workers=None, cache_size=CACHE_SIZE):
+        self.files = (hash_file, price_file)
+        self.workers = workers
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.inflight = {}
+        self.pool = None
+        self.mtimes = None
+        self.snapshot = None
+        self.reload = None  # asyncio.Lock : un seul rechargement de l'instantané à la fois
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0}
+
+    async def refresh_snapshot(self):
+        """Recharge hashrate et prix si leurs CSV ont changé ; le pool repart avec le nouvel instantané.
+
+        La lecture des CSV tourne dans un thread : la boucle d'événements continue de servir les requêtes.
+        """
+        if self.reload is None:
+            self.reload = asyncio.Lock()
+        async with self.reload:
+            mtimes = tuple(os.path.getmtime(f) for f in self.files)
+            if mtimes == self.mtimes:
+                return
+            hashrate, price, snapshot = await asyncio.get_running_loop().run_in_executor(
+                None, load_snapshot, self.files)
+            if self.pool is not None:
+                self.pool.shutdown(wait=False)
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(hashrate, price))
+            self.mtimes = mtimes
+            # Les entrées de l'ancien instantané ne seront plus demandées : l'LRU les évince
+            self.snapshot = snapshot
+
+    async def simulate(self, payload):
+        """Résultat JSON (octets) de la requête, depuis le cache, un calcul en cours ou le pool."""
+        await self.refresh_snapshot()
+        params = parse_params(payload)
+        power = await asyncio.get_running_loop().run_in_executor(self.pool, parse_power, payload)
+        key = request_key(power, params, self.snapshot)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats['hits'] += 1
+            return self.cache[key]
+        if key in self.inflight:  # requête identique déjà en calcul : même résultat
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(self.inflight[key])
+
+        self.stats['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            daily, yearly = await asyncio.get_running_loop().run_in_executor(
+                self.pool, run_simulation, power, params)
+            body = (f'{{"key":"{key}","snapshot":"{self.snapshot}","params":{json.dumps(params)},'
+                    f'"daily":{daily},"yearly":{yearly}}}').encode()
+            self.cache[key] = body
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            future.set_result(body)
+            return body
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # évite l'avertissement si aucune requête concurrente n'attendait
+            raise
+        finally:
+            del self.inflight[key]
+
+    def status(self):
+        return json.dumps({'snapshot': self.snapshot, 'cached': len(self.cache),
+                           'inflight': len(self.inflight), **self.stats}).encode()
+
+    async def handle(self, reader, writer):
+        """Connexion HTTP/1.1 (keep-alive) : POST /simulate, GET /status."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode('latin-1').split(maxsplit=2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY:
+                    await self.respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                       b'{"error":"corps trop volumineux"}', close=True)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                close = headers.get('connection', '').lower() == 'close' or version.strip() == 'HTTP/1.0'
+                status, content = await self.route(method, path.split('?')[0], body)
+                await self.respond(writer, status, content, close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        self.stats['requests'] += 1
+        if path == '/status' and method == 'GET':
+            await self.refresh_snapshot()
+            return HTTPStatus.OK, self.status()
+        if path != '/simulate':
+            return HTTPStatus.NOT_FOUND, b'{"error":"ressource inconnue"}'
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, b'{"error":"POST attendu"}'
+        try:
+            try:
+                payload = json.loads(body or b'{}')
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise RequestError(f"corps JSON illisible : {e}")
+            if not isinstance(payload, dict):
+                raise RequestError("le corps doit être un objet JSON")
+            return HTTPStatus.OK, await self.simulate(payload)
+        except RequestError as e:
+            self.stats['errors'] += 1
+            return HTTPStatus.BAD_REQUEST, json.dumps({'error': str(e)}).encode()
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"Échec de la simulation : {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, json.dumps({'error': str(e)}).encode()
+
+    async def respond(self, writer, status, content, close=False):
+        head = (f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+                f'Content-Type: application/json\r\n'
+                f'Content-Length: {len(content)}\r\n'
+                f'Connection: {"close" if close else "keep-alive"}\r\n\r\n')
+        writer.write(head.encode('latin-1') + content)
+        await writer.drain()
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        await self.refresh_snapshot()
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Service de simulation sur http://{host}:{port} (instantané {self.snapshot[:12]})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Service HTTP de simulation (POST /simulate)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE)
+    parser.add_argument('--hash-file', default=HASH_FILE)
+    parser.add_argument('--price-file', default=PRICE_FILE)
+    args = parser.parse_args()
+
+    service = SimulationService(args.hash_file, args.price_file, args.workers, args.cache_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
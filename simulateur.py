@@ -3,15 +3,79 @@ import json
 from datetime import date, datetime, timedelta
 import time
 import random
+import os
+import numpy as np
 import pandas as pd
 from tvDatafeed import TvDatafeed, Interval
 import csv
+import sys
+import base64
+import gzip
+import hashlib
+import shutil
+import textwrap
+import queue
+from contextlib import contextmanager
+import api_cache
+import subsidy
+import downsample
+import profiling
+from series_store import series_from_frame
+from fetch_scheduler import scheduler
+from pipeline import Pipeline, single_flight
+
+try:
+    import brotli
+except ImportError:  # variantes .br non générées
+    brotli = None
+
+REQUEST_TIMEOUT = 10  # secondes, pour ne jamais bloquer la génération sur une API figée
+HISTORY_START = date(2018, 1, 1)  # Début des séries historiques CSV
+HISTORY_MAX_BARS = 5000  # Maximum de barres journalières demandées à TradingView
+HISTORY_OVERLAP_DAYS = 7  # Jours déjà sur disque re-téléchargés pour valider le recouvrement
+TRADINGVIEW_ATTEMPTS = 10
+TRADINGVIEW_DEADLINE = 120  # secondes, toutes tentatives confondues
+WEB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web')  # Sources de la page (HTML, CSS, JS)
+BUILD_DIR = 'dist'  # Site statique généré par --build
+ASSET_HASH_LENGTH = 10  # Caractères hexadécimaux de l'empreinte dans les noms de fichiers
+# Séries de la page : nom côté JS, clé dans acquire_data(), clé des enregistrements
+PAGE_SERIES = (('hash', 'hash_sample', 'ehs'), ('power', 'power_sample', 'mw'), ('price', 'price_sample', 'pr'))
+
+# Session HTTP partagée (pool de connexions keep-alive) pour toutes les API
+http_session = requests.Session()
+http_session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=8))
+# TradingView échoue souvent de façon transitoire : le disjoncteur tolère toutes les tentatives d'un appel
+scheduler.configure('tradingview', failure_threshold=TRADINGVIEW_ATTEMPTS)
+# Sessions TradingView réutilisées : une instance TvDatafeed n'est utilisée que par un thread à la fois
+_tv_sessions = queue.LifoQueue()
+
+@contextmanager
+def tradingview_session():
+    """Emprunte une session TvDatafeed au pool (créée à la demande) et la restitue après usage."""
+    try:
+        tv = _tv_sessions.get_nowait()
+    except queue.Empty:
+        tv = TvDatafeed("", "")
+    try:
+        yield tv
+    finally:
+        _tv_sessions.put(tv)
+
+def http_get(source, url):
+    """GET via le planificateur : timeout, retries avec backoff, disjoncteur et métriques par source."""
+    def request():
+        with profiling.span(f'fetch:{source}', url=url):
+            response = http_session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        scheduler.record_bytes(source, len(response.content))
+        return response
+    return scheduler.call(source, request)
 
 def get_current_block_height():
     """Récupère la hauteur de bloc actuelle du Bitcoin."""
     try:
-        response = requests.get("https://blockstream.info/api/blocks/tip/height")
-        return int(response.text)
+        return api_cache.cached_fetch('block_height', lambda: int(
+            http_get('blockstream', "https://blockstream.info/api/blocks/tip/height").text), source='blockstream')
     except Exception as e:
         print(f"Erreur lors de la récupération de la hauteur de bloc : {e}")
         return 916944  # Fallback pour 29/09/2025
@@ -19,9 +83,11 @@ def get_current_block_height():
 def get_btc_price_eur():
     """Récupère le prix actuel du BTC en EUR via CoinGecko API."""
     try:
-        response = requests.get("https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=eur")
-        print("Prix Bitcoin euro: "+str(response.json()["bitcoin"]["eur"]))
-        return response.json()["bitcoin"]["eur"]
+        price_eur = api_cache.cached_fetch('btc_price_eur', lambda: http_get(
+            'coingecko', "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=eur"
+        ).json()["bitcoin"]["eur"], source='coingecko')
+        print("Prix Bitcoin euro: "+str(price_eur))
+        return price_eur
     except Exception as e:
         print(f"Erreur lors de la récupération du prix : {e}")
         return 96500  # Updated fallback for Oct 2025
@@ -29,10 +95,9 @@ def get_btc_price_eur():
 def get_current_hash_rate_ths():
     """Récupère le hash rate actuel en TH/s via Blockchain.info API."""
     try:
-        response = requests.get("https://api.blockchain.info/charts/hash-rate?format=json")
-        data = response.json()
-        hr_ths = data['values'][-1]['y']
-        return hr_ths
+        return api_cache.cached_fetch('hash_rate_ths', lambda: http_get(
+            'blockchain.info', "https://api.blockchain.info/charts/hash-rate?format=json"
+        ).json()['values'][-1]['y'], source='blockchain.info')
     except Exception as e:
         print(f"Erreur lors de la récupération du hash rate : {e}")
         return 1020000000  # Updated fallback approx 1020 EH/s = 1.02e9 TH/s
@@ -44,41 +109,19 @@ def days_since_genesis(current_date=None):
         current_date = date.today()
     return (current_date - genesis).days
 
-def get_historical_prices():
-    start_date = datetime(2018, 1, 1)
-    end_date = datetime(datetime.today().year, datetime.today().month, datetime.today().day)
+def get_historical_prices(output_file='historical_btcprice.csv'):
+    """Met à jour output_file (prix BTC/EUR journalier depuis 2018)."""
     # Get Daily Bitcoin Historical Price https://www.tradingview.com/symbols/BTCEUR/ from TradingView and store them on filesystem and a dataframe for re-use later in the code
-    
-    
-    # Get Bitcoin Historical Hashrate https://www.tradingview.com/symbols/HRATE/ from TradingView and store them on filesystem and a dataframe for re-use later in the code
-    tv = TvDatafeed("", "")
-    # Retry strategy to bypass TvDatafeed errors
-    for i in range(10):
-        try:
-            data = tv.get_hist(symbol="BTCEUR",exchange="COINBASE",interval=Interval.in_daily,n_bars=5000)
-            # Resample for complete daily data forward filled
-            data = data.resample('1D').ffill()
-            data.index = pd.to_datetime(data.index).date
-            data = data[data.index >= start_date.date()]
-            data['date'] = pd.to_datetime(data.index).date
-            data['date_integer'] = data['date'].apply(to_integer)
-            print(data['date_integer'])
-            data['price'] = data.close
-            df = data[['date','price']]
-            print(df)
-            # Save to a local CSV file
-            output_file = 'historical_btcprice.csv'
-            df.to_csv(output_file, index=False)
-            print("Fichier historical_btcprice.csv généré")
-            break
-        except Exception as e:
-            print("Iteration #"+str(i)+" has failed: "+str(e)+" retrying...")
-            continue
+    if api_cache.is_offline():
+        print(f"Mode hors ligne : {output_file} existant conservé")
+        return
+    single_flight(('history', os.path.abspath(output_file)), lambda: update_history_csv("BTCEUR", "COINBASE", output_file, 'price'))
 
-def get_power_law_points(current_date, exponent=5.6, years_ahead=7):
+def get_power_law_points(current_date, exponent=5.6, years_ahead=7, price_eur=None):
     """Génère des points pour la courbe de loi de puissance."""
     current_days = days_since_genesis(current_date)
-    price_eur = get_btc_price_eur()
+    if price_eur is None:
+        price_eur = get_btc_price_eur()
     A = price_eur / (current_days ** exponent)
 
     points = []
@@ -91,35 +134,19 @@ def get_power_law_points(current_date, exponent=5.6, years_ahead=7):
 
 def calculate_mined_btc(start_block, current_block):
     """Calcule le total de BTC minés depuis le bloc de départ jusqu'au bloc actuel."""
-    total_btc = 0.0
-
-    # Période 1 : Blocs ~499500 à 630000 (récompense 12.5 BTC)
-    halving1_end = 630000
-    blocks1 = max(0, min(halving1_end, current_block) - max(start_block, 499500))
-    total_btc += blocks1 * 12.5
-
-    # Période 2 : Blocs 630000 à 840000 (récompense 6.25 BTC)
-    halving2_start = 630000
-    halving2_end = 840000
-    blocks2_start = max(start_block, halving2_start)
-    blocks2_end = min(halving2_end, current_block)
-    blocks2 = max(0, blocks2_end - blocks2_start)
-    total_btc += blocks2 * 6.25
+    # Table précalculée des subventions par époque : exacte pour toute plage, halvings compris
+    return float(subsidy.mined_btc(start_block, current_block))
 
-    # Période 3 : Blocs 840000 à maintenant (récompense 3.125 BTC)
-    halving3_start = 840000
-    blocks3_start = max(start_block, halving3_start)
-    blocks3_end = current_block
-    blocks3 = max(0, blocks3_end - blocks3_start)
-    total_btc += blocks3 * 3.125
+def calculate_opportunity_cost(share=0.03, current_block=None, price_eur=None, hr_ths=None, refresh_history=True):  # 3% de part hypothétique
+    """Calcule le coût d'opportunité, plus données pour graphique.
 
-    return total_btc
-
-def calculate_opportunity_cost(share=0.03):  # 3% de part hypothétique
-    """Calcule le coût d'opportunité, plus données pour graphique."""
+    Les valeurs déjà récupérées (bloc, prix, hash rate) peuvent être passées pour éviter de refaire les appels.
+    """
     start_block = 499500  # Hauteur approximative au 1er janvier 2018
-    current_block = get_current_block_height()
-    price_eur = get_btc_price_eur()
+    if current_block is None:
+        current_block = get_current_block_height()
+    if price_eur is None:
+        price_eur = get_btc_price_eur()
     current_date = date.today()
 
     total_mined_btc = calculate_mined_btc(start_block, current_block)
@@ -128,18 +155,19 @@ def calculate_opportunity_cost(share=0.03):  # 3% de part hypothétique
     total_euros_past = int(value_eur_past)  # En euros complets
 
     # Données historiques pour le graphique
-    hist_points = get_historical_prices()
+    hist_points = get_historical_prices() if refresh_history else None
 
     initial_blocks = current_block - start_block
 
     # Calcul initial MW/jour total réseau (puissance moyenne)
-    hr_ths = get_current_hash_rate_ths()
+    if hr_ths is None:
+        hr_ths = get_current_hash_rate_ths()
     eff = 30  # J/TH moyenne
     total_power_w = hr_ths * eff
     total_mw = total_power_w / 1_000_000
 
     # Points pour loi de puissance
-    power_points, A, exponent = get_power_law_points(current_date)
+    power_points, A, exponent = get_power_law_points(current_date, price_eur=price_eur)
 
     return {
         'site_btc_past': site_btc_past,
@@ -160,47 +188,113 @@ def calculate_opportunity_cost(share=0.03):  # 3% de part hypothétique
 def to_integer(dt_time):
     return 10000*dt_time.year + 100*dt_time.month + dt_time.day
 
-def get_hash_historical_data_csv():
-    """Génère un fichier CSV pour le hashrate historique."""
-    start_date = datetime(2018, 1, 1)
-    end_date = datetime(datetime.today().year, datetime.today().month, datetime.today().day)
-    
+def get_hash_historical_data_csv(output_file='historical_data_hashrate.csv'):
+    """Met à jour output_file (hashrate journalier en EH/s depuis 2018)."""
     # Get Bitcoin Historical Hashrate https://www.tradingview.com/symbols/HRATE/ from TradingView and store them on filesystem and a dataframe for re-use later in the code
-    tv = TvDatafeed("", "")
-    # Retry strategy to bypass TvDatafeed errors
-    for i in range(10):
-        try:
-            data = tv.get_hist(symbol="HRATE",exchange="BCHAIN",interval=Interval.in_daily,n_bars=5000)
-            # Resample for complete daily data forward filled
-            data = data.resample('1D').ffill()
-            data.index = pd.to_datetime(data.index).date
-            data = data[data.index >= start_date.date()]
-            data['date'] = pd.to_datetime(data.index).date
-            data['date_integer'] = data['date'].apply(to_integer)
-            print(data['date_integer'])
-            data['EH/s'] = data.close / 1_000_000
-            df = data[['date','EH/s']]
-            print(df)
-            # Save to a local CSV file
-            output_file = 'historical_data_hashrate.csv'
-            df.to_csv(output_file, index=False)
-            print("Fichier historical_data_hashrate.csv généré")
-            break
-        except Exception as e:
-            print("Iteration #"+str(i)+" has failed: "+str(e)+" retrying...")
-            continue
-    
-    
-
+    if api_cache.is_offline():
+        print(f"Mode hors ligne : {output_file} existant conservé")
+        return
+    single_flight(('history', os.path.abspath(output_file)), lambda: update_history_csv(
+        "HRATE", "BCHAIN", output_file, 'EH/s', scale=1 / 1_000_000))
+
+def fetch_daily_history(symbol, exchange, column, n_bars, scale=1):
+    """Récupère n_bars barres journalières TradingView, complétées jour par jour (forward fill)."""
+    start_date = HISTORY_START
+    def request():
+        with tradingview_session() as tv, profiling.span(f'fetch:tradingview:{symbol}', n_bars=n_bars):
+            data = tv.get_hist(symbol=symbol,exchange=exchange,interval=Interval.in_daily,n_bars=n_bars)
+        if data is None or len(data) == 0:
+            raise ValueError(f"aucune donnée TradingView pour {symbol}")
+        return data
+    # Retry strategy to bypass TvDatafeed errors (backoff, échéance et disjoncteur du planificateur)
+    try:
+        data = scheduler.call('tradingview', request, attempts=TRADINGVIEW_ATTEMPTS, deadline=TRADINGVIEW_DEADLINE)
+    except Exception as e:
+        print(f"Échec de la récupération TradingView {symbol} : {e}")
+        return None
+    # Resample for complete daily data forward filled
+    with profiling.span(f'resample:{symbol}', rows=len(data)):
+        # Barres horodatées à une heure quelconque (01:00…) : ramenées au jour, la dernière barre d'un jour l'emporte
+        data.index = pd.DatetimeIndex(data.index).normalize()
+        data = data[~data.index.duplicated(keep='last')]
+        data = data.resample('1D').ffill()
+        data.index = pd.to_datetime(data.index).date
+        data = data[data.index >= start_date]
+        data['date'] = pd.to_datetime(data.index).date
+        data[column] = data.close * scale
+    return data[['date',column]]
+
+def _truncate_last_line(filename):
+    """Supprime la dernière ligne d'un fichier sans le réécrire."""
+    with open(filename, 'rb+') as f:
+        f.seek(0, 2)
+        position = f.tell() - 1  # ignore le saut de ligne final
+        while position > 0:
+            f.seek(position - 1)
+            if f.read(1) == b'\n':
+                break
+            position -= 1
+        f.truncate(max(position, 0))
+
+def update_history_csv(symbol, exchange, output_file, column, scale=1):
+    """Ajoute à output_file les seuls jours manquants, après validation du recouvrement.
+
+    La dernière ligne du fichier (barre du jour potentiellement incomplète) est toujours
+    re-téléchargée. Un téléchargement complet n'a lieu que si le fichier est absent, contient
+    des trous, ou si le recouvrement ne correspond pas aux données déjà sur disque.
+    """
+    existing = None
+    if os.path.exists(output_file):
+        with profiling.span(f'csv_read:{output_file}'):
+            existing = pd.read_csv(output_file)
+            existing['date'] = pd.to_datetime(existing['date']).dt.date
+    gaps = existing is None or len(existing) == 0 or existing['date'].iloc[0] > HISTORY_START \
+        or (pd.to_datetime(existing['date']).diff().dt.days.iloc[1:] != 1).any()
+    missing_days = 0 if gaps else (date.today() - existing['date'].iloc[-1]).days + 1
+    if gaps or missing_days + HISTORY_OVERLAP_DAYS > HISTORY_MAX_BARS:
+        print(f"Téléchargement complet de {output_file}")
+        df = fetch_daily_history(symbol, exchange, column, HISTORY_MAX_BARS, scale)
+        if df is not None:
+            with profiling.span(f'csv_write:{output_file}', rows=len(df)):
+                df.to_csv(output_file, index=False)
+            print(f"Fichier {output_file} généré")
+        return
+
+    df = fetch_daily_history(symbol, exchange, column, missing_days + HISTORY_OVERLAP_DAYS, scale)
+    if df is None:
+        return
+    last_date = existing['date'].iloc[-1]
+    # Recouvrement hors dernière ligne : doit correspondre aux données sur disque
+    overlap = existing[existing['date'] < last_date].merge(df, on='date', suffixes=('_disk', '_new')).dropna()
+    if len(overlap) == 0 or not np.allclose(overlap[column + '_disk'], overlap[column + '_new'], rtol=1e-3):
+        print(f"Recouvrement incohérent pour {output_file}, téléchargement complet")
+        df = fetch_daily_history(symbol, exchange, column, HISTORY_MAX_BARS, scale)
+        if df is not None:
+            with profiling.span(f'csv_write:{output_file}', rows=len(df)):
+                df.to_csv(output_file, index=False)
+            print(f"Fichier {output_file} généré")
+        return
+
+    new_rows = df[df['date'] >= last_date]
+    if len(new_rows) == 0:
+        print(f"{output_file} déjà à jour")
+        return
+    with profiling.span(f'csv_write:{output_file}', rows=len(new_rows)):
+        _truncate_last_line(output_file)
+        new_rows.to_csv(output_file, mode='a', header=False, index=False)
+    print(f"{output_file} : {len(new_rows)} ligne(s) mise(s) à jour jusqu'au {new_rows['date'].iloc[-1]}")
+
+@profiling.span('generate_sample_power_csv')
 def generate_sample_power_csv():
     """Génère un fichier CSV d'exemple pour la puissance du site."""
     start_date = datetime(2018, 1, 1)
     end_date = datetime(2020, 1, 1)
     current_date = start_date
     power_data = []
+    rng = random.Random(2018)  # Profil identique à chaque exécution : le bundle de données reste en cache
 
     while current_date <= end_date:
-        mw = 80 + 40 * random.random()  # 80-120 MW
+        mw = 80 + 40 * rng.random()  # 80-120 MW
         power_data.append(f"{current_date.date().isoformat()},{mw:.0f}")
         current_date += timedelta(days=1)
 
@@ -214,7 +308,7 @@ def generate_sample_power_csv():
 def load_sample_csv(filename):
     """Charge les données d'un fichier CSV d'exemple."""
     data = []
-    with open(filename, 'r', encoding='utf-8') as f:
+    with profiling.span(f'load_sample_csv:{filename}'), open(filename, 'r', encoding='utf-8') as f:
         reader = csv.reader(f)
         next(reader)  # Skip header
         for row in reader:
@@ -232,1058 +326,174 @@ def load_sample_csv(filename):
                     pass
     return data
 
-def generate_html():
-    """Génère le fichier HTML avec mises à jour en temps réel via API."""
-    result = calculate_opportunity_cost()
-    
-    # Load sample data
-    generate_sample_power_csv()
-    get_hash_historical_data_csv()
-    get_historical_prices()
-    hash_sample = load_sample_csv('historical_data_hashrate.csv')
-    power_sample = load_sample_csv('sample_power.csv')
-    price_sample = load_sample_csv('historical_btcprice.csv')
-
-    
-
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="fr">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Simulateur Site de Minage Bitcoin</title>
-    <link rel="icon" type="image/x-icon" href="https://res.cloudinary.com/daabdiwnt/image/upload/v1760992725/ArticleBTC/Galaxy_mqivqu.ico">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns/dist/chartjs-adapter-date-fns.bundle.min.js"></script>
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Arial:wght@400;700&display=swap');
-        
-        img {{
-            position: relative;
-            width: 15vh;
-            left: 50%;
-            transform: translateX(-50%);
-        }}
-        
-        body {{
-            font-family: 'Arial', sans-serif;
-            background: #000;
-            color: #fff;
-            margin: 0;
-            padding: 0;
-            overflow: auto;
-        }}
-        .container {{ display: flex; min-height: 100vh; }}
-        .left {{
-            flex: 1;
-            padding: 40px;
-            display: flex;
-            flex-direction: column;
-            background: #000;
-        }}
-        .right {{
-            flex: 1;
-            padding: 40px;
-            background: #111;
-        }}
-        h1 {{
-            font-size: 2.5em;
-            color: #F7931A;
-            margin-bottom: 20px;
-            text-align: center;
-        }}
-        p {{ color: #ccc; text-align: center; margin-bottom: 40px; }}
-        .label {{
-            font-size: 1.2em;
-            color: #F7931A;
-            margin-bottom: 10px;
-            text-align: center;
-        }}
-        h2 {{ color: #F7931A; text-align: center; margin-bottom: 20px; }}
-        a:link {{
-        color: orange;
-        background-color: transparent;
-        text-decoration: none;
-        }}
-
-        a:visited {{
-        color: orange;
-        background-color: transparent;
-        text-decoration: none;
-        }}
-
-        a:hover {{
-        color: red;
-        background-color: transparent;
-        text-decoration: underline;
-        }}
-
-        a:active {{
-        color: orange;
-        background-color: transparent;
-        text-decoration: underline;
-        }}
-
-        table {{ border-collapse: collapse; width: 100%; color: #FFF;}}
-        th, td {{ border: 1px solid #FF9900; padding: 8px; text-align: right; }}
-        th {{ background-color: #000; text-align: left; }}
-        .slider-container {{ margin: 10px 0; display: flex; align-items: center; color: #FF9900;}}
-        .slider-container label {{ width: 200px; margin-right: 10px; }}
-        .slider-container input {{ flex: 1; }}
-        .slider-container span {{ width: 60px; margin-left: 10px; text-align: right; }}
-        .wrapper {{
-            text-align: center;
-        }}
-        button {{ padding: 10px; background: #FF9900; color: white; border: none; cursor: pointer; }}
-
-        .updating {{ color: #ccc; font-size: 0.9em; text-align: center; margin-top: 20px; }}
-        /* Tooltip Styles - Updated for ? icon */
-        .tooltip {{
-            position: relative;
-            display: inline-block;
-            cursor: help;
-        }}
-        .tooltip .tooltiptext {{
-            visibility: hidden;
-            width: 350px;
-            background-color: #111;
-            color: #fff;
-            text-align: left;
-            border-radius: 6px;
-            padding: 10px;
-            position: absolute;
-            z-index: 1;
-            top: 125%;
-            left: 50%;
-            margin-left: -45px;
-            margin-bottom: -45px;
-            opacity: 0;
-            transition: opacity 0.3s;
-            border: 1px solid #F7931A;
-            font-size: 0.9em;
-            line-height: 1.4;
-        }}
-        .tooltip .tooltiptext::after {{
-            content: "";
-            position: absolute;
-            bottom: 100%;
-            right: 80%;
-            margin-left: -5px;
-            border-width: 5px;
-            border-style: solid;
-            border-color: #F7931A transparent transparent transparent;
-        }}
-        .tooltip:hover .tooltiptext {{
-            visibility: visible;
-            opacity: 1;
-        }}
-
-        .tooltip .tooltip-icon {{
-            color: #0066cc;
-            font-weight: bold;
-            font-size: 0.7em;
-            margin-left: 2px;
-            vertical-align: super;
-        }}
-
-        :root {{
-        --track-height: 6px;
-        --thumb-height: 18px;
-        --thumb-width: 18px;
-        }}
-
-        input[type="range"] {{
-        appearance: none;
-        background: transparent;
-        width: 15rem;
-        cursor: pointer;
-        border-radius: 3px;
-        }}
-
-        /* Input Track */
-
-        /* Chrome, Safari, Edge (Chromium) */
-        input[type="range"]::-webkit-slider-runnable-track {{
-        background: linear-gradient(to right, #fff 0%, #ff9900 100%);
-        height: var(--track-height);
-        border-radius: 3px;
-        }}
-
-        /* Firefox */
-        input[type="range"]::-moz-range-track {{
-        background: linear-gradient(to right, #fff 0%, #ff9900 100%);
-        height: var(--track-height);
-        border-radius: 3px;
-        }}
-
-        /* Style the button that is used to open and close the collapsible content */
-        .collapsible {{
-        background-color: #000;
-        color: orange;
-        cursor: pointer;
-        padding: 25px;
-        width: 80%;
-        border: none;
-        text-align: left;
-        outline: none;
-        font-size: 15px;
-        }}
-
-        /* Add a background color to the button if it is clicked on (add the .active class with JS), and when you move the mouse over it (hover) */
-        .active, .collapsible:hover {{
-        background-color: #000;
-        }}
-
-        /* Style the collapsible content. Note: hidden by default */
-        .collapsible-content {{
-        padding: 0 18px;
-        display: none;
-        overflow: hidden;
-        background-color: #000;
-        }}
-
-        /* Chrome, Safari, Edge (Chromium) */
-        input[type="range"]::-webkit-slider-thumb {{
-        appearance: none;
-        background: #fff;
-        border-radius: 50%;
-        width: var(--thumb-width);
-        height: var(--thumb-height);
-        margin-top: calc((var(--track-height) / 2) - (var(--thumb-height) / 2));
-        border: 3px solid #ff9900;
-        }}
-
-        /* Firefox */
-        input[type="range"]::-moz-range-thumb {{
-        appearance: none;
-        background: #fff;
-        border-radius: 0;
-        border-radius: 50%;
-        border: 3px solid #ff9900;
-        }}
-
-        .file-upload {{ margin: 10px 0; color: #FF9900; }}
-        .file-upload label {{ display: block; margin-bottom: 5px; }}
-        .file-upload input[type="file"] {{ margin-bottom: 10px; }}
-        .mode-container {{ margin: 10px 0; color: #FF9900; display: flex; align-items: center; }}
-        .mode-container label {{ margin-right: 10px; }}
-
-
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="left">
-            <!-- <img src="https://res.cloudinary.com/daabdiwnt/image/upload/v1760479746/INBI/LOGO-INBI_aezky1.webp" alt="Logo INBI"> -->
-            <h1>Simulateur site de minage</h1>
-            <!-- <p style="text-align: center;"><em><a target="_blank" href="https://www.youtube.com/watch?v=HX1Qo4pAqpc"><strong style="color:yellow;">Cliquez ici pour une explication en vidéo.</strong></a></em></p> -->
-            <p style="text-align: center;"><em><a target="_blank" href="https://github.com/pascalranaora/simulateur-bitcoin"><strong style="color:yellow;">Code open-source. Simulateur de minage Bitcoin écrit en Python+Javascript/CSS/HTML.</strong></a></em></p>
-            <p style="color: #FF9900;">
-            Ce simulateur permet de modéliser les revenus potentiels d'un site de minage en tenant compte de données historiques (saisir un fichier CSV donnant le 'Profil' moyen journalier de MW disponible, Hashrate historique ) et des projections futures basées sur une <a target="_blank" href="https://www.livre-bitcoin.fr/?page=45"><strong style="color:yellow;">loi de puissance pour le prix du Bitcoin</strong></a>, les halvings et la croissance du hashrate global.
-            Le minage Bitcoin s'apparente à de l'optimisation sous contraintes de réseaux électriques.
-            Glissez les sliders pour ajuster les paramètres et voir les mises à jour en temps réel.</p>
-
-            <h2>Paramètres & Données Historique</h2>
-            <div class="file-upload">
-                <label>CSV Profil de Puissance Minable du Site   (format: date,MW) :</label>
-                <input type="file" id="powerCsv" accept=".csv">
-            </div>
-
-            <!-- <div class="file-upload">
-                 <label>CSV Hashrate historique (format: date,EH/s) :</label>
-                 <input type="file" id="hashCsv" accept=".csv">
-            </div> -->
-
-            <div class="mode-container">
-                <label>Mode projection :</label>
-                <input type="checkbox" id="projectionMode">
-            </div>
-
-            <div id="dateRangeContainer" style="display: block;">
-                <div class="slider-container">
-                    <label>Date de début :</label>
-                    <input type="range" id="startDateSlider" min="0" max="0" step="1" value="0">
-                    <span id="startDateValue"></span>
-                </div>
-                <div class="slider-container">
-                    <label>Date de fin :</label>
-                    <input type="range" id="endDateSlider" min="0" max="0" step="1" value="0">
-                    <span id="endDateValue"></span>
-                </div>
-            </div>
-            <div class="slider-container" id="efficiencySliderContainer">
-                <label>Efficacité Minage (J/TH) :<span class="tooltip"><span class="tooltip-icon">?</span><span class="tooltiptext">Efficacité énergétique des ASICs (Joules par Terahash). Plus bas = plus efficace.</span></span></label>
-                <input type="range" id="efficiencySlider" min="1" max="50" step="1" value="18">
-                <span id="efficiencyValue">18</span>
-            </div>
-
-            <div class="slider-container" id="feesSliderContainer">
-                <label>Frais par bloc (BTC) :<span class="tooltip"><span class="tooltip-icon">?</span><span class="tooltiptext">Frais moyens par bloc (en BTC). Actuel ~0.022, peut varier avec adoption.</span></span></label>
-                <input type="range" id="feesSlider" min="0.010" max="0.2" step="0.002" value="0.022">
-                <span id="feesValue">0.022</span>
-            </div>
-            <div class="slider-container">
-                <label>Frais électricité (€/kWh) :<span class="tooltip"><span class="tooltip-icon">?</span><span class="tooltiptext">Coût de l'électricité en euro par kWh. Dans le cas d'une exploitation publique de la surcapacité nucléaire, le coût d'optimisation est nul.</span></span></label>
-                <input type="range" id="electricitySlider" min="0" max="0.3" step="0.01" value="0">
-                <span id="electricityValue">0</span>
-            </div>
-            <div class="slider-container" id="exponentSliderContainer" style="display:none;">
-                <label>Exposant loi de puissance :<span class="tooltip"><span class="tooltip-icon">?</span><span class="tooltiptext">Exposant dans P(t) = a * t^exposant. 5.6 est calibré historique ; plus haut = croissance plus agressive.</span></span></label>
-                <input type="range" id="exponentSlider" min="4" max="7" step="0.1" value="5.6">
-                <span id="exponentValue">5.6</span>
-            </div>
-
-            <div class="slider-container" id="growthSliderContainer" style="display:none;">
-                <label>Croissance hash/an (%):<span class="tooltip"><span class="tooltip-icon">?</span><span class="tooltiptext">Croissance annuelle estimée du hash global (~50%/an historique). Dilue le % du hachage du site de minage sans upgrade hardware.</span></span></label>
-                <input type="range" id="growthSlider" min="0" max="100" step="5" value="30">
-                <span id="growthValue">30</span>
-            </div>
-
-            <div id="initInvestContainer" style="display: block;">
-                <div class="slider-container">
-                    <label>Investissement initial (milliers €) :<span class="tooltip"><span class="tooltip-icon">?</span><span class="tooltiptext">Investissement initial en milliers d'euros, déduit au début de la simulation.</span></span></label>
-                    <input type="range" id="investmentSlider" min="0" max="150000" step="1" value="0">
-                    <span id="investmentValue">0</span>
-                    <br />
-                    <label> ou entrer la valeur manuellement:</label>
-                    <input type="number" id="numInvestInput" value="0" onchange="updateRangeInput(this.value)";>
-                </div>
-            </div>
-
-            <h2 id="chart2-title">Hashrate Historique Réseau Bitcoin (EH/s)</h2>
-            <canvas id="hashChart" width="800" height="400"></canvas>
-
-            <h2 id="chart3-title">Prix historique du Bitcoin (€)</h2>
-            <canvas id="priceChart" width="800" height="400"></canvas>
-            
-        </div>
-
-        <div class="right">
-            <h1 id="site-name">Site : Données Démo</h1>
-            <h2 id="chart1-title">Puissance de minage du site (MW/jour)</h2>
-            <canvas id="powerChart" width="800" height="400"></canvas>
-            <h3 style="color: #F7931A;" id="average-power"></h3>
-            <div id="results-table"></div>
-            <button type="button" class="collapsible" id="button-daily"><h4>Afficher la simulation journalière complète</h4></button>
-            <div class="collapsible-content" id="daily-results-table">
-            </div>
-            <h2 id="chart4-title">Revenus Annuels du Minage Bitcoin Projetés (M€)</h2>
-            <canvas id="revenueChart" width="800" height="400"></canvas>
-
-            <h2 id="chart5-title">Revenus Cumulés du Minage Bitcoin Projetés (M€)</h2>
-            <canvas id="cumulativeChart" width="800" height="400"></canvas>
-                       
-        </div>
-    </div>
-
-
-    <script>
-        function updateRangeInput(val) {{
-          document.getElementById('investmentSlider').value=val; 
-          document.getElementById('investmentValue').innerHTML=val;
-        }}
-        var coll = document.getElementsByClassName("collapsible");
-        var i;
-
-        for (i = 0; i < coll.length; i++) {{
-        coll[i].addEventListener("click", function() {{
-            this.classList.toggle("active");
-            var content = this.nextElementSibling;
-            if (content.style.display === "block") {{
-            content.style.display = "none";
-            }} else {{
-            content.style.display = "block";
-            }}
-        }});
-        }}
-
-        // Paramètres de simulation
-        const GENESIS_DATE = new Date(2009, 0, 3);  // 3 janv 2009
-        const CURRENT_HASH_EH_S = 1020;  // Hash global actuel (EH/s) updated for 2025
-        const BLOCKS_PER_DAY = 144;
-        const DAYS_PER_YEAR = 365.25;
-        let FEES_PER_BLOCK = 0.022;
-        let A_POWER_LAW = 6.013753970346012e-17;  // Calibré initialement
-        let ANNUAL_GROWTH_RATE = 1.3;  // 30% initial
-        let SITE_HASH_EH_S = 55.6;  // Initial
-        let powerAverage = 1000;  // Default MW exploitable du site
-        let historicalHash = {{}};  // year: avg EH/s
-        let powerData = []; // {{date: string, mw: number}}
-        let hashData = []; // {{date: string, ehs: number}}
-        let EFFICIENCY = 18;
-        let minPowerDate, maxPowerDate;
-        let loadedCsvName = '';
-
-        let priceChart, revenueChart, cumulativeChart, hashChart, powerChart;
-
-        const hashSample = {json.dumps(hash_sample)};
-        const powerSample = {json.dumps(power_sample)};
-        const btcHistoricalPrice = {json.dumps(price_sample)};
-        
-        function parseHashData(dataArray) {{
-            let tempHash = {{}};
-            dataArray.forEach(d => {{
-                const date = new Date(d.date);
-                if (!isNaN(date.getTime())) {{
-                    const year = date.getFullYear();
-                    if (!tempHash[year]) {{
-                        tempHash[year] = {{sum: 0, count: 0}};
-                    }}
-                    tempHash[year].sum += d.ehs;
-                    tempHash[year].count++;
-                }}
-            }});
-            historicalHash = {{}};
-            for (let y in tempHash) {{
-                historicalHash[y] = tempHash[y].sum / tempHash[y].count;
-            }}
-            hashData = hashSample;
-            console.log('Historical hash yearly:', historicalHash);
-            console.log('Historical hash daily:', hashData);
-        }}
-
-        function parsePowerData(dataArray) {{
-            let sum = 0, count = 0;
-            dataArray.forEach(d => {{
-                sum += d.mw;
-                count++;
-            }});
-            powerAverage = count > 0 ? sum / count : 1000;
-            powerData = dataArray.sort((a, b) => new Date(a.date) - new Date(b.date));
-            if (powerData.length > 0) {{
-                minPowerDate = new Date(powerData[0].date);
-                maxPowerDate = new Date(powerData[powerData.length - 1].date);
-            }}
-            else {{
-                minPowerDate = new Date(powerSample[0].date);
-                maxPowerDate = new Date(powerSample[powerData.length - 1].date);
-            }}
-            console.log('Min Power Date: ',minPowerDate);
-            console.log('Max Power Date: ',maxPowerDate);
-            console.log('MW minage journalier moyen du site:', powerAverage);
-        }}
-
-        function initializeDateSliders() {{
-            const diffTime = maxPowerDate - minPowerDate;
-            const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24)) + 1;
-            const startSlider = document.getElementById('startDateSlider');
-            const endSlider = document.getElementById('endDateSlider');
-            startSlider.max = diffDays - 1;
-            endSlider.max = diffDays - 1;
-            startSlider.min = 0;
-            endSlider.min = 0;
-            startSlider.value = 0;
-            endSlider.value = diffDays - 1;
-            updateStartDateValue();
-            updateEndDateValue();
-        }}
-        
-        // Load samples automatically
-        parseHashData(hashSample);
-        parsePowerData(powerSample);
-        initializeDateSliders();
-
-        // Create lookup for historical prices
-        const btcHist = {{}};
-        btcHistoricalPrice.forEach(item => {{
-            btcHist[item.date] = item.pr;
-        }});
-
-        function updateStartDateValue() {{
-            const sliderVal = parseInt(document.getElementById('startDateSlider').value);
-            const date = new Date(minPowerDate);
-            date.setDate(date.getDate() + sliderVal);
-            document.getElementById('startDateValue').textContent = date.toISOString().split('T')[0];
-        }}
-
-        function updateEndDateValue() {{
-            const sliderVal = parseInt(document.getElementById('endDateSlider').value);
-            const date = new Date(minPowerDate);
-            date.setDate(date.getDate() + sliderVal);
-            document.getElementById('endDateValue').textContent = date.toISOString().split('T')[0];
-        }}
-
-        // Halving approx mid year
-        function getAverageReward(year) {{
-            let baseReward;
-            if (year < 2012) baseReward = 50;
-            else if (year < 2016) baseReward = 25;
-            else if (year < 2020) baseReward = 12.5;
-            else if (year < 2024) baseReward = 6.25;
-            else if (year < 2028) baseReward = 3.125;
-            else if (year < 2032) baseReward = 1.5625;
-            else baseReward = 0.78125;
-
-            // For halving years, approximate mid-year average
-            const halvingYears = [2012, 2016, 2020, 2024, 2028, 2032];
-            if (halvingYears.includes(year)) {{
-                let oldReward;
-                if (year === 2012) oldReward = 50;
-                else if (year === 2016) oldReward = 25;
-                else if (year === 2020) oldReward = 12.5;
-                else if (year === 2024) oldReward = 6.25;
-                else if (year === 2028) oldReward = 3.125;
-                else if (year === 2032) oldReward = 1.5625;
-                baseReward = (oldReward + baseReward) / 2;
-            }}
-            return baseReward + FEES_PER_BLOCK;
-        }}
-
-        function getDaysFromGenesis(inputDate) {{
-            const diffTime = inputDate - GENESIS_DATE;
-            return Math.floor(diffTime / (1000 * 60 * 60 * 24));
-        }}
-
-        function getBTCPrice(days, exponent) {{
-            return A_POWER_LAW * Math.pow(days, exponent);
-        }}
-
-        function handlePowerCsv(e) {{
-            const file = e.target.files[0];
-            if (!file) return;
-            loadedCsvName = file.name.replace(/\.[^/.]+$/, "");
-            document.getElementById('site-name').innerHTML = `Résultats ${{loadedCsvName}}`;
-            const reader = new FileReader();
-            reader.onload = function(ev) {{
-                const text = ev.target.result;
-                const lines = text.split(/\\r?\\n/);
-                powerData = [];
-                let sum = 0, count = 0;
-                for (let i = 1; i < lines.length; i++) {{
-                    if (lines[i].trim() === '') continue;
-                    const parts = lines[i].split(',');
-                    if (parts.length >= 2) {{
-                        const dateStr = parts[0].trim();
-                        const mw = parseFloat(parts[1]);
-                        if (!isNaN(mw)) {{
-                            powerData.push({{date: dateStr, mw: mw}});
-                            sum += mw;
-                            count++;
-                        }}
-                    }}
-                }}
-                parsePowerData(powerData);
-                if (count > 0) {{
-                    powerAverage = sum / count;
-                    console.log('MW journalier moyen site:', powerAverage);
-                }}
-                initializeDateSliders();
-                const dateCont = document.getElementById('dateRangeContainer');
-                dateCont.style.display = !document.getElementById('projectionMode').checked ? 'block' : 'none';
-                updateSimulation();
-            }};
-            reader.readAsText(file);
-        }}
-
-        // Mise à jour des sliders avec appel dynamique à updateSimulation
-        document.getElementById('efficiencySlider').oninput = function() {{
-            document.getElementById('efficiencyValue').textContent = this.value;
-            updateSimulation();
-        }};
-        document.getElementById('feesSlider').oninput = function() {{
-            document.getElementById('feesValue').textContent = this.value;
-            updateSimulation();
-        }};
-        document.getElementById('electricitySlider').oninput = function() {{
-            document.getElementById('electricityValue').textContent = this.value;
-            updateSimulation();
-        }};
-        document.getElementById('numInvestInput').oninput = function() {{
-            document.getElementById('numInvestInput').textContent = this.value;
-            document.getElementById('investmentSlider').value = this.value; 
-            document.getElementById('investmentValue').innerHTML = this.value;
-            updateSimulation();
-        }};
-        document.getElementById('investmentSlider').oninput = function() {{
-            document.getElementById('investmentValue').textContent = this.value;
-            document.getElementById('numInvestInput').value = this.value;
-            updateSimulation();
-        }};
-        document.getElementById('startDateSlider').oninput = function() {{
-            updateStartDateValue();
-            updateSimulation();
-        }};
-        document.getElementById('endDateSlider').oninput = function() {{
-            updateEndDateValue();
-            updateSimulation();
-        }};
-
-        document.getElementById('projectionMode').onchange = function() {{
-            const checked = this.checked;
-            document.getElementById('exponentSliderContainer').style.display = !checked ? 'none' : 'flex';
-            document.getElementById('growthSliderContainer').style.display = !checked ? 'none' : 'flex';
-            //document.getElementById('daily-results-table').style.display = !checked ? 'block' : 'none';
-            let element = document.getElementById("button-daily");
-            let hidden = element.getAttribute("hidden");
-            if (!checked) {{
-            element.removeAttribute("hidden");
-            }} else {{
-            document.getElementById('daily-results-table').innerHTML = '';
-            document.getElementById('daily-results-table').style.display = 'none';
-            element.setAttribute("hidden", "hidden");
-            }}
-            const dateCont = document.getElementById('dateRangeContainer');
-            dateCont.style.display = !checked ? 'block' : 'none';
-            updateSimulation();
-        }};
-
-        document.getElementById('exponentSlider').oninput = function() {{
-            document.getElementById('exponentValue').textContent = this.value;
-            updateSimulation();
-        }};
-        document.getElementById('growthSlider').oninput = function() {{
-            document.getElementById('growthValue').textContent = this.value;
-            updateSimulation();
-        }};
-
-        document.getElementById('powerCsv').addEventListener('change', handlePowerCsv);
-        // document.getElementById('hashCsv').addEventListener('change', handleHashCsv);
-
-        function updateSimulation() {{
-            const efficiency = parseInt(document.getElementById('efficiencySlider').value);
-            const exponent = parseFloat(document.getElementById('exponentSlider').value);
-            ANNUAL_GROWTH_RATE = 1 + (parseFloat(document.getElementById('growthSlider').value) / 100);
-            FEES_PER_BLOCK = parseFloat(document.getElementById('feesSlider').value);
-            const electricityCost = parseFloat(document.getElementById('electricitySlider').value);
-            const initialInvestment = parseInt(document.getElementById('investmentSlider').value) * 1000;
-            const projection = document.getElementById('projectionMode').checked;
-
-            if (!projection && loadedCsvName != '') {{
-                document.getElementById('chart1-title').innerHTML = `Puissance de minage site ${{loadedCsvName}} (MW/jour)`;
-                document.getElementById('chart2-title').innerHTML = `Hashrate historique réseau Bitcoin (EH/s)`;
-                document.getElementById('chart3-title').innerHTML = `Prix historique du Bitcoin (€)`;
-                document.getElementById('chart4-title').innerHTML = `Revenus Annuels Simulés site ${{loadedCsvName}} (M€)`;
-                document.getElementById('chart5-title').innerHTML = `Revenus Cumulés Simulés site ${{loadedCsvName}} (M€)`;
-            }}
-            if (projection && loadedCsvName != '') {{
-                document.getElementById('chart1-title').innerHTML = `Puissance de minage site ${{loadedCsvName}} (MW/jour)`;
-                document.getElementById('chart2-title').innerHTML = `Hashrate historique Réseau Bitcoin (EH/s)`;
-                document.getElementById('chart3-title').innerHTML = `Prix moyen annualisé & projeté du Bitcoin (€)`;
-                document.getElementById('chart4-title').innerHTML = `Revenus Annuels Projetés site ${{loadedCsvName}} (M€)`;
-                document.getElementById('chart5-title').innerHTML = `Revenus Cumulés Projetés site ${{loadedCsvName}} (M€)`;
-            }}
-            
-            const effective_MW = powerAverage;
-            const effective_GW = effective_MW / 1000;
-            SITE_HASH_EH_S = (1000 / efficiency) * effective_GW;
-            EFFICIENCY = efficiency;
-
-            // Recalculer A si exposant change (calibré sur prix actuel)
-            const currentDate = new Date(2025, 6, 1);
-            const currentDays = getDaysFromGenesis(currentDate);
-            // Pass the price_eur value as a string literal to the JavaScript
-            const currentPrice = 95335;
-            A_POWER_LAW = currentPrice / Math.pow(currentDays, exponent);
-
-            // Generate sorted dates
-            let sortedDates = [];
-            if (!projection) {{
-                if (powerData.length === 0 && hashData.length === 0) return;
-                let start, end;
-                if (powerData.length > 0) {{
-                    const startOffset = parseInt(document.getElementById('startDateSlider').value);
-                    const endOffset = parseInt(document.getElementById('endDateSlider').value);
-                    start = new Date(minPowerDate.getTime() + startOffset * 86400000);
-                    end = new Date(minPowerDate.getTime() + endOffset * 86400000);
-                }} else {{
-                    const hashDates = hashData.map(d => new Date(d.date)).sort((a, b) => a - b);
-                    start = hashDates[1];
-                    end = hashDates[hashDates.length - 1];
-                }}
-                let current = new Date(start);
-                while (current <= end) {{
-                    sortedDates.push(current.toISOString().split('T')[0]);
-                    current.setDate(current.getDate() + 1);
-                }}
-            }} else {{
-                let startDate = new Date(2026, 0, 1);
-                let endDate = new Date(2032, 11, 31);
-                let current = new Date(startDate);
-                while (current <= endDate) {{
-                    sortedDates.push(current.toISOString().split('T')[0]);
-                    current.setDate(current.getDate() + 1);
-                }}
-            }}
-
-            let yearSums = {{}};
-            //let cumulativeRevenueEur = 0;
-            cumulativeRevenueEur = -initialInvestment;
-            let dailySimulation = []; // For projection daily results
-
-            sortedDates.forEach(dateStr => {{
-                const date = new Date(dateStr);
-                const year = date.getFullYear();
-                const days = getDaysFromGenesis(date);
-
-                // Price
-                let priceEur;
-                if (!projection && btcHist[dateStr]) {{
-                    priceEur = btcHist[dateStr];
-                }} else {{
-                    priceEur = getBTCPrice(days, exponent);
-                }}
-
-                // Daily site MW and hash
-                const dailyMw = !projection ? (powerData.find(p => p.date === dateStr)?.mw || powerAverage) : powerAverage;
-                const dailySiteHashEh = (1000 / EFFICIENCY) * (dailyMw / 1000);
-
-                // Daily global hash
-                let dailyGlobalHash;
-                if (!projection) {{
-                    dailyGlobalHash = hashData.find(h => h.date === dateStr)?.ehs || (historicalHash[year] || CURRENT_HASH_EH_S);
-                }} else {{
-                    dailyGlobalHash = CURRENT_HASH_EH_S * Math.pow(ANNUAL_GROWTH_RATE, year - 2025);
-                }}
-
-                const hashPct = (dailySiteHashEh / dailyGlobalHash) * 100;
-                const avgReward = getAverageReward(year);
-                const totalBtcDay = avgReward * BLOCKS_PER_DAY;
-                const btcMinedDay = (hashPct / 100) * totalBtcDay;
-                const revenueDayEur = btcMinedDay * priceEur;
-
-                // Electricity cost
-                const dailyEnergyKwh = dailyMw * 1000 * 24;
-                const dailyCostEur = dailyEnergyKwh * electricityCost;
-                const netRevenueDayEur = revenueDayEur - dailyCostEur;
-                cumulativeRevenueEur += netRevenueDayEur;
-                
-
-                if (!yearSums[year]) {{
-                    yearSums[year] = {{btc: 0, revenue: 0, days: 0, prices: [], hashPcts: []}};
-                }}
-                yearSums[year].btc += btcMinedDay;
-                yearSums[year].revenue += netRevenueDayEur;
-                yearSums[year].days++;
-                yearSums[year].prices.push(priceEur);
-                yearSums[year].hashPcts.push(hashPct);
-
-                if (!projection) {{
-                    dailySimulation.push({{
-                        date: dateStr,
-                        priceEur: priceEur,
-                        hashPct: hashPct,
-                        btcMined: btcMinedDay,
-                        revenueEur: netRevenueDayEur,
-                        siteHash: dailySiteHashEh,
-                        globalHash: dailyGlobalHash,
-                        cumulativeEur: cumulativeRevenueEur
-                    }});
-                }}
-            }});
-
-            // Build yearly simulation data
-            let sortedYears = Object.keys(yearSums).sort((a, b) => parseInt(a) - parseInt(b));
-            let simulationData = [];
-            //let runningCum = 0;
-            let runningCum = -initialInvestment;
-            sortedYears.forEach(y => {{
-                const ys = yearSums[y];
-                const avgPrice = ys.prices.reduce((a, b) => a + b, 0) / ys.prices.length;
-                const avgHashPct = ys.hashPcts.reduce((a, b) => a + b, 0) / ys.hashPcts.length;
-                runningCum += ys.revenue;
-                simulationData.push({{
-                    year: parseInt(y),
-                    priceEur: avgPrice,
-                    hashPct: avgHashPct,
-                    btcMined: ys.btc,
-                    revenueEur: ys.revenue,
-                    cumulativeEur: runningCum
-                }});
-            }});
-
-            // Génération du tableau annuel
-            let tableHTML = `
-                <h2>Synthèse Performance (annualisée)</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Année</th>
-                            <th>Prix BTC (€)</th>
-                            <th>% Hash Site</th>
-                            <th>BTC Minés</th>
-                            <th>Revenus Annuels (M€)</th>
-                            <th>Revenus Cumulés (M€)</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            `;
-            simulationData.forEach(row => {{
-                tableHTML += `
-                    <tr>
-                        <td>${{row.year}}</td>
-                        <td>${{Math.round(row.priceEur).toLocaleString()}}</td>
-                        <td>${{row.hashPct.toFixed(3)}} %</td>
-                        <td>${{Math.round(row.btcMined).toLocaleString()}}</td>
-                        <td>${{Math.round(row.revenueEur).toLocaleString()}}</td>
-                        <td>${{Math.round(row.cumulativeEur).toLocaleString()}}</td>
-                    </tr>
-                `;
-            }});
-            tableHTML += `
-                    </tbody>
-                    <tfoot>
-                        <tr style="font-weight: bold;">
-                            <td>Total</td>
-                            <td colspan="2"></td>
-                            <td>${{Math.round(simulationData.reduce((sum, r) => sum + r.btcMined, 0)).toLocaleString()}} BTC</td>
-                            <td colspan="2">${{Math.round(simulationData[simulationData.length - 1]?.cumulativeEur || 0).toLocaleString()}} M€</td>
-                        </tr>
-                    </tfoot>
-                </table>
-            `;
-
-            let fullHTML = tableHTML;
-
-            // Add daily table if projection
-            if (!projection && dailySimulation.length > 0) {{
-                let dailyTableHTML = `
-                    <h2>Résultats de Simulation Quotidienne</h2>
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Date</th>
-                                <th>Prix BTC (€)</th>
-                                <th>% Hash Site</th>
-                                <th>Hash rate du site (EH/s)</th>
-                                <th>Hash rate du reseau bitcoin (EH/s)</th>
-                                <th>BTC Minés</th>
-                                <th>Revenus Quotidiens (€)</th>
-                                <th>Revenus Quotidiens cumules (€)</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                `;
-                dailySimulation.forEach(d => {{
-                    dailyTableHTML += `
-                        <tr>
-                            <td>${{d.date}}</td>
-                            <td>${{Math.round(d.priceEur).toLocaleString()}}</td>
-                            <td>${{d.hashPct.toFixed(3)}} %</td>
-                            <td>${{d.siteHash.toFixed(2)}}</td>
-                            <td>${{d.globalHash.toFixed(2)}}</td>
-                            <td>${{(d.btcMined).toFixed(6)}}</td>
-                            <td>${{Math.round(d.revenueEur).toLocaleString()}}</td>
-                            <td>${{Math.round(d.cumulativeEur).toLocaleString()}}</td>
-                        </tr>
-                    `;
-                }});
-                const totalDailyBtc = dailySimulation.reduce((sum, d) => sum + d.btcMined, 0);
-                const totalDailyRev = dailySimulation.reduce((sum, d) => sum + d.revenueEur, 0);
-                const avgSiteHash = dailySimulation.reduce((sum, d) => sum + d.siteHash, 0) / dailySimulation.length;
-                const avgGlobalHash = dailySimulation.reduce((sum, d) => sum + d.globalHash, 0) / dailySimulation.length;
-                const finalCum = dailySimulation[dailySimulation.length - 1].cumulativeEur;
-                dailyTableHTML += `
-                        </tbody>
-                        <tfoot>
-                            <tr style="font-weight: bold;">
-                                <td>Total</td>
-                                <td colspan="2"></td>
-                                <td>${{avgSiteHash.toFixed(2)}}</td>
-                                <td>${{avgGlobalHash.toFixed(2)}}</td>
-                                <td>${{totalDailyBtc.toFixed(6)}} BTC</td>
-                                <td>${{Math.round(totalDailyRev).toLocaleString()}} EUR</td>
-                                <td>${{Math.round(finalCum).toLocaleString()}} EUR</td>
-                            </tr>
-                        </tfoot>
-                    </table>
-                `;
-                //fullHTML += dailyTableHTML;
-                //document.getElementById('button-daily').style.display = !projection ? 'block' : 'none';
-                document.getElementById('daily-results-table').innerHTML = dailyTableHTML;
-            }}
-
-            document.getElementById('results-table').innerHTML = fullHTML;
-            const powerAverageStr = 'Puissance (MW) minage journalier moyen du site: ' + Math.round(effective_MW).toLocaleString() + 'MW';
-            document.getElementById('average-power').innerHTML = projection ? powerAverageStr : '';
-
-            // Mise à jour des graphiques
-            if (priceChart) priceChart.destroy();
-            if (revenueChart) revenueChart.destroy();
-            if (cumulativeChart) cumulativeChart.destroy();
-
-            // Graphique 1: Prix BTC projection/simulation (€)
-            const priceCtx = document.getElementById('priceChart').getContext('2d'); 
-            if (projection) {{
-                priceChart = new Chart(priceCtx, {{
-                    type: 'line',
-                    data: {{
-                        labels: simulationData.map(d => d.year.toString()),
-                        datasets: [{{
-                            label: 'Prix BTC (€)',
-                            data: simulationData.map(d => d.priceEur),
-                            borderColor: '#3b82f6',
-                            backgroundColor: 'rgba(59, 130, 246, 0.1)',
-                            fill: true,
-                            tension: 0.1
-                        }}]
-                    }},
-                    options: {{
-                        responsive: true,
-                        scales: {{
-                            y: {{ beginAtZero: false, title: {{ display: true, text: 'Prix (€)' }} }},
-                            x: {{ title: {{ display: true, text: 'Année' }} }}
-                        }},
-                        //plugins: {{ title: {{ display: true, text: 'Projection du Prix du Bitcoin (Loi de Puissance)' }} }}
-                    }}
-                }});
-            }}
-            else {{ 
-                priceChart = new Chart(priceCtx, {{
-                type: 'line',
-                data: {{
-                    labels: btcHistoricalPrice.map(d => d.date),
-                    datasets: [{{
-                        label: 'Prix BTC (€)',
-                        data: btcHistoricalPrice.map(d => d.pr),
-                        borderColor: '#3b82f6',
-                        backgroundColor: 'rgba(59, 130, 246, 0.1)',
-                        fill: true,
-                        tension: 0.1
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    scales: {{
-                        y: {{ beginAtZero: false, title: {{ display: true, text: 'Prix (€)' }} }},
-                        x: {{ title: {{ display: true, text: 'Année' }} }}
-                    }},
-                    //plugins: {{ title: {{ display: true, text: 'Projection du Prix du Bitcoin (Loi de Puissance)' }} }}
-                }}
-                }});
-            }}
+@profiling.span('acquire_data')
+def acquire_data():
+    """Récupère toutes les données de la page en parallèle, chaque source n'étant appelée qu'une fois."""
+    pipeline = Pipeline()
+    pipeline.add('block_height', get_current_block_height)
+    pipeline.add('price_eur', get_btc_price_eur)
+    pipeline.add('hash_rate_ths', get_current_hash_rate_ths)
+    pipeline.add('btc_history', get_historical_prices)
+    pipeline.add('hash_history', get_hash_historical_data_csv)
+    pipeline.add('sample_power', generate_sample_power_csv)
+    pipeline.add('result', lambda block, price, hr_ths, _: calculate_opportunity_cost(
+        current_block=block, price_eur=price, hr_ths=hr_ths, refresh_history=False),
+        deps=('block_height', 'price_eur', 'hash_rate_ths', 'btc_history'))
+    pipeline.add('hash_sample', lambda _: load_sample_csv('historical_data_hashrate.csv'), deps=('hash_history',))
+    pipeline.add('power_sample', lambda _: load_sample_csv('sample_power.csv'), deps=('sample_power',))
+    pipeline.add('price_sample', lambda _: load_sample_csv('historical_btcprice.csv'), deps=('btc_history',))
+    return pipeline.run()
+
+@profiling.span('encode_series')
+def encode_series(records):
+    """Encode une série journalière (liste de dicts) : date de début, pas d'un jour et valeurs Float32 en base64."""
+    series = series_from_frame('', pd.DataFrame.from_records(records))
+    return {
+        'start': series.start.strftime('%Y-%m-%d'),
+        'stride': 1,  # jours
+        'values': base64.b64encode(series.values.astype('<f4').tobytes()).decode('ascii'),
+    }
 
-            // Graphique 2: Revenus Annuels (M€)
-            const revenueCtx = document.getElementById('revenueChart').getContext('2d');
-            revenueChart = new Chart(revenueCtx, {{
-                type: 'bar',
-                data: {{
-                    labels: simulationData.map(d => d.year.toString()),
-                    datasets: [{{
-                        label: 'Revenus (M€)',
-                        data: simulationData.map(d => d.revenueEur),
-                        backgroundColor: ['#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#06b6d4', '#10b981', '#f59e0b', '#ef4444']
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    scales: {{
-                        y: {{ beginAtZero: true, title: {{ display: true, text: 'Revenus (M€)' }} }},
-                        x: {{ title: {{ display: true, text: 'Année' }} }}
-                    }},
-                    //plugins: {{ title: {{ display: true, text: 'Revenus Annuels Projetés' }} }}
-                }}
-            }});
+@profiling.span('encode_levels')
+def encode_levels(records):
+    """Niveaux de détail LTTB d'une série journalière : jours depuis le début (Uint16) et valeurs (Float32) en base64."""
+    series = series_from_frame('', pd.DataFrame.from_records(records))
+    offsets = np.flatnonzero(~np.isnan(series.values))
+    values = series.values[offsets]
+    levels = [{
+        'days': base64.b64encode(offsets[idx].astype('<u2').tobytes()).decode('ascii'),
+        'values': base64.b64encode(values[idx].astype('<f4').tobytes()).decode('ascii'),
+    } for idx in downsample.lod_levels(offsets, values)]
+    return {'start': series.start.strftime('%Y-%m-%d'), 'levels': levels}
+
+def read_web_file(name):
+    """Contenu d'un fichier source de la page (web/)."""
+    with open(os.path.join(WEB_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def subsidy_tables():
+    """Tables de subvention du moteur JS, générées depuis subsidy.py."""
+    return {
+        'halvingInterval': subsidy.HALVING_INTERVAL,
+        'blocksPerDay': subsidy.BLOCKS_PER_DAY,
+        'anchorDays': subsidy.ANCHOR_DAYS.tolist(),
+        'anchorHeights': subsidy.ANCHOR_HEIGHTS.tolist(),
+        'epochStartIssuance': (subsidy.EPOCH_START_ISSUANCE_SAT / subsidy.SATOSHIS_PER_BTC).tolist(),
+    }
 
-            // Graphique 3: Revenus Cumulés (M€)
-            const cumulativeCtx = document.getElementById('cumulativeChart').getContext('2d');
-            cumulativeChart = new Chart(cumulativeCtx, {{
-                type: 'line',
-                data: {{
-                    labels: simulationData.map(d => d.year.toString()),
-                    datasets: [{{
-                        label: 'Revenus Cumulés (M€)',
-                        data: simulationData.map(d => d.cumulativeEur),
-                        borderColor: '#10b981',
-                        backgroundColor: 'rgba(16, 185, 129, 0.2)',
-                        fill: true,
-                        tension: 0.1
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    scales: {{
-                        y: {{ beginAtZero: true, title: {{ display: true, text: 'Revenus Cumulés (M€)' }} }},
-                        x: {{ title: {{ display: true, text: 'Année' }} }}
-                    }},
-                    //plugins: {{ title: {{ display: true, text: 'Projection des Revenus Cumulés' }} }}
-                }}
-            }});
+def page_data(data, compact=True, cutoff=None):
+    """Données de la page (SIMULATEUR_DATA) et bundle d'historique (SIMULATEUR_HISTORY) des jours antérieurs à cutoff."""
+    current = {'subsidy': subsidy_tables(), 'series': {}}
+    history = {'series': {}}
+    for name, source, key in PAGE_SERIES:
+        records = data[source]
+        if not compact:
+            current['series'][name] = {'key': key, 'records': records, 'levels': encode_levels(records)}
+            continue
+        # Dates ISO : l'ordre lexicographique est l'ordre chronologique
+        old = [r for r in records if cutoff and r['date'] < cutoff]
+        new = [r for r in records if not (cutoff and r['date'] < cutoff)]
+        current['series'][name] = {'key': key, 'chunks': [encode_series(new)] if new else []}
+        if old:
+            history['series'][name] = {'chunks': [encode_series(old)], 'levels': encode_levels(old)}
+        else:
+            current['series'][name]['levels'] = encode_levels(new)
+    return current, history
+
+def render_page(styles, scripts):
+    """Assemble web/index.html avec les balises de style et de scripts."""
+    page = read_web_file('index.html')
+    return page.replace('    <!-- @styles -->\n', styles).replace('    <!-- @scripts -->\n', scripts)
+
+@profiling.span('render_html')
+def inline_page(current):
+    """Page autonome : CSS, données et scripts embarqués dans le HTML."""
+    def block(tag, content):
+        return f"    <{tag}>\n{textwrap.indent(content, ' ' * 8)}    </{tag.split()[0]}>\n"
+    styles = block('style', read_web_file('style.css'))
+    scripts = (block('script', f"window.SIMULATEUR_DATA = {json.dumps(current)};\n")
+               + block('script id="simulation-engine"', read_web_file('engine.js'))
+               + block('script', read_web_file('app.js')))
+    return render_page(styles, scripts)
+
+def write_compressed(filename, content):
+    """Écrit un fichier et ses variantes précompressées .gz et .br (si le module brotli est installé)."""
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    raw = content.encode('utf-8')
+    with profiling.span(f'write:{os.path.basename(filename)}', size=len(raw)):
+        with open(filename, 'wb') as f:
+            f.write(raw)
+    with profiling.span('compress:gzip', size=len(raw)), open(filename + '.gz', 'wb') as f:
+        f.write(gzip.compress(raw, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with profiling.span('compress:brotli', size=len(raw)), open(filename + '.br', 'wb') as f:
+            f.write(brotli.compress(raw))
+
+def write_asset(output_dir, folder, name, extension, content):
+    """Écrit folder/name.<empreinte>extension, nommé par le contenu ; retourne son chemin relatif."""
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:ASSET_HASH_LENGTH]
+    path = f"{folder}/{name}.{digest}{extension}"
+    write_compressed(os.path.join(output_dir, path), content)
+    return path
+
+@profiling.span('generate_html')
+def generate_html(compact=True):
+    """Génère le fichier HTML avec mises à jour en temps réel via API."""
+    data = acquire_data()
+    with profiling.span('page_data'):
+        current, _ = page_data(data, compact)
+    html_content = inline_page(current)
 
-            // Graphique Hashrate Historique
-            if (hashData.length > 0) {{
-                if (hashChart) hashChart.destroy();
-                const hashCtx = document.getElementById('hashChart').getContext('2d');
-                hashChart = new Chart(hashCtx, {{
-                    type: 'line',
-                    data: {{
-                        labels: hashData.map(d => d.date),
-                        datasets: [{{
-                            label: 'Hashrate (EH/s)',
-                            data: hashData.map(d => d.ehs),
-                            borderColor: '#ff6384',
-                            backgroundColor: 'rgba(255, 99, 132, 0.2)',
-                            fill: true,
-                            tension: 0.1
-                        }}]
-                    }},
-                    options: {{
-                        responsive: true,
-                        scales: {{
-                            x: {{
-                                type: 'time',
-                                time: {{
-                                    parser: 'yyyy-MM-dd',
-                                    unit: 'month'
-                                }},
-                                title: {{ display: true, text: 'Date' }}
-                            }},
-                            y: {{ title: {{ display: true, text: 'EH/s' }} }}
-                        }},
-                        //plugins: {{ title: {{ display: true, text: 'Hashrate Historique (Backtest)' }} }}
-                    }}
-                }});
-            }}
+    with profiling.span('write:index.html', size=len(html_content)), open('index.html', 'w', encoding='utf-8') as f:
+        f.write(html_content)
 
-            // Graphique Puissance du Site
-            if (!projection && powerData.length > 0) {{
-                if (powerChart) powerChart.destroy();
-                const powerCtx = document.getElementById('powerChart').getContext('2d');
-                powerChart = new Chart(powerCtx, {{
-                    type: 'line',
-                    data: {{
-                        labels: powerData.map(d => d.date),
-                        datasets: [{{
-                            label: 'Puissance (MW)',
-                            data: powerData.map(d => d.mw),
-                            borderColor: '#36a2eb',
-                            backgroundColor: 'rgba(54, 162, 235, 0.2)',
-                            fill: true,
-                            tension: 0.1
-                        }}]
-                    }},
-                    options: {{
-                        responsive: true,
-                        scales: {{
-                            x: {{
-                                type: 'time',
-                                time: {{
-                                    parser: 'yyyy-MM-dd',
-                                    unit: 'month'
-                                }},
-                                title: {{ display: true, text: 'Date' }}
-                            }},
-                            y: {{ title: {{ display: true, text: 'MW' }} }}
-                        }},
-                        //plugins: {{ title: {{ display: true, text: 'Puissance Minable du Site (MW)' }} }}
-                    }}
-                }});
-            }}
-        }}
+    print("Fichier index.html généré")
 
-        // Initialisation
-        updateSimulation();
+@profiling.span('build_site')
+def build_site(output_dir=BUILD_DIR):
+    """Génère le site en fichiers statiques : CSS, JS et données nommés par empreinte, index.html et variantes compressées.
 
-    </script>
-</body>
-</html>
+    Les jours antérieurs au mois en cours vont dans un bundle d'historique qui ne change qu'une fois par mois :
+    un visiteur qui revient ne télécharge chaque jour que index.html et le petit bundle des données récentes.
     """
-
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
-
-    print("Fichier index.html généré")
+    data = acquire_data()
+    last_date = max(r['date'] for r in data['hash_sample'] + data['price_sample'])
+    with profiling.span('page_data'):
+        current, history = page_data(data, compact=True, cutoff=last_date[:8] + '01')
+
+    # Les anciennes versions des fichiers nommés par empreinte sont remplacées
+    for folder in ('assets', 'data'):
+        shutil.rmtree(os.path.join(output_dir, folder), ignore_errors=True)
+    style = write_asset(output_dir, 'assets', 'style', '.css', read_web_file('style.css'))
+    history_js = write_asset(output_dir, 'data', 'history', '.js', f"window.SIMULATEUR_HISTORY = {json.dumps(history)};\n")
+    current_js = write_asset(output_dir, 'data', 'current', '.js', f"window.SIMULATEUR_DATA = {json.dumps(current)};\n")
+    engine_js = write_asset(output_dir, 'assets', 'engine', '.js', read_web_file('engine.js'))
+    app_js = write_asset(output_dir, 'assets', 'app', '.js', read_web_file('app.js'))
+
+    styles = f'    <link rel="stylesheet" href="{style}">\n'
+    scripts = (f'    <script src="{history_js}"></script>\n'
+               f'    <script src="{current_js}"></script>\n'
+               f'    <script id="simulation-engine" src="{engine_js}"></script>\n'
+               f'    <script src="{app_js}"></script>\n')
+    write_compressed(os.path.join(output_dir, 'index.html'), render_page(styles, scripts))
+    if os.path.exists('CNAME'):
+        shutil.copy('CNAME', output_dir)
+
+    for path in ('index.html', style, history_js, current_js, engine_js, app_js):
+        size = os.path.getsize(os.path.join(output_dir, path))
+        gz_size = os.path.getsize(os.path.join(output_dir, path + '.gz'))
+        print(f"{path:<40}{size:>10} octets{gz_size:>10} octets (gzip)")
+    print(f"Site généré dans {output_dir}/")
 
 if __name__ == "__main__":
-    generate_html()
+    if '--offline' in sys.argv:
+        api_cache.set_offline()
+    if '--profile' in sys.argv:
+        profiling.enable()
+    if '--build' in sys.argv:
+        build_site()
+    else:
+        generate_html()
+    scheduler.dump_metrics()
+    profiling.report()
     
\ No newline at end of file
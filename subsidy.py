@@ -0,0 +1,57 @@
+from datetime import date
+
+import numpy as np
+
+HALVING_INTERVAL = 210_000
+SATOSHIS_PER_BTC = 100_000_000
+EPOCHS = 64  # La subvention est nulle à partir de l'époque 33
+# Subvention par bloc (satoshis) et émission cumulée au début de chaque époque, précalculées
+EPOCH_SUBSIDY_SAT = np.array([(50 * SATOSHIS_PER_BTC) >> e for e in range(EPOCHS)], dtype=np.int64)
+EPOCH_START_ISSUANCE_SAT = np.concatenate(([0], np.cumsum(EPOCH_SUBSIDY_SAT * HALVING_INTERVAL)))
+
+GENESIS = date(2009, 1, 3)
+# (date, hauteur) observées : genèse, halvings, puis dernière hauteur connue ; 144 blocs/jour au-delà
+HEIGHT_ANCHORS = (
+    (date(2009, 1, 3), 0),
+    (date(2012, 11, 28), 210_000),
+    (date(2016, 7, 9), 420_000),
+    (date(2020, 5, 11), 630_000),
+    (date(2024, 4, 20), 840_000),
+    (date(2025, 9, 29), 916_944),
+)
+BLOCKS_PER_DAY = 144
+ANCHOR_DAYS = np.array([(d - GENESIS).days for d, _ in HEIGHT_ANCHORS], dtype=float)
+ANCHOR_HEIGHTS = np.array([h for _, h in HEIGHT_ANCHORS], dtype=float)
+
+def _epoch(height):
+    return np.clip(np.floor_divide(height, HALVING_INTERVAL), 0, EPOCHS).astype(np.int64)
+
+def block_subsidy(height):
+    """Subvention (BTC) du bloc height ; accepte un scalaire ou un tableau."""
+    epoch = _epoch(np.asarray(height))
+    subsidy = np.append(EPOCH_SUBSIDY_SAT, 0)[epoch]
+    return subsidy / SATOSHIS_PER_BTC
+
+def cumulative_subsidy_sat(height):
+    """BTC émis (satoshis) par les blocs 0 à height - 1, en O(1) ; exact pour des hauteurs entières."""
+    height = np.asarray(height)
+    epoch = _epoch(height)
+    offset = height - epoch * HALVING_INTERVAL
+    return EPOCH_START_ISSUANCE_SAT[epoch] + offset * np.append(EPOCH_SUBSIDY_SAT, 0)[epoch]
+
+def mined_btc(start_block, end_block):
+    """BTC émis entre start_block (inclus) et end_block (exclu), pour des scalaires ou des tableaux de plages."""
+    return (cumulative_subsidy_sat(end_block) - cumulative_subsidy_sat(start_block)) / SATOSHIS_PER_BTC
+
+def expected_height(days):
+    """Hauteur de bloc attendue au début de chaque jour (jours depuis la genèse), interpolée entre les ancres."""
+    days = np.asarray(days, dtype=float)
+    heights = np.interp(days, ANCHOR_DAYS, ANCHOR_HEIGHTS)
+    after = days > ANCHOR_DAYS[-1]
+    return np.where(after, ANCHOR_HEIGHTS[-1] + (days - ANCHOR_DAYS[-1]) * BLOCKS_PER_DAY, heights)
+
+def daily_issuance(days):
+    """Nombre de blocs attendus et subvention émise (BTC) pour chaque jour depuis la genèse."""
+    days = np.asarray(days, dtype=float)
+    start, end = expected_height(days), expected_height(days + 1)
+    return end - start, mined_btc(start, end)
@@ -0,0 +1,72 @@
+import numpy as np
+
+import engine
+import subsidy
+
+SWEEP_AXES = ('efficiency', 'electricity_cost', 'exponent', 'growth', 'fees')
+
+def sweep(power, hashrate, price, efficiency=(18,), electricity_cost=(0.0,), exponent=(5.6,),
+          growth=(30,), fees=(0.022,), initial_investment=0.0, projection=False, start=None, end=None):
+    """Évalue la grille cartésienne des sliders en une passe vectorisée sur les séries journalières.
+
+    Retourne un dict avec les axes de la grille, le cube des revenus nets cumulés (€) de forme
+    (efficacité, coût électricité, exposant, croissance, frais) et le coût d'électricité (€/kWh)
+    d'équilibre pour chaque combinaison des autres paramètres.
+    """
+    axes = {
+        'efficiency': np.atleast_1d(np.asarray(efficiency, dtype=float)),
+        'electricity_cost': np.atleast_1d(np.asarray(electricity_cost, dtype=float)),
+        'exponent': np.atleast_1d(np.asarray(exponent, dtype=float)),
+        'growth': np.atleast_1d(np.asarray(growth, dtype=float)),
+        'fees': np.atleast_1d(np.asarray(fees, dtype=float)),
+    }
+    power = engine.to_series(power)
+    hashrate = engine.to_series(hashrate)
+    price = engine.to_series(price)
+    dates = engine.simulation_dates(power, hashrate, projection, start, end)
+    years = dates.year.to_numpy()
+
+    # Physique du site, indépendante des coûts et des prix : calculée une seule fois.
+    # Hash share par EH/s installé et par J/TH : mw / (efficacité * hashrate global)
+    mw, base_hash, _ = engine.daily_inputs(power, hashrate, price, dates, growth=0, projection=projection)
+    share_per_efficiency = mw / base_hash
+    blocks, issued = subsidy.daily_issuance(engine.days_since_genesis(dates))
+    energy_kwh = mw.sum() * 1000 * 24
+
+    # Prix (exposant, jour) : historique si disponible, sinon loi de puissance
+    law_price = engine.power_law_price(engine.days_since_genesis(dates)[None, :], axes['exponent'][:, None])
+    if projection:
+        prices = law_price
+    else:
+        history = price.reindex(dates).to_numpy()[None, :]
+        prices = np.where(np.isnan(history), law_price, history)
+
+    # Agrégation par année : la croissance du hashrate ne dépend que de l'année
+    sim_years, year_index = np.unique(years, return_inverse=True)
+    by_year = np.zeros((len(dates), len(sim_years)))
+    by_year[np.arange(len(dates)), year_index] = 1.0
+    subsidy_revenue = (prices * (share_per_efficiency * issued)) @ by_year  # (exposant, année)
+    fee_revenue = (prices * (share_per_efficiency * blocks)) @ by_year  # (exposant, année) par BTC de frais
+
+    if projection:
+        dilution = (1 + axes['growth'][:, None] / 100) ** -(sim_years[None, :] - 2025.0)
+    else:
+        dilution = np.ones((len(axes['growth']), len(sim_years)))
+    subsidy_revenue = subsidy_revenue @ dilution.T  # (exposant, croissance)
+    fee_revenue = fee_revenue @ dilution.T
+
+    # Revenu brut (efficacité, exposant, croissance, frais)
+    gross = (subsidy_revenue[None, :, :, None]
+             + fee_revenue[None, :, :, None] * axes['fees'][None, None, None, :]) \
+        / axes['efficiency'][:, None, None, None]
+    net_before_cost = gross - initial_investment
+    cumulative = net_before_cost[:, None] - (axes['electricity_cost'] * energy_kwh)[None, :, None, None, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        break_even = net_before_cost / energy_kwh
+
+    return {
+        'axes': axes,
+        'dims': SWEEP_AXES,
+        'cumulative_eur': cumulative,
+        'break_even_electricity_cost': break_even,
+    }
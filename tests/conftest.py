@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules du dépôt importables depuis les tests, quel que soit le répertoire de lancement
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,51 @@
+import queue
+from datetime import date
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('tvDatafeed')
+import simulateur
+
+
+class FakeTvDatafeed:
+    """Barres journalières horodatées à 01:00, valeur déterministe par jour ; mémorise les n_bars demandés."""
+
+    requests = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_hist(self, symbol, exchange, interval, n_bars):
+        FakeTvDatafeed.requests.append(n_bars)
+        end = pd.Timestamp(date.today()) + pd.Timedelta(hours=1)
+        index = pd.date_range(end=end, periods=n_bars, freq='D', name='datetime')
+        return pd.DataFrame({'close': (index.dayofyear + 1000 * index.year).to_numpy(dtype=float)}, index=index)
+
+
+@pytest.fixture
+def fake_tradingview(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(simulateur, 'TvDatafeed', FakeTvDatafeed)
+    monkeypatch.setattr(simulateur, '_tv_sessions', queue.LifoQueue())
+    FakeTvDatafeed.requests = []
+    return FakeTvDatafeed
+
+
+def test_non_midnight_bars_are_aligned_on_days(fake_tradingview):
+    df = simulateur.fetch_daily_history('HRATE', 'BCHAIN', 'EH/s', 30)
+    assert len(df) == 30
+    assert not df['EH/s'].isna().any()
+    assert df['date'].iloc[-1] == date.today()
+
+
+def test_non_midnight_bars_refresh_incrementally(fake_tradingview):
+    simulateur.update_history_csv('HRATE', 'BCHAIN', 'history.csv', 'EH/s')
+    assert fake_tradingview.requests == [simulateur.HISTORY_MAX_BARS]
+
+    # Trois derniers jours retirés : seuls ces jours, la dernière ligne sur disque et le recouvrement sont demandés
+    history = pd.read_csv('history.csv')
+    history.iloc[:-3].to_csv('history.csv', index=False)
+    simulateur.update_history_csv('HRATE', 'BCHAIN', 'history.csv', 'EH/s')
+    assert fake_tradingview.requests[1:] == [4 + simulateur.HISTORY_OVERLAP_DAYS]
+    assert pd.read_csv('history.csv').equals(history)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from subsidy import (EPOCH_START_ISSUANCE_SAT, EPOCHS, HALVING_INTERVAL, SATOSHIS_PER_BTC, block_subsidy,
+                     cumulative_subsidy_sat, mined_btc)
+
+
+def reference_subsidy_sat(height):
+    """Subvention d'un bloc selon la règle du consensus : 50 BTC divisés par deux tous les 210 000 blocs."""
+    halvings = height // HALVING_INTERVAL
+    return 0 if halvings >= 64 else (50 * SATOSHIS_PER_BTC) >> halvings
+
+
+def test_block_subsidy_at_genesis_and_first_halving():
+    assert block_subsidy(0) == 50
+    assert block_subsidy(HALVING_INTERVAL - 1) == 50
+    assert block_subsidy(HALVING_INTERVAL) == 25
+    assert block_subsidy(4 * HALVING_INTERVAL) == 3.125
+    assert block_subsidy(EPOCHS * HALVING_INTERVAL) == 0
+
+
+def test_cumulative_subsidy_at_epoch_boundaries():
+    assert cumulative_subsidy_sat(0) == 0
+    assert cumulative_subsidy_sat(HALVING_INTERVAL) == 1_050_000_000_000_000
+    for epoch in range(EPOCHS + 1):
+        assert cumulative_subsidy_sat(epoch * HALVING_INTERVAL) == EPOCH_START_ISSUANCE_SAT[epoch]
+
+
+def test_total_supply_below_21_million():
+    total = cumulative_subsidy_sat(EPOCHS * HALVING_INTERVAL)
+    assert total == 2_099_999_997_690_000
+    assert total < 21_000_000 * SATOSHIS_PER_BTC
+    # Plus aucune émission après la dernière époque
+    assert cumulative_subsidy_sat(100 * HALVING_INTERVAL) == total
+
+
+@pytest.mark.parametrize('start, end', [
+    (HALVING_INTERVAL - 10, HALVING_INTERVAL + 10),
+    (2 * HALVING_INTERVAL - 1, 2 * HALVING_INTERVAL + 1),
+    (HALVING_INTERVAL - 500, 3 * HALVING_INTERVAL + 500),
+    (33 * HALVING_INTERVAL - 5, 34 * HALVING_INTERVAL + 5),
+    (123_456, 123_456),
+])
+def test_mined_btc_matches_per_block_sum(start, end):
+    expected = sum(reference_subsidy_sat(h) for h in range(start, end))
+    assert cumulative_subsidy_sat(end) - cumulative_subsidy_sat(start) == expected
+    assert mined_btc(start, end) == expected / SATOSHIS_PER_BTC
+
+
+def test_mined_btc_on_arrays_of_ranges():
+    start = np.array([0, HALVING_INTERVAL - 3, 4 * HALVING_INTERVAL - 7])
+    end = np.array([5, HALVING_INTERVAL + 3, 4 * HALVING_INTERVAL + 7])
+    expected = [sum(reference_subsidy_sat(h) for h in range(a, b)) / SATOSHIS_PER_BTC for a, b in zip(start, end)]
+    assert mined_btc(start, end).tolist() == expected
@@ -0,0 +1,891 @@
+function updateRangeInput(val) {
+  document.getElementById('investmentSlider').value=val; 
+  document.getElementById('investmentValue').innerHTML=val;
+}
+var coll = document.getElementsByClassName("collapsible");
+var i;
+
+for (i = 0; i < coll.length; i++) {
+coll[i].addEventListener("click", function() {
+    this.classList.toggle("active");
+    var content = this.nextElementSibling;
+    if (content.style.display === "block") {
+    content.style.display = "none";
+    } else {
+    content.style.display = "block";
+    }
+});
+}
+
+// État de la page
+let powerAverage = 1000;  // Default MW exploitable du site
+let historicalHash = {};  // year: avg EH/s
+let powerLoaded = false;  // profil de puissance non vide (exemple ou CSV chargé)
+let minPowerDay, maxPowerDay;  // jours depuis 1970 (UTC)
+// Séries alignées sur les jours, construites une fois au chargement des données
+let hashSeries, powerSeries, priceSeries;
+let loadedCsvName = '';
+
+let priceChart, revenueChart, cumulativeChart, hashChart, powerChart;
+
+function decodeBase64(text) {
+    const binary = atob(text);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    return bytes.buffer;
+}
+
+// Séries embarquées en Float32 base64 (une date de début, pas journalier), décodées au chargement
+function decodeSeries(packed) {
+    return {start: packed.start, stride: packed.stride, values: new Float32Array(decodeBase64(packed.values))};
+}
+
+// Niveaux de détail LTTB précalculés en Python (du plus grossier au plus fin) : jours depuis 1970 et valeurs
+function decodeLevels(packed) {
+    const start = Math.floor(Date.parse(packed.start) / MS_PER_DAY);
+    return packed.levels.map(level => {
+        const offsets = new Uint16Array(decodeBase64(level.days));
+        const days = new Int32Array(offsets.length);
+        for (let i = 0; i < days.length; i++) days[i] = start + offsets[i];
+        return {days: days, values: new Float32Array(decodeBase64(level.values))};
+    });
+}
+
+function dateToDay(dateStr) {
+    return Math.floor(Date.parse(dateStr) / MS_PER_DAY);
+}
+
+function dayToIsoString(day) {
+    return new Date(day * MS_PER_DAY).toISOString().slice(0, 10);
+}
+
+// Série alignée : values[day - start] pour le jour day, NaN si le jour est absent
+function seriesFromRecords(records, key) {
+    let minDay = Infinity, maxDay = -Infinity;
+    const days = new Float64Array(records.length);
+    for (let i = 0; i < records.length; i++) {
+        const day = dateToDay(records[i].date);
+        days[i] = day;
+        if (day < minDay) minDay = day;
+        if (day > maxDay) maxDay = day;
+    }
+    if (minDay === Infinity) return {start: 0, values: new Float64Array(0)};
+    const values = new Float64Array(maxDay - minDay + 1).fill(NaN);
+    // Parcours à rebours : la première occurrence d'une date l'emporte
+    for (let i = records.length - 1; i >= 0; i--) {
+        if (!isNaN(days[i])) values[days[i] - minDay] = records[i][key];
+    }
+    return {start: minDay, values: values};
+}
+
+// Série alignée à partir des morceaux Float32 : une date de début par morceau, aucun enregistrement intermédiaire
+function seriesFromChunks(chunks) {
+    const decoded = chunks.map(chunk => {
+        const series = decodeSeries(chunk);
+        return {start: dateToDay(series.start), stride: series.stride, values: series.values};
+    });
+    let minDay = Infinity, maxDay = -Infinity;
+    decoded.forEach(chunk => {
+        if (chunk.values.length === 0) return;
+        minDay = Math.min(minDay, chunk.start);
+        maxDay = Math.max(maxDay, chunk.start + (chunk.values.length - 1) * chunk.stride);
+    });
+    if (minDay === Infinity) return {start: 0, values: new Float64Array(0)};
+    const values = new Float64Array(maxDay - minDay + 1).fill(NaN);
+    // Morceaux et valeurs parcourus à rebours : la première occurrence d'un jour l'emporte
+    for (let c = decoded.length - 1; c >= 0; c--) {
+        const chunk = decoded[c];
+        const offset = chunk.start - minDay;
+        for (let i = chunk.values.length - 1; i >= 0; i--) {
+            if (!isNaN(chunk.values[i])) values[offset + i * chunk.stride] = chunk.values[i];
+        }
+    }
+    return {start: minDay, values: values};
+}
+
+// Série complète sous forme de niveau de détail (jours présents uniquement)
+function levelFromSeries(series) {
+    let count = 0;
+    for (let i = 0; i < series.values.length; i++) if (!isNaN(series.values[i])) count++;
+    const days = new Int32Array(count);
+    const values = new Float64Array(count);
+    for (let i = 0, k = 0; i < series.values.length; i++) {
+        if (isNaN(series.values[i])) continue;
+        days[k] = series.start + i;
+        values[k++] = series.values[i];
+    }
+    return {days: days, values: values};
+}
+
+// Niveaux précalculés complétés par les jours plus récents que leur dernier point, puis la série complète
+function chartLevels(levels, series) {
+    const full = levelFromSeries(series);
+    return (levels || []).map(level => {
+        const lastDay = level.days.length > 0 ? level.days[level.days.length - 1] : -Infinity;
+        const from = lowerBound(full.days, lastDay + 1);
+        if (from === full.days.length) return level;
+        const days = new Int32Array(level.days.length + full.days.length - from);
+        const values = new Float64Array(days.length);
+        days.set(level.days);
+        days.set(full.days.subarray(from), level.days.length);
+        values.set(level.values);
+        values.set(full.values.subarray(from), level.values.length);
+        return {days: days, values: values};
+    }).concat([full]);
+}
+
+function lowerBound(days, day) {
+    let lo = 0, hi = days.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (days[mid] < day) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+// Niveau le plus grossier offrant au moins un point par pixel sur [firstDay, lastDay]
+function levelView(levels, firstDay, lastDay, pixels) {
+    for (let k = 0; k < levels.length; k++) {
+        const a = lowerBound(levels[k].days, firstDay);
+        const b = lowerBound(levels[k].days, lastDay + 1);
+        if (b - a >= pixels || k === levels.length - 1) {
+            return {key: k + '|' + a + '|' + b, level: levels[k], a: a, b: b};
+        }
+    }
+}
+
+// Remplace les points d'un graphique temporel uniquement si la vue (niveau, fenêtre) a changé
+function setChartView(chart, levels, firstDay, lastDay) {
+    const view = levelView(levels, firstDay, lastDay, chart.width || 800);
+    if (chart.viewLevels === levels && chart.viewKey === view.key) return;
+    chart.viewLevels = levels;
+    chart.viewKey = view.key;
+    const points = new Array(view.b - view.a);
+    for (let i = view.a; i < view.b; i++) {
+        points[i - view.a] = {x: view.level.days[i] * MS_PER_DAY, y: view.level.values[i]};
+    }
+    chart.data.labels = [];
+    chart.data.datasets[0].data = points;
+    chart.update('none');
+}
+
+
+// Données de la page (SIMULATEUR_DATA), éventuellement précédées d'un bundle d'historique (SIMULATEUR_HISTORY)
+// qui ne change qu'une fois par mois : chaque série est une liste de morceaux compacts ou une liste JSON.
+function pageSeries(name) {
+    const current = SIMULATEUR_DATA.series[name];
+    const history = (window.SIMULATEUR_HISTORY && SIMULATEUR_HISTORY.series[name]) || {chunks: [], levels: null};
+    return {
+        key: current.key,
+        records: current.records,
+        chunks: history.chunks.concat(current.chunks || []),
+        levels: history.levels || current.levels
+    };
+}
+
+function loadSeries(name) {
+    const series = pageSeries(name);
+    return series.records ? seriesFromRecords(series.records, series.key) : seriesFromChunks(series.chunks);
+}
+
+function loadLevels(name) {
+    const levels = pageSeries(name).levels;
+    return levels ? decodeLevels(levels) : [];
+}
+
+const hashSample = loadSeries('hash');
+const powerSample = loadSeries('power');
+const hashSampleLevels = loadLevels('hash');
+const powerSampleLevels = loadLevels('power');
+const priceLevels = loadLevels('price');
+// Niveaux affichés par les graphiques : niveaux précalculés puis série complète
+let hashChartLevels, powerChartLevels, priceChartLevels;
+
+function parseHashData(series, levels) {
+    hashSeries = series;
+    hashChartLevels = chartLevels(levels, hashSeries);
+    let tempHash = {};
+    let year = new Date(hashSeries.start * MS_PER_DAY).getUTCFullYear();
+    let nextYearDay = Date.UTC(year + 1, 0, 1) / MS_PER_DAY;
+    for (let i = 0; i < hashSeries.values.length; i++) {
+        if (hashSeries.start + i >= nextYearDay) {
+            year++;
+            nextYearDay = Date.UTC(year + 1, 0, 1) / MS_PER_DAY;
+        }
+        const value = hashSeries.values[i];
+        if (isNaN(value)) continue;
+        if (!tempHash[year]) {
+            tempHash[year] = {sum: 0, count: 0};
+        }
+        tempHash[year].sum += value;
+        tempHash[year].count++;
+    }
+    historicalHash = {};
+    for (let y in tempHash) {
+        historicalHash[y] = tempHash[y].sum / tempHash[y].count;
+    }
+    console.log('Historical hash yearly:', historicalHash);
+    console.log('Historical hash daily:', hashSeries.values.length, 'jours');
+}
+
+function parsePowerData(series, levels) {
+    let sum = 0, count = 0;
+    for (let i = 0; i < series.values.length; i++) {
+        if (isNaN(series.values[i])) continue;
+        sum += series.values[i];
+        count++;
+    }
+    powerAverage = count > 0 ? sum / count : 1000;
+    powerLoaded = count > 0;
+    powerSeries = powerLoaded ? series : powerSample;
+    powerChartLevels = chartLevels(levels, powerSeries);
+    minPowerDay = powerSeries.start;
+    maxPowerDay = seriesEnd(powerSeries);
+    console.log('Min Power Date: ', dayToIsoString(minPowerDay));
+    console.log('Max Power Date: ', dayToIsoString(maxPowerDay));
+    console.log('MW minage journalier moyen du site:', powerAverage);
+}
+
+function initializeDateSliders() {
+    const diffDays = maxPowerDay - minPowerDay + 1;
+    const startSlider = document.getElementById('startDateSlider');
+    const endSlider = document.getElementById('endDateSlider');
+    startSlider.max = diffDays - 1;
+    endSlider.max = diffDays - 1;
+    startSlider.min = 0;
+    endSlider.min = 0;
+    startSlider.value = 0;
+    endSlider.value = diffDays - 1;
+    updateStartDateValue();
+    updateEndDateValue();
+}
+
+// Load samples automatically
+parseHashData(hashSample, hashSampleLevels);
+parsePowerData(powerSample, powerSampleLevels);
+initializeDateSliders();
+
+// Prix historiques alignés sur les jours
+priceSeries = loadSeries('price');
+priceChartLevels = chartLevels(priceLevels, priceSeries);
+
+function updateStartDateValue() {
+    const sliderVal = parseInt(document.getElementById('startDateSlider').value);
+    document.getElementById('startDateValue').textContent = dayToIsoString(minPowerDay + sliderVal);
+}
+
+function updateEndDateValue() {
+    const sliderVal = parseInt(document.getElementById('endDateSlider').value);
+    document.getElementById('endDateValue').textContent = dayToIsoString(minPowerDay + sliderVal);
+}
+
+// Modèle calculé dans un Web Worker ; repli sur le thread principal si les workers sont indisponibles
+let simulationWorker = null;
+try {
+    // Script externe (site construit) ou embarqué (page unique, via une URL Blob)
+    const engineScript = document.getElementById('simulation-engine');
+    simulationWorker = new Worker(engineScript.src ||
+        URL.createObjectURL(new Blob([engineScript.textContent], {type: 'text/javascript'})));
+    simulationWorker.onmessage = e => handleModel(e.data.model);
+    simulationWorker.onerror = function(e) {
+        console.log('Worker de simulation indisponible, calcul sur la page:', e.message);
+        simulationWorker = null;
+        modelRequested = false;
+        dispatchSimulation();
+    };
+} catch (e) {
+    simulationWorker = null;
+}
+let dataVersion = 0;  // invalide le modèle à chaque changement de données
+
+function sendEngineData() {
+    const data = {hashSeries: hashSeries, powerSeries: powerSeries, priceSeries: priceSeries,
+                  historicalHash: historicalHash, powerAverage: powerAverage, subsidy: SIMULATEUR_DATA.subsidy};
+    Object.assign(engineData, data);
+    dataVersion++;
+    if (simulationWorker) simulationWorker.postMessage({type: 'data', data: data});
+}
+
+const ISO_TIMESTAMP = /^(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ](\d{1,2}):(\d{2})(?::(\d{2}))?)?/;
+const FRENCH_TIMESTAMP = /^(\d{1,2})\/(\d{1,2})\/(\d{4})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?/;
+
+// Horodatage d'un export (ISO ou jj/mm/aaaa, heure facultative) en ms, à l'heure écrite ; NaN si illisible
+function parseTimestamp(dateStr) {
+    let match = ISO_TIMESTAMP.exec(dateStr), year, month, day;
+    if (match) {
+        [year, month, day] = [+match[1], +match[2], +match[3]];
+    } else if ((match = FRENCH_TIMESTAMP.exec(dateStr))) {
+        [year, month, day] = [+match[3], +match[2], +match[1]];
+    } else {
+        return Date.parse(dateStr);
+    }
+    if (month < 1 || month > 12 || day < 1 || day > 31) return NaN;
+    return Date.UTC(year, month - 1, day, +(match[4] || 0), +(match[5] || 0), +(match[6] || 0));
+}
+
+// Agrégation journalière en flux : un export minute de plusieurs Go n'est jamais chargé en entier
+function createDailyAggregator() {
+    const days = new Map();  // jour depuis 1970 → [somme, effectif]
+    let rows = 0, invalid = 0, header = true;
+    function addLine(line) {
+        if (header) { header = false; return; }
+        if (line.trim() === '') return;
+        rows++;
+        const comma = line.indexOf(',');
+        const mw = comma < 0 ? NaN : parseFloat(line.slice(comma + 1));
+        const ms = parseTimestamp(line.slice(0, comma).trim());
+        if (isNaN(mw) || isNaN(ms)) { invalid++; return; }
+        const day = Math.floor(ms / MS_PER_DAY);
+        const total = days.get(day);
+        if (total) { total[0] += mw; total[1]++; } else days.set(day, [mw, 1]);
+    }
+    return {
+        addLine: addLine,
+        result: function() {
+            const records = [];
+            days.forEach((total, day) => records.push({date: dayToIsoString(day), mw: total[0] / total[1]}));
+            return {records: records, rows: rows, invalid: invalid};
+        }
+    };
+}
+
+async function readCsvLines(file, onLine) {
+    if (!file.stream || typeof TextDecoderStream === 'undefined') {
+        (await file.text()).split(/\r?\n/).forEach(onLine);
+        return;
+    }
+    const reader = file.stream().pipeThrough(new TextDecoderStream()).getReader();
+    let rest = '';
+    for (;;) {
+        const {done, value} = await reader.read();
+        if (done) break;
+        const lines = (rest + value).split(/\r?\n/);
+        rest = lines.pop();  // ligne incomplète : complétée par le bloc suivant
+        lines.forEach(onLine);
+    }
+    if (rest) onLine(rest);
+}
+
+async function handlePowerCsv(e) {
+    const file = e.target.files[0];
+    if (!file) return;
+    loadedCsvName = file.name.replace(/\.[^/.]+$/, "");
+    document.getElementById('site-name').innerHTML = `Résultats ${loadedCsvName}`;
+    const aggregator = createDailyAggregator();
+    await readCsvLines(file, aggregator.addLine);
+    const result = aggregator.result();
+    console.log(`${loadedCsvName} : ${result.rows} lignes, ${result.records.length} jours, ${result.invalid} lignes ignorées`);
+    parsePowerData(seriesFromRecords(result.records, 'mw'));
+    sendEngineData();
+    initializeDateSliders();
+    const dateCont = document.getElementById('dateRangeContainer');
+    dateCont.style.display = !document.getElementById('projectionMode').checked ? 'block' : 'none';
+    updateSimulation();
+}
+
+// Mise à jour des sliders avec appel dynamique à updateSimulation
+document.getElementById('efficiencySlider').oninput = function() {
+    document.getElementById('efficiencyValue').textContent = this.value;
+    updateSimulation();
+};
+document.getElementById('feesSlider').oninput = function() {
+    document.getElementById('feesValue').textContent = this.value;
+    updateSimulation();
+};
+document.getElementById('electricitySlider').oninput = function() {
+    document.getElementById('electricityValue').textContent = this.value;
+    updateSimulation();
+};
+document.getElementById('numInvestInput').oninput = function() {
+    document.getElementById('numInvestInput').textContent = this.value;
+    document.getElementById('investmentSlider').value = this.value; 
+    document.getElementById('investmentValue').innerHTML = this.value;
+    updateSimulation();
+};
+document.getElementById('investmentSlider').oninput = function() {
+    document.getElementById('investmentValue').textContent = this.value;
+    document.getElementById('numInvestInput').value = this.value;
+    updateSimulation();
+};
+document.getElementById('startDateSlider').oninput = function() {
+    updateStartDateValue();
+    updateSimulation();
+};
+document.getElementById('endDateSlider').oninput = function() {
+    updateEndDateValue();
+    updateSimulation();
+};
+
+document.getElementById('projectionMode').onchange = function() {
+    const checked = this.checked;
+    document.getElementById('exponentSliderContainer').style.display = !checked ? 'none' : 'flex';
+    document.getElementById('growthSliderContainer').style.display = !checked ? 'none' : 'flex';
+    //document.getElementById('daily-results-table').style.display = !checked ? 'block' : 'none';
+    let element = document.getElementById("button-daily");
+    let hidden = element.getAttribute("hidden");
+    if (!checked) {
+    element.removeAttribute("hidden");
+    } else {
+    document.getElementById('daily-results-table').style.display = 'none';
+    element.setAttribute("hidden", "hidden");
+    }
+    const dateCont = document.getElementById('dateRangeContainer');
+    dateCont.style.display = !checked ? 'block' : 'none';
+    updateSimulation();
+};
+
+document.getElementById('exponentSlider').oninput = function() {
+    document.getElementById('exponentValue').textContent = this.value;
+    updateSimulation();
+};
+document.getElementById('growthSlider').oninput = function() {
+    document.getElementById('growthValue').textContent = this.value;
+    updateSimulation();
+};
+
+document.getElementById('powerCsv').addEventListener('change', handlePowerCsv);
+// document.getElementById('hashCsv').addEventListener('change', handleHashCsv);
+// Paramètres lus dans les contrôles au moment du calcul
+function readSimulationParams() {
+    const projection = document.getElementById('projectionMode').checked;
+    // Domaine du modèle et fenêtre simulée (jours depuis 1970, UTC)
+    let domainStart, domainEnd, startDay, endDay;
+    if (!projection) {
+        if (!powerLoaded && hashSeries.values.length === 0) return null;
+        if (powerLoaded) {
+            domainStart = minPowerDay;
+            domainEnd = maxPowerDay;
+            startDay = minPowerDay + parseInt(document.getElementById('startDateSlider').value);
+            endDay = minPowerDay + parseInt(document.getElementById('endDateSlider').value);
+        } else {
+            domainStart = startDay = hashSeries.start + 1;
+            domainEnd = endDay = seriesEnd(hashSeries);
+        }
+    } else {
+        domainStart = startDay = Date.UTC(2026, 0, 1) / MS_PER_DAY;
+        domainEnd = endDay = Date.UTC(2032, 11, 31) / MS_PER_DAY;
+    }
+    const exponent = parseFloat(document.getElementById('exponentSlider').value);
+    const growth = parseFloat(document.getElementById('growthSlider').value);
+    const fees = parseFloat(document.getElementById('feesSlider').value);
+    return {
+        // Seuls ces paramètres imposent de recalculer le modèle journalier
+        modelKey: [dataVersion, projection, domainStart, domainEnd, exponent, projection ? growth : '', fees].join('|'),
+        efficiency: parseInt(document.getElementById('efficiencySlider').value),
+        exponent: exponent,
+        growth: growth,
+        fees: fees,
+        electricityCost: parseFloat(document.getElementById('electricitySlider').value),
+        initialInvestment: parseInt(document.getElementById('investmentSlider').value) * 1000,
+        projection: projection,
+        domainStart: domainStart,
+        domainEnd: domainEnd,
+        startDay: startDay,
+        endDay: endDay
+    };
+}
+
+// Les changements sont regroupés à la frame suivante. Si le modèle courant correspond aux paramètres
+// (efficacité, coût, investissement ou dates modifiés), le rendu est immédiat ; sinon un seul modèle
+// est demandé à la fois et seul celui du dernier état des contrôles est rendu.
+let simulationModel = null;
+let modelRequested = false;
+let frameRequested = false;
+
+function updateSimulation() {
+    if (!frameRequested) {
+        frameRequested = true;
+        requestAnimationFrame(dispatchSimulation);
+    }
+}
+
+function dispatchSimulation() {
+    frameRequested = false;
+    const params = readSimulationParams();
+    if (!params) return;
+    if (simulationModel && simulationModel.key === params.modelKey) {
+        renderSimulation(params, evaluateModel(simulationModel, params));
+        return;
+    }
+    if (modelRequested) return;  // relancée à la réception du modèle en cours
+    modelRequested = true;
+    if (simulationWorker) {
+        simulationWorker.postMessage({type: 'model', params: params});
+    } else {
+        handleModel(buildModel(params));
+    }
+}
+
+function handleModel(model) {
+    modelRequested = false;
+    simulationModel = model;
+    dispatchSimulation();
+}
+
+// Tableau journalier virtualisé : seules les lignes visibles (plus une marge) sont dans le DOM,
+// les autres sont remplacées par deux lignes d'espacement de la bonne hauteur.
+const DAILY_OVERSCAN = 10;
+const DAILY_COLUMNS = ['day', 'priceEur', 'hashPct', 'siteHash', 'globalHash', 'btcMined', 'revenueEur', 'cumulativeEur'];
+let dailyRowHeight = 37;  // px, mesurée au premier rendu
+let dailyView = null;  // fenêtre journalière courante (résultat de evaluateModel)
+let dailyOrder = null;  // permutation des lignes si un tri est actif
+let dailySort = {column: null, descending: false};
+let dailyFrameRequested = false;
+
+function setDailyView(daily) {
+    dailyView = daily;
+    dailyOrder = daily && dailySort.column ? sortDailyRows(daily, dailySort) : null;
+    const foot = document.getElementById('daily-foot');
+    if (!daily) {
+        foot.innerHTML = '';
+    } else {
+        const totals = dailyTotals(daily);
+        foot.innerHTML = `
+            <tr style="font-weight: bold;">
+                <td>Total</td>
+                <td colspan="2"></td>
+                <td>${totals.avgSiteHash.toFixed(2)}</td>
+                <td>${totals.avgGlobalHash.toFixed(2)}</td>
+                <td>${totals.btcMined.toFixed(6)} BTC</td>
+                <td>${Math.round(totals.revenueEur).toLocaleString()} EUR</td>
+                <td>${Math.round(totals.cumulativeEur).toLocaleString()} EUR</td>
+            </tr>
+        `;
+    }
+    renderDailyRows();
+}
+
+// Indices des lignes triées sur une colonne, sans construire de lignes
+function sortDailyRows(daily, sort) {
+    const values = new Float64Array(daily.length);
+    for (let i = 0; i < daily.length; i++) values[i] = dailyRow(daily, i)[sort.column];
+    const order = new Int32Array(daily.length);
+    for (let i = 0; i < daily.length; i++) order[i] = i;
+    const sign = sort.descending ? -1 : 1;
+    return order.sort((a, b) => sign * (values[a] - values[b]) || a - b);
+}
+
+function renderDailyRows() {
+    const body = document.getElementById('daily-body');
+    if (!dailyView) {
+        body.innerHTML = '';
+        return;
+    }
+    const scroll = document.getElementById('daily-scroll');
+    const count = dailyView.length;
+    const first = Math.max(0, Math.floor(scroll.scrollTop / dailyRowHeight) - DAILY_OVERSCAN);
+    const last = Math.min(count, Math.ceil((scroll.scrollTop + scroll.clientHeight) / dailyRowHeight) + DAILY_OVERSCAN);
+    const spacer = rows => `<tr><td colspan="8" style="height: ${rows * dailyRowHeight}px; padding: 0; border: 0;"></td></tr>`;
+    let html = spacer(first);
+    for (let k = first; k < last; k++) {
+        const row = dailyRow(dailyView, dailyOrder ? dailyOrder[k] : k);
+        html += `
+            <tr>
+                <td>${dayToIsoString(row.day)}</td>
+                <td>${Math.round(row.priceEur).toLocaleString()}</td>
+                <td>${row.hashPct.toFixed(3)} %</td>
+                <td>${row.siteHash.toFixed(2)}</td>
+                <td>${row.globalHash.toFixed(2)}</td>
+                <td>${(row.btcMined).toFixed(6)}</td>
+                <td>${Math.round(row.revenueEur).toLocaleString()}</td>
+                <td>${Math.round(row.cumulativeEur).toLocaleString()}</td>
+            </tr>
+        `;
+    }
+    body.innerHTML = html + spacer(count - last);
+    // Hauteur réelle d'une ligne (0 tant que le tableau est replié)
+    const measured = last > first && body.rows ? body.rows[1].getBoundingClientRect().height : 0;
+    if (measured > 0 && Math.abs(measured - dailyRowHeight) > 0.5) {
+        dailyRowHeight = measured;
+        renderDailyRows();
+    }
+}
+
+function requestDailyRows() {
+    if (!dailyFrameRequested) {
+        dailyFrameRequested = true;
+        requestAnimationFrame(() => {
+            dailyFrameRequested = false;
+            renderDailyRows();
+        });
+    }
+}
+
+// Export CSV de toute la fenêtre, dans l'ordre affiché, sans passer par le DOM
+function exportDailyCsv() {
+    if (!dailyView) return;
+    const lines = ['date,prix_btc_eur,hash_site_pct,hash_site_ehs,hash_reseau_ehs,btc_mines,revenus_eur,revenus_cumules_eur'];
+    for (let k = 0; k < dailyView.length; k++) {
+        const row = dailyRow(dailyView, dailyOrder ? dailyOrder[k] : k);
+        lines.push([dayToIsoString(row.day)].concat(DAILY_COLUMNS.slice(1).map(column => row[column])).join(','));
+    }
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(new Blob([lines.join('\n') + '\n'], {type: 'text/csv'}));
+    link.download = `simulation_journaliere${loadedCsvName ? '_' + loadedCsvName : ''}.csv`;
+    link.click();
+    // Révocation différée : certains navigateurs lisent l'URL après le retour de click()
+    setTimeout(() => URL.revokeObjectURL(link.href), 0);
+}
+
+document.getElementById('daily-scroll').addEventListener('scroll', requestDailyRows, {passive: true});
+document.getElementById('button-daily').addEventListener('click', requestDailyRows);
+document.getElementById('daily-export').addEventListener('click', exportDailyCsv);
+document.querySelectorAll('#daily-scroll th').forEach(th => {
+    th.addEventListener('click', function() {
+        const column = this.dataset.column;
+        dailySort = {column: column, descending: dailySort.column === column && !dailySort.descending};
+        document.querySelectorAll('#daily-scroll th').forEach(h => {
+            h.textContent = h.textContent.replace(/ [▲▼]$/, '');
+        });
+        this.textContent += dailySort.descending ? ' ▼' : ' ▲';
+        document.getElementById('daily-scroll').scrollTop = 0;
+        setDailyView(dailyView);
+    });
+});
+
+function renderSimulation(params, result) {
+    const projection = params.projection;
+    const simulationData = result.simulationData;
+    const dailySimulation = result.daily;
+
+    if (!projection && loadedCsvName != '') {
+        document.getElementById('chart1-title').innerHTML = `Puissance de minage site ${loadedCsvName} (MW/jour)`;
+        document.getElementById('chart2-title').innerHTML = `Hashrate historique réseau Bitcoin (EH/s)`;
+        document.getElementById('chart3-title').innerHTML = `Prix historique du Bitcoin (€)`;
+        document.getElementById('chart4-title').innerHTML = `Revenus Annuels Simulés site ${loadedCsvName} (M€)`;
+        document.getElementById('chart5-title').innerHTML = `Revenus Cumulés Simulés site ${loadedCsvName} (M€)`;
+    }
+    if (projection && loadedCsvName != '') {
+        document.getElementById('chart1-title').innerHTML = `Puissance de minage site ${loadedCsvName} (MW/jour)`;
+        document.getElementById('chart2-title').innerHTML = `Hashrate historique Réseau Bitcoin (EH/s)`;
+        document.getElementById('chart3-title').innerHTML = `Prix moyen annualisé & projeté du Bitcoin (€)`;
+        document.getElementById('chart4-title').innerHTML = `Revenus Annuels Projetés site ${loadedCsvName} (M€)`;
+        document.getElementById('chart5-title').innerHTML = `Revenus Cumulés Projetés site ${loadedCsvName} (M€)`;
+    }
+    const effective_MW = powerAverage;
+
+    // Génération du tableau annuel
+    let tableHTML = `
+        <h2>Synthèse Performance (annualisée)</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>Année</th>
+                    <th>Prix BTC (€)</th>
+                    <th>% Hash Site</th>
+                    <th>BTC Minés</th>
+                    <th>Revenus Annuels (M€)</th>
+                    <th>Revenus Cumulés (M€)</th>
+                </tr>
+            </thead>
+            <tbody>
+    `;
+    simulationData.forEach(row => {
+        tableHTML += `
+            <tr>
+                <td>${row.year}</td>
+                <td>${Math.round(row.priceEur).toLocaleString()}</td>
+                <td>${row.hashPct.toFixed(3)} %</td>
+                <td>${Math.round(row.btcMined).toLocaleString()}</td>
+                <td>${Math.round(row.revenueEur).toLocaleString()}</td>
+                <td>${Math.round(row.cumulativeEur).toLocaleString()}</td>
+            </tr>
+        `;
+    });
+    tableHTML += `
+            </tbody>
+            <tfoot>
+                <tr style="font-weight: bold;">
+                    <td>Total</td>
+                    <td colspan="2"></td>
+                    <td>${Math.round(simulationData.reduce((sum, r) => sum + r.btcMined, 0)).toLocaleString()} BTC</td>
+                    <td colspan="2">${Math.round(simulationData[simulationData.length - 1]?.cumulativeEur || 0).toLocaleString()} M€</td>
+                </tr>
+            </tfoot>
+        </table>
+    `;
+
+    let fullHTML = tableHTML;
+
+    // Tableau journalier virtualisé (backtest uniquement)
+    setDailyView(!projection && dailySimulation.length > 0 ? dailySimulation : null);
+
+    document.getElementById('results-table').innerHTML = fullHTML;
+    const powerAverageStr = 'Puissance (MW) minage journalier moyen du site: ' + Math.round(effective_MW).toLocaleString() + 'MW';
+    document.getElementById('average-power').innerHTML = projection ? powerAverageStr : '';
+
+    // Mise à jour des graphiques, créés une seule fois
+    if (!priceChart) createCharts();
+    const years = simulationData.map(d => d.year.toString());
+    // Fenêtre affichée : dates simulées en backtest, séries complètes en projection
+    const firstDay = projection ? -Infinity : params.startDay;
+    const lastDay = projection ? Infinity : params.endDay;
+
+    // Graphique 1: Prix BTC projection/simulation (€)
+    if (projection) {
+        priceChart.options.scales.x.type = 'category';
+        priceChart.viewKey = null;
+        priceChart.data.labels = years;
+        priceChart.data.datasets[0].data = simulationData.map(d => d.priceEur);
+        priceChart.update('none');
+    } else {
+        if (priceChart.options.scales.x.type !== 'time') {
+            priceChart.options.scales.x.type = 'time';
+            priceChart.viewKey = null;
+        }
+        setChartView(priceChart, priceChartLevels, firstDay, lastDay);
+    }
+
+    // Graphique 2: Revenus Annuels (M€)
+    revenueChart.data.labels = years;
+    revenueChart.data.datasets[0].data = simulationData.map(d => d.revenueEur);
+    revenueChart.update('none');
+
+    // Graphique 3: Revenus Cumulés (M€)
+    cumulativeChart.data.labels = years;
+    cumulativeChart.data.datasets[0].data = simulationData.map(d => d.cumulativeEur);
+    cumulativeChart.update('none');
+
+    // Graphique Hashrate Historique
+    if (hashSeries.values.length > 0) {
+        setChartView(hashChart, hashChartLevels, firstDay, lastDay);
+    }
+
+    // Graphique Puissance du Site
+    if (!projection && powerLoaded) {
+        setChartView(powerChart, powerChartLevels, firstDay, lastDay);
+    }
+}
+
+// Axe temporel des séries journalières (points {x: ms, y})
+function timeAxis() {
+    return {type: 'time', time: {unit: 'month'}, title: {display: true, text: 'Date'}};
+}
+
+function createCharts() {
+    // Graphique 1: Prix BTC projection/simulation (€)
+    priceChart = new Chart(document.getElementById('priceChart').getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Prix BTC (€)',
+                data: [],
+                borderColor: '#3b82f6',
+                backgroundColor: 'rgba(59, 130, 246, 0.1)',
+                fill: true,
+                tension: 0.1
+            }]
+        },
+        options: {
+            responsive: true,
+            onResize: updateSimulation,
+            scales: {
+                y: { beginAtZero: false, title: { display: true, text: 'Prix (€)' } },
+                x: { type: 'category', time: { unit: 'month' }, title: { display: true, text: 'Année' } }
+            },
+            //plugins: { title: { display: true, text: 'Projection du Prix du Bitcoin (Loi de Puissance)' } }
+        }
+    });
+
+    // Graphique 2: Revenus Annuels (M€)
+    revenueChart = new Chart(document.getElementById('revenueChart').getContext('2d'), {
+        type: 'bar',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Revenus (M€)',
+                data: [],
+                backgroundColor: ['#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#06b6d4', '#10b981', '#f59e0b', '#ef4444']
+            }]
+        },
+        options: {
+            responsive: true,
+            scales: {
+                y: { beginAtZero: true, title: { display: true, text: 'Revenus (M€)' } },
+                x: { title: { display: true, text: 'Année' } }
+            },
+            //plugins: { title: { display: true, text: 'Revenus Annuels Projetés' } }
+        }
+    });
+
+    // Graphique 3: Revenus Cumulés (M€)
+    cumulativeChart = new Chart(document.getElementById('cumulativeChart').getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Revenus Cumulés (M€)',
+                data: [],
+                borderColor: '#10b981',
+                backgroundColor: 'rgba(16, 185, 129, 0.2)',
+                fill: true,
+                tension: 0.1
+            }]
+        },
+        options: {
+            responsive: true,
+            scales: {
+                y: { beginAtZero: true, title: { display: true, text: 'Revenus Cumulés (M€)' } },
+                x: { title: { display: true, text: 'Année' } }
+            },
+            //plugins: { title: { display: true, text: 'Projection des Revenus Cumulés' } }
+        }
+    });
+
+    // Graphique Hashrate Historique
+    hashChart = new Chart(document.getElementById('hashChart').getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Hashrate (EH/s)',
+                data: [],
+                borderColor: '#ff6384',
+                backgroundColor: 'rgba(255, 99, 132, 0.2)',
+                fill: true,
+                tension: 0.1
+            }]
+        },
+        options: {
+            responsive: true,
+            parsing: false,
+            onResize: updateSimulation,
+            scales: {
+                x: timeAxis(),
+                y: { title: { display: true, text: 'EH/s' } }
+            },
+            //plugins: { title: { display: true, text: 'Hashrate Historique (Backtest)' } }
+        }
+    });
+
+    // Graphique Puissance du Site
+    powerChart = new Chart(document.getElementById('powerChart').getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Puissance (MW)',
+                data: [],
+                borderColor: '#36a2eb',
+                backgroundColor: 'rgba(54, 162, 235, 0.2)',
+                fill: true,
+                tension: 0.1
+            }]
+        },
+        options: {
+            responsive: true,
+            parsing: false,
+            onResize: updateSimulation,
+            scales: {
+                x: timeAxis(),
+                y: { title: { display: true, text: 'MW' } }
+            },
+            //plugins: { title: { display: true, text: 'Puissance Minable du Site (MW)' } }
+        }
+    });
+}
+
+// Initialisation
+sendEngineData();
+updateSimulation();
@@ -0,0 +1,231 @@
+// Moteur de simulation : exécuté sur la page et dans un Web Worker dédié
+const MS_PER_DAY = 86400000;
+const GENESIS_DAY = Date.UTC(2009, 0, 3) / MS_PER_DAY;  // 3 janv 2009, en jours depuis 1970 (UTC)
+const CURRENT_HASH_EH_S = 1020;  // Hash global actuel (EH/s) updated for 2025
+const DAYS_PER_YEAR = 365.25;
+
+// Données de la simulation, reçues du thread principal (message 'data')
+const engineData = {
+    hashSeries: null,
+    powerSeries: null,
+    priceSeries: null,
+    historicalHash: {},  // year: avg EH/s
+    powerAverage: 1000,
+    subsidy: null  // tables de subvention générées depuis subsidy.py
+};
+
+function seriesValue(series, day) {
+    const i = day - series.start;
+    return i >= 0 && i < series.values.length ? series.values[i] : NaN;
+}
+
+function seriesEnd(series) {
+    return series.start + series.values.length - 1;
+}
+
+// Subventions exactes : table par époque et hauteur de bloc attendue par jour (cf. subsidy.py)
+function getExpectedHeight(days) {
+    const {anchorDays, anchorHeights, blocksPerDay} = engineData.subsidy;
+    const last = anchorDays.length - 1;
+    if (days <= 0) return 0;
+    if (days >= anchorDays[last]) return anchorHeights[last] + (days - anchorDays[last]) * blocksPerDay;
+    let i = 1;
+    while (anchorDays[i] < days) i++;
+    const t = (days - anchorDays[i - 1]) / (anchorDays[i] - anchorDays[i - 1]);
+    return anchorHeights[i - 1] + t * (anchorHeights[i] - anchorHeights[i - 1]);
+}
+
+function getCumulativeSubsidy(height) {
+    const {halvingInterval, epochStartIssuance} = engineData.subsidy;
+    const epoch = Math.min(Math.floor(height / halvingInterval), epochStartIssuance.length - 1);
+    const reward = epoch < epochStartIssuance.length - 1 ? Math.floor(5e9 / Math.pow(2, epoch)) / 1e8 : 0;
+    return epochStartIssuance[epoch] + (height - epoch * halvingInterval) * reward;
+}
+
+// BTC distribués aux mineurs sur la journée : subvention des blocs attendus + frais
+function getDailyReward(days, feesPerBlock) {
+    const startHeight = getExpectedHeight(days);
+    const endHeight = getExpectedHeight(days + 1);
+    const issued = getCumulativeSubsidy(endHeight) - getCumulativeSubsidy(startHeight);
+    return issued + (endHeight - startHeight) * feesPerBlock;
+}
+
+function getBTCPrice(days, exponent, aPowerLaw) {
+    return aPowerLaw * Math.pow(days, exponent);
+}
+
+// Modèle journalier du domaine simulé, calculé pour 1 J/TH et sans coûts : il ne dépend que des données,
+// du mode, de l'exposant, de la croissance et des frais. L'efficacité, le coût de l'électricité,
+// l'investissement et la fenêtre de dates n'interviennent qu'ensuite, dans evaluateModel.
+function buildModel(params) {
+    const {hashSeries, powerSeries, priceSeries, historicalHash, powerAverage} = engineData;
+    const {exponent, projection, domainStart, domainEnd} = params;
+    const annualGrowthRate = 1 + params.growth / 100;
+
+    // Recalculer A si exposant change (calibré sur prix actuel)
+    const currentDays = Date.UTC(2025, 6, 1) / MS_PER_DAY - GENESIS_DAY;
+    const currentPrice = 95335;
+    const aPowerLaw = currentPrice / Math.pow(currentDays, exponent);
+
+    const length = Math.max(0, domainEnd - domainStart + 1);
+    const model = {
+        key: params.modelKey,
+        startDay: domainStart,
+        length: length,
+        // Valeurs par jour (indice day - startDay)
+        priceEur: new Float64Array(length),
+        mw: new Float64Array(length),
+        globalHash: new Float64Array(length),
+        shareUnit: new Float64Array(length),  // part du hash global pour 1 J/TH
+        btcUnit: new Float64Array(length),
+        grossUnit: new Float64Array(length),  // revenu brut (€) pour 1 J/TH
+        // Sommes cumulées : cum[k] = somme des jours 0 à k - 1, toute fenêtre se lit en O(1)
+        cumPriceEur: new Float64Array(length + 1),
+        cumMw: new Float64Array(length + 1),
+        cumGlobalHash: new Float64Array(length + 1),
+        cumShareUnit: new Float64Array(length + 1),
+        cumBtcUnit: new Float64Array(length + 1),
+        cumGrossUnit: new Float64Array(length + 1),
+        years: [],
+        yearStarts: []  // indice du premier jour de chaque année, puis length
+    };
+
+    let year = new Date(domainStart * MS_PER_DAY).getUTCFullYear();
+    let nextYearDay = Date.UTC(year + 1, 0, 1) / MS_PER_DAY;
+    model.years.push(year);
+    model.yearStarts.push(0);
+    for (let i = 0; i < length; i++) {
+        const day = domainStart + i;
+        if (day >= nextYearDay) {
+            year++;
+            nextYearDay = Date.UTC(year + 1, 0, 1) / MS_PER_DAY;
+            model.years.push(year);
+            model.yearStarts.push(i);
+        }
+        const days = day - GENESIS_DAY;
+
+        // Price
+        let priceEur = projection ? NaN : seriesValue(priceSeries, day);
+        if (isNaN(priceEur)) priceEur = getBTCPrice(days, exponent, aPowerLaw);
+
+        // Daily site MW (jour absent du profil : puissance moyenne)
+        let dailyMw = projection ? NaN : seriesValue(powerSeries, day);
+        if (isNaN(dailyMw)) dailyMw = powerAverage;
+
+        // Daily global hash
+        let dailyGlobalHash;
+        if (!projection) {
+            dailyGlobalHash = seriesValue(hashSeries, day);
+            if (isNaN(dailyGlobalHash)) dailyGlobalHash = historicalHash[year] || CURRENT_HASH_EH_S;
+        } else {
+            dailyGlobalHash = CURRENT_HASH_EH_S * Math.pow(annualGrowthRate, year - 2025);
+        }
+
+        // Hash du site pour 1 J/TH : (1000 / 1) * (MW / 1000) = MW EH/s
+        const shareUnit = dailyMw / dailyGlobalHash;
+        const btcUnit = shareUnit * getDailyReward(days, params.fees);
+        model.priceEur[i] = priceEur;
+        model.mw[i] = dailyMw;
+        model.globalHash[i] = dailyGlobalHash;
+        model.shareUnit[i] = shareUnit;
+        model.btcUnit[i] = btcUnit;
+        model.grossUnit[i] = btcUnit * priceEur;
+        model.cumPriceEur[i + 1] = model.cumPriceEur[i] + priceEur;
+        model.cumMw[i + 1] = model.cumMw[i] + dailyMw;
+        model.cumGlobalHash[i + 1] = model.cumGlobalHash[i] + dailyGlobalHash;
+        model.cumShareUnit[i + 1] = model.cumShareUnit[i] + shareUnit;
+        model.cumBtcUnit[i + 1] = model.cumBtcUnit[i] + btcUnit;
+        model.cumGrossUnit[i + 1] = model.cumGrossUnit[i] + model.grossUnit[i];
+    }
+    model.yearStarts.push(length);
+    return model;
+}
+
+// Résultats annuels de la fenêtre [params.startDay, params.endDay] en O(nombre d'années) :
+// revenu net = brut / efficacité - énergie (kWh) * coût, sans repasser sur les jours
+function evaluateModel(model, params) {
+    const invEfficiency = 1 / params.efficiency;
+    const kwhCost = 1000 * 24 * params.electricityCost;  // € par MW sur une journée
+    const first = Math.max(0, params.startDay - model.startDay);
+    const last = Math.max(first, Math.min(model.length, params.endDay - model.startDay + 1));  // exclu
+
+    let simulationData = [];
+    let runningCum = -params.initialInvestment;
+    for (let k = 0; k < model.years.length; k++) {
+        const a = Math.max(first, model.yearStarts[k]);
+        const b = Math.min(last, model.yearStarts[k + 1]);
+        if (b <= a) continue;
+        const revenue = (model.cumGrossUnit[b] - model.cumGrossUnit[a]) * invEfficiency
+            - (model.cumMw[b] - model.cumMw[a]) * kwhCost;
+        runningCum += revenue;
+        simulationData.push({
+            year: model.years[k],
+            priceEur: (model.cumPriceEur[b] - model.cumPriceEur[a]) / (b - a),
+            hashPct: (model.cumShareUnit[b] - model.cumShareUnit[a]) * invEfficiency * 100 / (b - a),
+            btcMined: (model.cumBtcUnit[b] - model.cumBtcUnit[a]) * invEfficiency,
+            revenueEur: revenue,
+            cumulativeEur: runningCum
+        });
+    }
+    const daily = {
+        model: model,
+        first: first,
+        startDay: model.startDay + first,
+        length: params.projection ? 0 : last - first,
+        invEfficiency: invEfficiency,
+        kwhCost: kwhCost,
+        initialInvestment: params.initialInvestment
+    };
+    return {simulationData: simulationData, daily: daily};
+}
+
+// Ligne i de la fenêtre journalière, calculée en O(1) à partir du modèle
+function dailyRow(daily, i) {
+    const m = daily.model;
+    const j = daily.first + i;
+    return {
+        day: daily.startDay + i,
+        priceEur: m.priceEur[j],
+        hashPct: m.shareUnit[j] * daily.invEfficiency * 100,
+        siteHash: m.mw[j] * daily.invEfficiency,
+        globalHash: m.globalHash[j],
+        btcMined: m.btcUnit[j] * daily.invEfficiency,
+        revenueEur: m.grossUnit[j] * daily.invEfficiency - m.mw[j] * daily.kwhCost,
+        cumulativeEur: dailyNet(daily, daily.first, j + 1) - daily.initialInvestment
+    };
+}
+
+// Revenu net des jours d'indices [a, b) du modèle
+function dailyNet(daily, a, b) {
+    const m = daily.model;
+    return (m.cumGrossUnit[b] - m.cumGrossUnit[a]) * daily.invEfficiency - (m.cumMw[b] - m.cumMw[a]) * daily.kwhCost;
+}
+
+// Totaux de la fenêtre journalière
+function dailyTotals(daily) {
+    const m = daily.model;
+    const a = daily.first, b = daily.first + daily.length;
+    return {
+        btcMined: (m.cumBtcUnit[b] - m.cumBtcUnit[a]) * daily.invEfficiency,
+        revenueEur: dailyNet(daily, a, b),
+        avgSiteHash: (m.cumMw[b] - m.cumMw[a]) * daily.invEfficiency / daily.length,
+        avgGlobalHash: (m.cumGlobalHash[b] - m.cumGlobalHash[a]) / daily.length,
+        cumulativeEur: dailyNet(daily, a, b) - daily.initialInvestment
+    };
+}
+
+// Protocole du worker :
+//   {type: 'data', data}     → met à jour les séries et moyennes
+//   {type: 'model', params}  → répond {type: 'model', model}, tableaux transférés sans copie
+if (typeof document === 'undefined') {
+    self.onmessage = function(e) {
+        const message = e.data;
+        if (message.type === 'data') {
+            Object.assign(engineData, message.data);
+        } else if (message.type === 'model') {
+            const model = buildModel(message.params);
+            const buffers = Object.values(model).filter(v => v instanceof Float64Array).map(a => a.buffer);
+            self.postMessage({type: 'model', model: model}, buffers);
+        }
+    };
+}